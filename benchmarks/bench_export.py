@@ -0,0 +1,260 @@
+"""
+BENCH EXPORT
+Benchmarks de la exportación sobre árboles sintéticos de Template-Informe
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Uso:
+    python benchmarks/bench_export.py [--scale 1 10 100] [--repeat 20] [--save] [--real ../]
+
+--save guarda la mediana de cada benchmark en bench_export.json, las siguientes
+ejecuciones se comparan contra ese archivo y terminan con código 1 si algún
+benchmark es más lento que la tolerancia. --real mide además la transformación
+de cada export_* (sin guardar ni compilar) sobre los repositorios reales.
+La línea base se vuelve a guardar con --save en cada cambio que afecte el
+rendimiento de la exportación.
+"""
+
+__all__ = [
+    'run_benchmarks'
+]
+
+# Importación de librerías
+from fixtures import make_informe_tree  # Agrega la raíz del repositorio a sys.path
+
+from extlbx.context import ExportContext
+from extlbx.convert import assemble_template_file, export_informe, get_exporter
+from extlbx.latex import paste_external_tex_into_file
+from extlbx.profiler import Profiler
+from extlbx.releases import REGISTRY, REL_INFORME
+from extlbx.utils import file_to_list, nonprint
+from extlbx.ziputils import Zip
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+# Constantes
+BENCH_FILE = 'bench_export.json'
+BENCH_MIN_TIME = 0.2  # Tiempo mínimo de cada medición (s)
+BENCH_REPEAT = 20  # Se guarda la mediana, con menos repeticiones domina el ruido
+BENCH_TOLERANCE = 0.25  # Aumento permitido respecto a la línea base
+_BENCHROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _timeit(fun, repeat):
+    """
+    Ejecuta una función varias veces. Se ajusta el número de llamadas por
+    medición para que dure al menos BENCH_MIN_TIME.
+
+    :param fun: Función sin argumentos
+    :param repeat: Número de repeticiones
+    :return: Mediana del tiempo de ejecución (s)
+    :rtype: float
+    """
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fun()
+        if time.perf_counter() - t0 >= BENCH_MIN_TIME:
+            break
+        number *= 2
+    t = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fun()
+        t.append((time.perf_counter() - t0) / number)
+    t.sort()
+    return t[len(t) // 2]
+
+
+def _bench_tree(mainroot, informeroot, repeat):
+    """
+    Mide las funciones de la exportación sobre un árbol sintético.
+
+    :param informeroot: Raíz del árbol de Template-Informe
+    :param mainroot: Raíz del export
+    :param repeat: Número de repeticiones
+    :return: Diccionario benchmark -> tiempo (s), y etapas de export_informe
+    :rtype: tuple
+    """
+    release = REGISTRY.get(REL_INFORME)
+    distfolder = informeroot + release['DIST']
+    result = {}
+
+    # Exportación completa sin compilar, se guardan las etapas de la última
+    profiler = None
+
+    def _export():
+        nonlocal profiler
+        profiler = Profiler()
+        ctx = ExportContext('1.0.0', '1.0.0-1', 'abcdef', mainroot=mainroot, informeroot=informeroot,
+                            statsroot=mainroot, profiler=profiler)
+        with profiler.activate(), profiler.span('transform'):
+            export_informe(ctx.version, ctx.versiondev, ctx.versionhash, printfun=nonprint, docompile=False,
+                           addstat=False, plotstats=False, doclean=True, ctx=ctx)
+
+    result['export_informe'] = _timeit(_export, repeat)
+
+    # Archivos generados en memoria, como los deja export_informe
+    files = {}
+    for f in release['FILES'].keys():
+        files[f] = file_to_list(informeroot + f)
+    headersize = 11
+
+    def _paste():
+        for fl in files.keys():
+            paste_external_tex_into_file(io.StringIO(), fl, files, headersize, False, False, True,
+                                         'src/config.tex', False, dist=True)
+
+    result['paste_external_tex_into_file'] = _timeit(_paste, repeat)
+
+    def _assemble():
+        assemble_template_file(files['template.tex'], 'src/config.tex', distfolder, headersize, files)
+
+    result['assemble_template_file'] = _timeit(_assemble, repeat)
+
+    def _zip():
+        z = Zip(mainroot + 'dist/bench.zip', root=informeroot)
+        z.set_ghostpath(release['DIST'])
+        z.add_file(release['ZIP']['NORMAL']['ADD']['FILES'])
+        z.add_folder(release['ZIP']['NORMAL']['ADD']['FOLDER'])
+        z.save()
+
+    result['zip'] = _timeit(_zip, repeat)
+    return result, profiler.report()
+
+
+def _bench_real(root, repeat):
+    """
+    Mide la transformación de cada release sobre los repositorios reales, sin
+    guardar archivos ni compilar.
+
+    :param repeat: Número de repeticiones
+    :param root: Carpeta que contiene Template-Informe y los demás repositorios
+    :return: Diccionario benchmark -> tiempo (s)
+    :rtype: dict
+    """
+    result = {}
+    mainroot = os.path.abspath(root)
+    informeroot = os.path.join(mainroot, 'Template-Informe', '')
+    for release in REGISTRY:
+        exporter = get_exporter(release.id)
+
+        def _export():
+            exporter('1.0.0', '1.0.0-1', 'abcdef', printfun=nonprint, dosave=False, docompile=False,
+                     addstat=False, plotstats=False, savepdf=False, mainroot=mainroot,
+                     informeroot=informeroot, statsroot=mainroot)
+
+        result[exporter.__name__] = _timeit(_export, repeat)
+    return result
+
+
+def run_benchmarks(scales, repeat, real=None):
+    """
+    Ejecuta los benchmarks en cada escala.
+
+    :param real: Carpeta de los repositorios reales, None si no se usan
+    :param repeat: Número de repeticiones
+    :param scales: Escalas de los árboles sintéticos
+    :return: Diccionario escala -> benchmark -> tiempo (s), y etapas por escala
+    :rtype: tuple
+    """
+    results = {}
+    spans = {}
+    for scale in scales:
+        tmp = tempfile.mkdtemp(prefix='export-bench-')
+        try:
+            mainroot, informeroot = make_informe_tree(tmp, scale)
+            results[f'x{scale}'], spans[f'x{scale}'] = _bench_tree(mainroot, informeroot, repeat)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    if real is not None:
+        results['real'] = _bench_real(real, repeat)
+    return results, spans
+
+
+def main():
+    """
+    Imprime los resultados y los compara con la línea base.
+
+    :return: Código de salida
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks de la exportación')
+    parser.add_argument('--real', default=None, help='Carpeta con los repositorios reales de los templates')
+    parser.add_argument('--repeat', default=BENCH_REPEAT, type=int, help='Número de repeticiones')
+    parser.add_argument('--save', action='store_true', help=f'Guarda la línea base en {BENCH_FILE}')
+    parser.add_argument('--scale', default=[1, 10], nargs='+', type=int, help='Escalas de los árboles')
+    parser.add_argument('--tolerance', default=BENCH_TOLERANCE, type=float, help='Aumento permitido')
+    args = parser.parse_args()
+
+    results, spans = run_benchmarks(args.scale, args.repeat, args.real)
+    savefile = os.path.join(_BENCHROOT, BENCH_FILE)
+    baseline = {}
+    if os.path.isfile(savefile):
+        with open(savefile, encoding='utf8') as f:
+            baseline = json.load(f)['results']
+
+    regressions = 0
+    print('{0:<8}{1:<32}{2:>12}{3:>12}{4:>9}'.format('ESCALA', 'BENCHMARK', 'TIEMPO [ms]', 'BASE [ms]', 'RAZON'))
+    for scale, res in results.items():
+        for name, t in res.items():
+            base = baseline.get(scale, {}).get(name)
+            if base is None:
+                print('{0:<8}{1:<32}{2:>12.2f}{3:>12}{4:>9}'.format(scale, name, 1000 * t, '-', '-'))
+                continue
+            ratio = t / base
+            flag = ''
+            if ratio > 1 + args.tolerance:
+                flag = ' !'
+                regressions += 1
+            print('{0:<8}{1:<32}{2:>12.2f}{3:>12.2f}{4:>9.2f}{5}'.format(scale, name, 1000 * t, 1000 * base,
+                                                                          ratio, flag))
+    for scale, st in spans.items():
+        print('\nETAPAS DE export_informe EN {0}'.format(scale))
+        for name, s in st.items():
+            print('\t{0:<10}{1:>10.2f} ms'.format(name, 1000 * s['wall']))
+
+    if args.save:
+        with open(savefile, 'w', encoding='utf8') as f:
+            json.dump({'python': platform.python_version(), 'repeat': args.repeat, 'results': results},
+                      f, indent=2)
+            f.write('\n')
+    elif regressions > 0:
+        print(f'\n{regressions} BENCHMARK(S) SOBRE LA TOLERANCIA DE {args.tolerance:.0%}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+BENCH LATEX
+Micro-benchmarks de las funciones de extlbx.latex
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Uso:
+    python benchmarks/bench_latex.py [--filter replace_argument] [--save]
+
+Por cada caso se informa el tiempo por llamada, las líneas procesadas por
+segundo, el peak de memoria de una llamada y los bloques de memoria que quedan
+asignados al terminarla según tracemalloc.
+
+La línea base se vuelve a guardar con --save en cada cambio que afecte el
+rendimiento de extlbx.latex.
+"""
+
+__all__ = [
+    'BENCH_CASES',
+    'run_case'
+]
+
+# Importación de librerías
+from fixtures import command_lines, config_lines  # Agrega la raíz del repositorio a sys.path
+
+from extlbx.latex import clear_token_cache, decodeline, find_block, find_command, paste_external_tex_into_file, \
+    replace_argument, replace_arguments, tokenize
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Constantes
+BENCH_FILE = 'bench_latex.json'
+BENCH_MIN_TIME = 0.2  # Tiempo mínimo de cada medición (s)
+BENCH_REPEAT = 20  # Se guarda el mínimo, con menos repeticiones domina el ruido
+BENCH_TOLERANCE = 0.25  # Aumento permitido respecto a la línea base
+_BENCHROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _case_find_block(n):
+    """
+    Busca la última configuración de un archivo de n secciones.
+
+    :param n: Número de secciones
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    data = config_lines(n)
+    key = f'cfgsection{n - 1}key7'
+    return lambda: find_block(data, key, True), len(data)
+
+
+def _case_find_endblock(n):
+    """
+    Busca el último bloque %ENDBLOCK de un archivo de n comandos.
+
+    :param n: Número de comandos
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    data = command_lines('bench', n)
+    key = f'\\newcommand{{\\benchcmd{n - 1}}}'
+    return lambda: find_block(data, key), len(data)
+
+
+def _case_replace_argument(n):
+    """
+    Reemplaza el último argumento de una línea con n argumentos entre llaves.
+
+    :param n: Número de argumentos
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    line = '\\def\\cmd ' + ''.join('{{arg{0}}}'.format(k) for k in range(n)) + ' % Comentario\n'
+    return lambda: replace_argument(line, n, 'nuevo'), 1
+
+
+def _case_replace_arguments(n):
+    """
+    Reemplaza todos los argumentos de una línea con n argumentos en una llamada.
+
+    :param n: Número de argumentos
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    line = '\\def\\cmd ' + ''.join('{{arg{0}}}'.format(k) for k in range(n)) + ' % Comentario\n'
+    args = {k + 1: 'nuevo' for k in range(n)}
+    return lambda: replace_arguments(line, args), 1
+
+
+def _case_find_command(n):
+    """
+    Busca el último comando de un archivo abierto de n comandos.
+
+    :param n: Número de comandos
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    data = command_lines('bench', n)
+    fl = io.StringIO(''.join(data))
+    return lambda: find_command(fl, f'benchcmd{n - 1}'), len(data)
+
+
+def _case_decodeline(n):
+    """
+    Decodifica n líneas.
+
+    :param n: Número de líneas
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    data = config_lines(max(1, n // 10))[:n]
+
+    def _fun():
+        for k in data:
+            decodeline(k)
+
+    return _fun, len(data)
+
+
+def _case_paste(n):
+    """
+    Pega un archivo de n comandos en modo dist, borrando comentarios.
+
+    :param n: Número de comandos
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    files = {'src/cmd/bench.tex': ['% header\n'] * 11 + command_lines('bench', n),
+             'src/config.tex': ['% header\n'] * 11 + config_lines(n)}
+
+    def _fun():
+        for f in files.keys():
+            paste_external_tex_into_file(io.StringIO(), f, files, 11, False, True, True, 'src/config.tex',
+                                         False, dist=True)
+
+    return _fun, sum(len(v) for v in files.values())
+
+
+def _case_tokenize(n):
+    """
+    Clasifica n líneas de configuración con la caché vacía.
+
+    :param n: Número de líneas
+    :return: Función, líneas procesadas por llamada
+    :rtype: tuple
+    """
+    data = config_lines(max(1, n // 10))[:n]
+
+    def _fun():
+        clear_token_cache()
+        tokenize(data)
+
+    return _fun, len(data)
+
+
+# Casos, nombre -> (constructor, tamaños)
+BENCH_CASES = {
+    'decodeline': (_case_decodeline, (10, 1000)),
+    'find_block': (_case_find_block, (10, 100, 1000)),
+    'find_block_endblock': (_case_find_endblock, (10, 100, 1000)),
+    'find_command': (_case_find_command, (10, 100, 1000)),
+    'paste_external_tex_into_file': (_case_paste, (10, 100, 1000)),
+    'replace_argument': (_case_replace_argument, (1, 10, 100)),
+    'replace_arguments': (_case_replace_arguments, (1, 10, 100)),
+    'tokenize': (_case_tokenize, (10, 1000))
+}
+
+
+def run_case(fun, lines, repeat=BENCH_REPEAT):
+    """
+    Mide una función. Se ajusta el número de llamadas por medición para que
+    dure al menos BENCH_MIN_TIME y se usa la mejor de las repeticiones.
+
+    :param fun: Función sin argumentos
+    :param lines: Líneas procesadas por llamada
+    :param repeat: Número de repeticiones
+    :return: Diccionario con us por llamada, líneas por segundo, peak (bytes) y bloques retenidos
+    :rtype: dict
+    """
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fun()
+        dt = time.perf_counter() - t0
+        if dt >= BENCH_MIN_TIME or number >= 1 << 20:
+            break
+        number *= 2
+    best = dt / number
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fun()
+        best = min(best, (time.perf_counter() - t0) / number)
+
+    # Memoria de una llamada
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+        tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    fun()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(s.count_diff for s in after.compare_to(before, 'lineno') if s.count_diff > 0)
+
+    return {'blocks': blocks, 'lines_s': lines / best, 'peak': peak, 'us': 1e6 * best}
+
+
+def main():
+    """
+    Ejecuta los micro-benchmarks e imprime la tabla.
+
+    :return: Código de salida
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description='Micro-benchmarks de extlbx.latex')
+    parser.add_argument('--filter', default='', help='Ejecuta sólo los casos que contienen el texto')
+    parser.add_argument('--repeat', default=BENCH_REPEAT, type=int, help='Número de repeticiones')
+    parser.add_argument('--save', action='store_true', help=f'Guarda la línea base en {BENCH_FILE}')
+    parser.add_argument('--tolerance', default=BENCH_TOLERANCE, type=float, help='Aumento permitido')
+    args = parser.parse_args()
+
+    savefile = os.path.join(_BENCHROOT, BENCH_FILE)
+    baseline = {}
+    if os.path.isfile(savefile):
+        with open(savefile, encoding='utf8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    regressions = 0
+    print('{0:<36}{1:>12}{2:>14}{3:>11}{4:>8}{5:>10}'.format('CASO', 'us/LLAMADA', 'LINEAS/s', 'PEAK [kB]',
+                                                             'BLOQ', 'RAZON'))
+    for name, (case, sizes) in BENCH_CASES.items():
+        if args.filter not in name:
+            continue
+        for n in sizes:
+            key = f'{name}[{n}]'
+            fun, lines = case(n)
+            r = run_case(fun, lines, args.repeat)
+            results[key] = r
+            ratio = '-'
+            if key in baseline:
+                ratio = r['us'] / baseline[key]['us']
+                if ratio > 1 + args.tolerance:
+                    regressions += 1
+                ratio = '{0:.2f}'.format(ratio)
+            print('{0:<36}{1:>12.2f}{2:>14.0f}{3:>11.1f}{4:>8}{5:>10}'.format(
+                key, r['us'], r['lines_s'], r['peak'] / 1024, r['blocks'], ratio))
+
+    if args.save:
+        with open(savefile, 'w', encoding='utf8') as f:
+            json.dump({'python': platform.python_version(), 'results': results}, f, indent=2)
+            f.write('\n')
+    elif regressions > 0:
+        print(f'\n{regressions} CASO(S) SOBRE LA TOLERANCIA DE {args.tolerance:.0%}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+FIXTURES
+Genera árboles sintéticos de Template-Informe para los benchmarks
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = [
+    'command_lines',
+    'config_lines',
+    'FIXTURE_BLOCKS',
+    'make_informe_tree',
+    'tex_header'
+]
+
+# Importación de librerías
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extlbx.releases import DEPTOS, REGISTRY, REL_INFORME
+
+# Constantes
+FIXTURE_BLOCKS = 20  # Bloques de cada archivo en escala 1
+FIXTURE_HEADER = [
+    '% Template:     Template Informe LaTeX\n',
+    '% Documento:    {0}\n',
+    '% Versión:      0.0.0 (01/01/2000)\n',
+    '% Codificación: UTF-8\n',
+    '%\n',
+    '% Autor: Pablo Pizarro R.\n',
+    '%        pablo@ppizarror.com\n',
+    '%\n',
+    '% Manual template: [https://latex.ppizarror.com/informe]\n',
+    '% Licencia MIT:    [https://opensource.org/licenses/MIT]\n',
+    '\n'
+]
+FIXTURE_INIT_KEYS = ['Template.Date', 'Template.Version.Hash', 'Template.Type', 'Template.Version.Dev',
+                     'Template.Version.Release', 'pdfproducer']
+
+
+def tex_header(name):
+    """
+    Retorna el encabezado de un archivo tex, el mismo de Template-Informe.
+
+    :param name: Nombre del archivo
+    :return: Líneas del encabezado
+    :rtype: list
+    """
+    return [FIXTURE_HEADER[0], FIXTURE_HEADER[1].format(name)] + FIXTURE_HEADER[2:]
+
+
+def config_lines(blocks):
+    """
+    Genera un archivo de configuraciones, secciones en mayúsculas con líneas
+    \\def alineadas y comentadas.
+
+    :param blocks: Número de secciones
+    :return: Líneas
+    :rtype: list
+    """
+    lines = []
+    for b in range(blocks):
+        lines.append(f'% CONFIGURACIÓN DE LA SECCIÓN {b}\n')
+        for k in range(8):
+            key = f'cfgsection{b}key{k}'
+            lines.append('\\def\\{0} {{{1}}}'.format(key, k).ljust(40) + f'% Valor {k} de la sección {b}\n')
+        lines.append('\n')
+    return lines
+
+
+def command_lines(name, blocks):
+    """
+    Genera comandos \\newcommand con comentarios, marcas de nueva línea y
+    bloques terminados en %ENDBLOCK.
+
+    :param blocks: Número de comandos
+    :param name: Prefijo de los comandos
+    :return: Líneas
+    :rtype: list
+    """
+    lines = []
+    for b in range(blocks):
+        cmd = f'{name}cmd{b}'
+        lines.append(f'% Comando {cmd}, recibe {b % 4 + 1} argumentos\n')
+        lines.append(f'\\newcommand{{\\{cmd}}}[{b % 4 + 1}]{{ % Comentario que se puede borrar !DELCOM\n')
+        for a in range(b % 4 + 1):
+            lines.append(f'\t\\textbf{{#{a + 1}}}{{\\color{{red}} {{argumento}}}} % Argumento {a + 1}\n')
+        lines.append('}\n')
+        lines.append(f'\\def\\{cmd}var {{valor}} !NL\n')
+        lines.append('%ENDBLOCK\n')
+        lines.append('\n')
+    return lines
+
+
+def make_informe_tree(root, scale=1):
+    """
+    Crea un árbol sintético de Template-Informe con los archivos de releases.json,
+    las líneas que busca export_informe y las imágenes de los departamentos.
+
+    :param root: Carpeta donde se crea el árbol, contiene informe/ y la carpeta dist/ de la raíz
+    :param scale: Multiplica el número de bloques de cada archivo
+    :return: Tupla (mainroot, informeroot)
+    :rtype: tuple
+    """
+    mainroot = os.path.join(root, '')
+    informeroot = os.path.join(root, 'informe', '')
+    release = REGISTRY.get(REL_INFORME)
+    blocks = FIXTURE_BLOCKS * scale
+
+    os.makedirs(mainroot + 'dist', exist_ok=True)
+    os.makedirs(informeroot + release['DIST'], exist_ok=True)
+    for f in release['FILES'].keys():
+        name = f.replace('.tex', '')
+        if f == 'src/config.tex':
+            body = config_lines(blocks)
+        elif f == 'src/cfg/init.tex':
+            body = [f'\\def\\{k.replace(".", "").lower()} {{0}} % {k}\n' for k in FIXTURE_INIT_KEYS]
+            body += command_lines('init', blocks)
+        elif f == 'main.tex':
+            body = ['\\documentclass[letterpaper,11pt]{article}\n',
+                    '\\def\\universitydepartment {Departamento de la Universidad}\n',
+                    '\\def\\universitydepartmentimage {departamentos/fcfm}\n',
+                    '\\input{template}\n',
+                    '\\begin{document}\n',
+                    '\\input{src/etc/example} % Ejemplo, se puede borrar\n',
+                    '\\end{document}\n']
+        elif f == 'template.tex':
+            body = []
+            for i in release['FILES'].keys():
+                if i.startswith('src/') and i != 'src/etc/example.tex':
+                    body.append('\\input{' + i.replace('.tex', '') + '}\n')
+        else:
+            body = command_lines(name.split('/')[-1], blocks)
+        os.makedirs(os.path.dirname(informeroot + f), exist_ok=True)
+        os.makedirs(os.path.dirname(informeroot + release['DIST'] + f), exist_ok=True)
+        with open(informeroot + f, 'w', encoding='utf8') as fl:
+            fl.writelines(tex_header(name) + body)
+
+    # Archivos que se agregan al zip
+    with open(informeroot + 'library.bib', 'w', encoding='utf8') as fl:
+        for b in range(blocks):
+            fl.write(f'@article{{ref{b},\n\ttitle={{Referencia {b}}},\n\tyear={{2000}}\n}}\n\n')
+    with open(informeroot + 'natnumurl.bst', 'w', encoding='utf8') as fl:
+        fl.write('ENTRY { address author title } {} { label }\n' * blocks)
+    imgs = set()
+    for d in DEPTOS:
+        imgs.add(d[1])
+        imgs.update(d[2])
+    os.makedirs(informeroot + 'img/departamentos', exist_ok=True)
+    os.makedirs(informeroot + 'img/ejemplos', exist_ok=True)
+    for i in sorted(imgs):
+        with open(informeroot + f'img/departamentos/{i}.pdf', 'wb') as fl:
+            fl.write(os.urandom(2048))
+    for i in range(scale):
+        with open(informeroot + f'img/ejemplos/ejemplo{i}.png', 'wb') as fl:
+            fl.write(os.urandom(8192))
+    return mainroot, informeroot
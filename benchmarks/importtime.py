@@ -0,0 +1,130 @@
+"""
+IMPORTTIME
+Mide el tiempo de importación de la aplicación con python -X importtime
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Uso:
+    python benchmarks/importtime.py [--module main] [--runs 5] [--save]
+"""
+
+__all__ = [
+    'measure_importtime'
+]
+
+# Importación de librerías
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+# Constantes
+IMPORTTIME_FILE = 'importtime.json'
+IMPORTTIME_SAVE_MIN = 1000  # Tiempo acumulado mínimo de los módulos guardados (us)
+IMPORTTIME_TOP = 15  # Módulos mostrados en la tabla
+_BENCHROOT = os.path.dirname(os.path.abspath(__file__))
+_MAINROOT = os.path.dirname(_BENCHROOT)
+
+
+def _parse_importtime(stderr):
+    """
+    Lee la salida de -X importtime.
+
+    :param stderr: Texto escrito por python en stderr
+    :return: Diccionario módulo -> (tiempo propio, tiempo acumulado) en us
+    :rtype: dict
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        j = line[len('import time:'):].split('|')
+        modules[j[2].strip()] = (int(j[0]), int(j[1]))
+    return modules
+
+
+def measure_importtime(module='main', runs=5):
+    """
+    Importa el módulo en un intérprete nuevo varias veces y retorna la mediana
+    de los tiempos de cada módulo importado.
+
+    :param module: Módulo a importar
+    :param runs: Número de repeticiones
+    :return: Diccionario módulo -> (tiempo propio, tiempo acumulado) en us
+    :rtype: dict
+    """
+    samples = []
+    for _ in range(runs):
+        p = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                           cwd=_MAINROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                           universal_newlines=True, check=True)
+        samples.append(_parse_importtime(p.stderr))
+    result = {}
+    for m in samples[-1].keys():
+        t = sorted(s[m] for s in samples if m in s)
+        result[m] = t[len(t) // 2]
+    return result
+
+
+def main():
+    """
+    Imprime la tabla de tiempos y opcionalmente guarda la línea base.
+
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description='Tiempo de importación de Export-Subtemplate')
+    parser.add_argument('--module', default='main', help='Módulo a importar')
+    parser.add_argument('--runs', default=5, type=int, help='Número de repeticiones')
+    parser.add_argument('--save', action='store_true', help=f'Guarda la medición en {IMPORTTIME_FILE}')
+    args = parser.parse_args()
+
+    result = measure_importtime(args.module, args.runs)
+    savefile = os.path.join(_BENCHROOT, IMPORTTIME_FILE)
+    baseline = {}
+    if os.path.isfile(savefile):
+        with open(savefile, encoding='utf8') as f:
+            baseline = json.load(f)['modules']
+
+    print('{0:<40}{1:>12}{2:>12}{3:>12}'.format('MODULO', 'PROPIO [ms]', 'TOTAL [ms]', 'BASE [ms]'))
+    top = sorted(result.items(), key=lambda x: -x[1][1])[:IMPORTTIME_TOP]
+    for m, (tself, tcum) in top:
+        base = '{0:.1f}'.format(baseline[m][1] / 1000) if m in baseline else '-'
+        print('{0:<40}{1:>12.1f}{2:>12.1f}{3:>12}'.format(m, tself / 1000, tcum / 1000, base))
+
+    if args.save:
+        with open(savefile, 'w', encoding='utf8') as f:
+            json.dump({
+                'module': args.module,
+                'modules': {m: list(t) for m, t in sorted(result.items())
+                            if t[1] >= IMPORTTIME_SAVE_MIN or m.split('.')[0] in ('extlbx', 'main')},
+                'python': platform.python_version(),
+                'runs': args.runs
+            }, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,523 @@
+"""
+COMPILER
+Herramientas de compilación de los templates con pdflatex
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = [
+    'BUILD_CACHE_SIZE',
+    'BUILD_FOLDER',
+    'BuildCache',
+    'build_state',
+    'COMPILE_MAX_PASSES',
+    'dist_hash',
+    'FMT_CACHE_SIZE',
+    'FMT_FOLDER',
+    'FormatCache',
+    'LOG_MAX_MESSAGES',
+    'LogParser',
+    'preamble_hash',
+    'toolchain_version'
+]
+
+# Importación de librerías
+from extlbx.latex import tokenize_line, TOKEN_INPUT
+from extlbx.utils import file_to_list
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+
+# Constantes
+BUILD_CACHE_SIZE = 16  # Compilaciones guardadas, se borran las más antiguas
+BUILD_FILE = 'build.json'
+BUILD_FOLDER = 'dist/build/'  # Compilaciones guardadas, relativo a MAIN_ROOT
+BUILD_IGNORE = ('.zip',)  # Archivos de la carpeta que no lee la compilación
+BUILD_STATE = ('.aux', '.bbl', '.lof', '.lot', '.nav', '.out', '.snm', '.toc')  # Estado entre pasadas
+BUILD_OUTPUTS = ('.aux', '.bbl', '.blg', '.fls', '.fmt', '.lof', '.log', '.lot', '.nav', '.out', '.snm', '.synctex.gz',
+                 '.toc', '.vrb')  # Archivos generados por pdflatex y bibtex
+BUILD_WARM_START = ('.aux', '.bbl')  # Archivos con los que parte una compilación
+COMPILE_MAX_PASSES = 4  # Pasadas de pdflatex
+FMT_CACHE_SIZE = 8  # Formatos guardados, se borran los más antiguos
+FMT_FOLDER = 'dist/fmt/'  # Formatos precompilados, relativo a MAIN_ROOT
+LOG_LINE_WIDTH = 79  # pdflatex corta las líneas de la salida en este largo
+LOG_MAX_MESSAGES = 20  # Errores y advertencias guardados de cada pasada
+_BEGIN_DOCUMENT = '\\begin{document}'
+_LOG_ERROR_LINE = re.compile(r'^l\.(\d+)')
+_LOG_FATAL = ('Emergency stop', 'Fatal error occurred', 'No pages of output')
+_LOG_PAGES = re.compile(r'Output written on .+ \((\d+) pages?, \d+ bytes\)')
+_LOG_RERUN = re.compile(r'Rerun to get|Label\(s\) may have changed|Please \(?re\)?run|Rerun LaTeX', re.IGNORECASE)
+_LOG_WARNING = re.compile(r'^(LaTeX|Package \S+|Class \S+|pdfTeX) warning|^Warning--', re.IGNORECASE)
+_TOOLCHAIN = ('pdflatex', 'bibtex')
+
+# Versión de las herramientas, se consulta una vez por ejecución
+_VERSION = {}
+
+
+def toolchain_version():
+    """
+    Retorna la primera línea de --version de pdflatex y bibtex.
+
+    :return: Versiones separadas por ;, 'unknown' si una herramienta no existe
+    :rtype: str
+    """
+    if 'toolchain' not in _VERSION:
+        ver = []
+        for t in _TOOLCHAIN:
+            try:
+                out = subprocess.check_output([t, '--version'], stderr=subprocess.DEVNULL)
+                ver.append(out.decode('utf8', 'replace').split('\n')[0].strip())
+            except (OSError, subprocess.CalledProcessError):
+                ver.append(f'{t} unknown')
+        _VERSION['toolchain'] = ';'.join(ver)
+    return _VERSION['toolchain']
+
+
+def _preamble_lines(folder, texfile, visited):
+    """
+    Retorna las líneas del preámbulo de un archivo, reemplazando cada \\input
+    por el contenido del archivo importado.
+
+    :param folder: Carpeta de compilación
+    :param texfile: Archivo relativo a la carpeta, sin extensión o con .tex
+    :param visited: Archivos ya leídos
+    :type visited: set
+    :return: Líneas y si se encontró \\begin{document}
+    :rtype: tuple
+    """
+    if not texfile.endswith('.tex'):
+        texfile += '.tex'
+    if texfile in visited or not os.path.isfile(folder + texfile):
+        return [], False
+    visited.add(texfile)
+    lines = []
+    for line in file_to_list(folder + texfile):
+        if _BEGIN_DOCUMENT in line:
+            return lines, True
+        lines.append(line)
+        tok = tokenize_line(line)
+        if tok.kind == TOKEN_INPUT:
+            sub, end = _preamble_lines(folder, tok.key, visited)
+            lines += sub
+            if end:
+                return lines, True
+    return lines, False
+
+
+def preamble_hash(folder, mainfile):
+    """
+    Retorna el hash del preámbulo de un documento, el código previo a
+    \\begin{document} incluyendo los archivos importados con \\input (imports,
+    defs, configuraciones), y la versión de pdflatex que lo compila.
+
+    :param folder: Carpeta de compilación
+    :param mainfile: Archivo principal
+    :return: Hash sha1
+    :rtype: str
+    """
+    lines, _ = _preamble_lines(folder, mainfile, set())
+    h = hashlib.sha1(toolchain_version().encode('utf8'))
+    for line in lines:
+        h.update(line.encode('utf8'))
+    return h.hexdigest()
+
+
+class FormatCache(object):
+    """
+    Formatos de pdflatex precompilados con mylatexformat a partir del preámbulo
+    de cada template. Los formatos se guardan según el hash del preámbulo, así
+    las compilaciones siguientes cargan el formato con -fmt y no vuelven a leer
+    los imports del template.
+    """
+
+    def __init__(self, cachefolder, size=FMT_CACHE_SIZE):
+        """
+        Constructor.
+
+        :param cachefolder: Carpeta de los formatos
+        :param size: Número máximo de formatos guardados
+        :type cachefolder: str
+        :type size: int
+        """
+        self._folder = cachefolder
+        self._size = size
+
+    def _prune(self):
+        """
+        Borra los formatos más antiguos si se supera el tamaño de la caché.
+
+        :return: None
+        """
+        fmts = [self._folder + f for f in os.listdir(self._folder) if f.endswith('.fmt')]
+        fmts.sort(key=os.path.getmtime)
+        for f in fmts[:max(0, len(fmts) - self._size)]:
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+
+    def get(self, folder, mainfile, run, stdout):
+        """
+        Copia el formato del preámbulo del documento a la carpeta de compilación,
+        si no existe se compila. Se retorna el nombre que se pasa a pdflatex con
+        -fmt, el archivo se borra con release.
+
+        :param folder: Carpeta de compilación
+        :param mainfile: Archivo principal
+        :param run: Función que ejecuta los comandos, como utils.call
+        :param stdout: Salida estándar de los comandos
+        :return: Nombre del formato, None si no se pudo compilar
+        :rtype: str, None
+        """
+        key = preamble_hash(folder, mainfile)
+        cached = self._folder + key + '.fmt'
+        fmtname = mainfile.replace('.tex', '') + '-preamble'
+        if not os.path.isfile(cached):
+            run(['pdflatex', '-ini', '-interaction=nonstopmode', f'-jobname={fmtname}', '&pdflatex',
+                 'mylatexformat.ltx', mainfile], stdout=stdout, cwd=folder)
+            for ext in ('.log', '.pdf'):
+                if os.path.isfile(folder + fmtname + ext):
+                    os.remove(folder + fmtname + ext)
+            if not os.path.isfile(folder + fmtname + '.fmt'):
+                return None
+            os.makedirs(self._folder, exist_ok=True)
+            shutil.move(folder + fmtname + '.fmt', cached)
+            self._prune()
+        else:
+            os.utime(cached)
+        shutil.copyfile(cached, folder + fmtname + '.fmt')
+        return fmtname
+
+    @staticmethod
+    def release(folder, fmtname):
+        """
+        Borra el formato copiado a la carpeta de compilación.
+
+        :param folder: Carpeta de compilación
+        :param fmtname: Nombre del formato retornado por get
+        :return: None
+        """
+        if fmtname is not None and os.path.isfile(folder + fmtname + '.fmt'):
+            os.remove(folder + fmtname + '.fmt')
+
+
+def _is_output(relpath, mainfile):
+    """
+    Indica si un archivo de la carpeta de compilación lo genera la compilación.
+
+    :param mainfile: Archivo principal
+    :param relpath: Archivo relativo a la carpeta de compilación
+    :return: True si es un archivo generado
+    :rtype: bool
+    """
+    if relpath.endswith(BUILD_OUTPUTS):
+        return True
+    return relpath == mainfile.replace('.tex', '.pdf')
+
+
+def _walk(folder):
+    """
+    Retorna los archivos de una carpeta y sus subcarpetas, ordenados. Se omiten
+    los archivos y carpetas ocultos (.git, etc.).
+
+    :param folder: Carpeta
+    :return: Rutas relativas a la carpeta, separadas por /
+    :rtype: list
+    """
+    files = []
+    for root, dirs, fls in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if d[0] != '.')
+        for f in fls:
+            if f[0] == '.':
+                continue
+            files.append(os.path.relpath(os.path.join(root, f), folder).replace('\\', '/'))
+    files.sort()
+    return files
+
+
+def dist_hash(folder, mainfile):
+    """
+    Retorna el hash de los archivos fuente de la carpeta de compilación (todos
+    menos los que genera la compilación, los ocultos y los zip de la
+    distribución) y de la versión de pdflatex y bibtex.
+
+    :param folder: Carpeta de compilación
+    :param mainfile: Archivo principal
+    :return: Hash sha1
+    :rtype: str
+    """
+    h = hashlib.sha1(toolchain_version().encode('utf8'))
+    for f in _walk(folder):
+        if _is_output(f, mainfile) or f.endswith(BUILD_IGNORE):
+            continue
+        h.update(f.encode('utf8') + b'\0')
+        with open(folder + f, 'rb') as fl:
+            for chunk in iter(lambda: fl.read(1 << 16), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def build_state(folder):
+    """
+    Retorna el hash de los archivos que pdflatex lee en la pasada siguiente
+    (aux, bbl, índices, etc.), si no cambia entre dos pasadas la compilación
+    convergió.
+
+    :param folder: Carpeta de compilación
+    :return: Hash sha1
+    :rtype: str
+    """
+    h = hashlib.sha1()
+    for f in _walk(folder):
+        if not f.endswith(BUILD_STATE):
+            continue
+        h.update(f.encode('utf8') + b'\0')
+        with open(folder + f, 'rb') as fl:
+            h.update(fl.read())
+    return h.hexdigest()
+
+
+class BuildCache(object):
+    """
+    Compilaciones guardadas según el hash de la carpeta de compilación. Cada
+    entrada contiene el pdf, los archivos auxiliares y el tiempo de compilación,
+    así una exportación repetida con las mismas fuentes no vuelve a llamar a
+    pdflatex.
+    """
+
+    def __init__(self, cachefolder, size=BUILD_CACHE_SIZE):
+        """
+        Constructor.
+
+        :param cachefolder: Carpeta de las compilaciones
+        :param size: Número máximo de compilaciones guardadas
+        :type cachefolder: str
+        :type size: int
+        """
+        self._folder = cachefolder
+        self._size = size
+
+    def _prune(self):
+        """
+        Borra las compilaciones más antiguas si se supera el tamaño de la caché.
+
+        :return: None
+        """
+        builds = [self._folder + b for b in os.listdir(self._folder) if os.path.isdir(self._folder + b)]
+        builds.sort(key=os.path.getmtime)
+        for b in builds[:max(0, len(builds) - self._size)]:
+            shutil.rmtree(b, ignore_errors=True)
+
+    def restore(self, key, folder):
+        """
+        Copia los archivos de una compilación guardada a la carpeta de compilación.
+
+        :param folder: Carpeta de compilación
+        :param key: Hash de la carpeta, ver dist_hash
+        :return: Datos de la compilación, None si no está guardada
+        :rtype: dict, None
+        """
+        entry = self._folder + key + '/'
+        if not os.path.isfile(entry + BUILD_FILE):
+            return None
+        with open(entry + BUILD_FILE, encoding='utf8') as f:
+            build = json.load(f)
+        for f in build['files']:
+            os.makedirs(os.path.dirname(folder + f), exist_ok=True)
+            shutil.copyfile(entry + f, folder + f)
+        os.utime(entry)
+        return build
+
+    def save(self, key, folder, mainfile, **info):
+        """
+        Guarda los archivos generados por una compilación.
+
+        :param folder: Carpeta de compilación
+        :param info: Datos de la compilación (tiempo, release, etc.)
+        :param key: Hash de la carpeta previo a compilar, ver dist_hash
+        :param mainfile: Archivo principal
+        :return: None
+        """
+        entry = self._folder + key + '/'
+        shutil.rmtree(entry, ignore_errors=True)
+        os.makedirs(entry)
+        files = [f for f in _walk(folder) if _is_output(f, mainfile) and not f.endswith('.fmt')]
+        for f in files:
+            os.makedirs(os.path.dirname(entry + f), exist_ok=True)
+            shutil.copyfile(folder + f, entry + f)
+        info['files'] = files
+        info['mainfile'] = mainfile
+        info['time'] = time.time()
+        info['toolchain'] = toolchain_version()
+        with open(entry + BUILD_FILE, 'w', encoding='utf8') as f:  # Se escribe al final, marca la entrada completa
+            json.dump(info, f, indent=2)
+        self._prune()
+
+    def latest(self, release, mainfile):
+        """
+        Retorna la última compilación guardada de un release con el mismo
+        archivo principal y la misma versión de pdflatex y bibtex.
+
+        :param mainfile: Archivo principal
+        :param release: Nombre del release
+        :return: Carpeta y datos de la compilación, None si no hay una
+        :rtype: tuple, None
+        """
+        if not os.path.isdir(self._folder):
+            return None
+        last = None
+        for b in os.listdir(self._folder):
+            if not os.path.isfile(self._folder + b + '/' + BUILD_FILE):
+                continue
+            with open(self._folder + b + '/' + BUILD_FILE, encoding='utf8') as f:
+                build = json.load(f)
+            if build.get('release') != release or build['mainfile'] != mainfile or \
+                    build.get('toolchain') != toolchain_version():
+                continue
+            if last is None or build['time'] > last[1]['time']:
+                last = (self._folder + b + '/', build)
+        return last
+
+    def seed(self, release, folder, mainfile):
+        """
+        Copia los aux y bbl de la última compilación del release a la carpeta de
+        compilación, así pdflatex parte con las referencias y la bibliografía
+        resueltas.
+
+        :param folder: Carpeta de compilación
+        :param mainfile: Archivo principal
+        :param release: Nombre del release
+        :return: Número de archivos copiados
+        :rtype: int
+        """
+        last = self.latest(release, mainfile)
+        if last is None:
+            return 0
+        entry, build = last
+        files = [f for f in build['files'] if f.endswith(BUILD_WARM_START)]
+        for f in files:
+            os.makedirs(os.path.dirname(folder + f), exist_ok=True)
+            shutil.copyfile(entry + f, folder + f)
+        return len(files)
+
+
+class LogParser(object):
+    """
+    Lee la salida de pdflatex o bibtex línea a línea mientras corre el proceso.
+    Se cuentan las advertencias y las cajas overfull/underfull, se guardan los
+    primeros LOG_MAX_MESSAGES errores y advertencias, el número de páginas y si
+    el documento pide otra pasada. No se guarda el log completo.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.errors = []  # Tuplas (mensaje, línea del archivo)
+        self.fatal = False
+        self.nerrors = 0
+        self.nwarnings = 0
+        self.overfull = 0
+        self.pages = None
+        self.rerun = False
+        self.underfull = 0
+        self.warnings = []
+        self._pending = ''  # Línea cortada por pdflatex
+
+    def feed(self, line):
+        """
+        Procesa una línea de la salida.
+
+        :param line: Línea
+        :type line: str
+        :return: None
+        """
+        line = line.rstrip('\r\n')
+        if len(line) == LOG_LINE_WIDTH:
+            self._pending += line
+            return
+        line = self._pending + line
+        self._pending = ''
+        self._parse(line)
+
+    def close(self):
+        """
+        Procesa la última línea si quedó cortada.
+
+        :return: None
+        """
+        if self._pending != '':
+            self._parse(self._pending)
+            self._pending = ''
+
+    def _parse(self, line):
+        """
+        Clasifica una línea completa.
+
+        :param line: Línea
+        :type line: str
+        :return: None
+        """
+        if line.startswith('! '):
+            self.nerrors += 1
+            if len(self.errors) < LOG_MAX_MESSAGES:
+                self.errors.append((line[2:], None))
+        elif line.startswith('l.') and len(self.errors) > 0 and self.errors[-1][1] is None:
+            m = _LOG_ERROR_LINE.match(line)
+            if m is not None:
+                self.errors[-1] = (self.errors[-1][0], int(m.group(1)))
+        elif line.startswith('Overfull \\'):
+            self.overfull += 1
+        elif line.startswith('Underfull \\'):
+            self.underfull += 1
+        elif line.startswith('Output written on'):
+            m = _LOG_PAGES.search(line)
+            if m is not None:
+                self.pages = int(m.group(1))
+        elif _LOG_WARNING.search(line):
+            self.nwarnings += 1
+            if len(self.warnings) < LOG_MAX_MESSAGES:
+                self.warnings.append(line)
+        if not self.rerun and _LOG_RERUN.search(line):
+            self.rerun = True
+        if not self.fatal:
+            for f in _LOG_FATAL:
+                if f in line:
+                    self.fatal = True
+
+    def summary(self):
+        """
+        Retorna el resumen de la salida.
+
+        :return: Diccionario con errores, advertencias, cajas, páginas y si pide otra pasada
+        :rtype: dict
+        """
+        self.close()
+        return {'errors': [list(e) for e in self.errors], 'fatal': self.fatal, 'nerrors': self.nerrors,
+                'nwarnings': self.nwarnings, 'overfull': self.overfull, 'pages': self.pages, 'rerun': self.rerun,
+                'underfull': self.underfull, 'warnings': list(self.warnings)}
@@ -0,0 +1,232 @@
+"""
+CONTEXT
+Contexto de ejecución de cada exportación
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = [
+    'ExportCancelled',
+    'ExportContext'
+]
+
+# Importación de librerías
+from extlbx.profiler import Profiler
+from extlbx.releases import RELEASES
+from extlbx.utils import popen, read_output
+from subprocess import PIPE, STDOUT
+import copy
+import os
+import threading
+import time
+
+
+def _abs_root(path, root=''):
+    """
+    Retorna una ruta absoluta terminada en '/'. Las rutas relativas se resuelven
+    respecto a root.
+
+    :param path: Ruta
+    :param root: Raíz de las rutas relativas
+    :return: Ruta absoluta
+    :rtype: str
+    """
+    if path is None:
+        return None
+    if not os.path.isabs(path):
+        path = os.path.join(root, path)
+    return os.path.abspath(path).replace('\\', '/') + '/'
+
+
+class ExportCancelled(Exception):
+    """
+    Excepción lanzada cuando se cancela una exportación en curso.
+    """
+
+
+class ExportContext(object):
+    """
+    Contexto de una exportación. Guarda el estado de los archivos de cada release,
+    las rutas y los datos de la versión de una única ejecución.
+    """
+
+    def __init__(self, version, versiondev, versionhash, mainroot=None, informeroot=None, statsroot=None,
+                 profiler=None, compilefmt=False, compilecache=False, compilewarm=False):
+        """
+        Constructor.
+
+        :param version: Versión
+        :param versiondev: Versión developer
+        :param versionhash: Hash de la versión
+        :param mainroot: Carpeta raíz del export, si es None se usa la carpeta actual
+        :param informeroot: Raíz de informe-template, relativa a mainroot
+        :param statsroot: Raíz de la carpeta de estadísticas, relativa a mainroot
+        :param profiler: Mediciones de las etapas, si es None se crea uno sin memoria ni cProfile
+        :param compilecache: Restaura la compilación guardada si las fuentes no cambiaron
+        :param compilefmt: Compila con el formato precompilado del preámbulo de cada template
+        :param compilewarm: Parte con los aux y bbl de la última compilación, y repite pdflatex hasta que converja
+        """
+        self.version = version
+        self.versiondev = versiondev
+        self.versionhash = versionhash
+        self.dia = time.strftime('%d/%m/%Y')
+
+        # Rutas absolutas, la exportación no cambia la carpeta de trabajo
+        if mainroot is None:
+            mainroot = os.getcwd()
+        self.mainroot = _abs_root(mainroot)
+        self.informeroot = _abs_root(informeroot, self.mainroot)
+        self.statsroot = _abs_root(statsroot, self.mainroot)
+
+        # Copia de los releases usados en la ejecución
+        self._releases = {}
+
+        # Mediciones de las etapas, se activan con profiler.activate()
+        self.profiler = profiler if profiler is not None else Profiler()
+
+        # Formato precompilado del preámbulo (mylatexformat) y compilaciones guardadas
+        self.compilecache = compilecache
+        self.compilefmt = compilefmt
+        self.compilewarm = compilewarm
+
+        # Cancelación, procesos en ejecución
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._procs = []
+
+    def call(self, cmds, stdout, stderr=None, cwd=None, output=None):
+        """
+        Llama a una instrucción en consola. El proceso queda registrado mientras
+        corre, así puede terminarse al cancelar la exportación.
+
+        :param cmds: Lista de comandos
+        :param stdout: Salida estandar
+        :param stderr: Salida de errores
+        :param cwd: Carpeta en la que se ejecuta el comando
+        :param output: Función que recibe cada línea de la salida, si no es None la salida se lee por un pipe
+        :return: Tiempo de ejecución
+        :rtype: float
+        """
+        self.check_cancelled()
+        t = time.time()
+        if output is None:
+            proc = popen(cmds, stdout, stderr=stderr, cwd=cwd)
+        else:
+            proc = popen(cmds, PIPE, stderr=STDOUT, cwd=cwd)
+        with self._lock:
+            self._procs.append(proc)
+            if self._cancelled.is_set():
+                proc.kill()
+        try:
+            if output is not None:
+                read_output(proc, output)
+            proc.wait()
+        finally:
+            with self._lock:
+                self._procs.remove(proc)
+        self.check_cancelled()
+        return time.time() - t
+
+    def cancel(self):
+        """
+        Cancela la exportación, termina los procesos en ejecución.
+
+        :return: None
+        """
+        with self._lock:
+            self._cancelled.set()
+            for proc in self._procs:
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
+
+    def cancelled(self):
+        """
+        Indica si la exportación fue cancelada.
+
+        :return: Cancelada
+        :rtype: bool
+        """
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        """
+        Lanza ExportCancelled si la exportación fue cancelada.
+
+        :return: None
+        """
+        if self._cancelled.is_set():
+            raise ExportCancelled('Exportación cancelada')
+
+    def get_release(self, tag):
+        """
+        Retorna el release de la ejecución. Se crea una copia de la definición
+        global la primera vez que se pide, por lo que los archivos cargados no
+        se comparten entre ejecuciones.
+
+        :param tag: Tag del release
+        :type tag: str
+        :return: Release
+        :rtype: dict
+        """
+        if tag not in self._releases:
+            self._releases[tag] = copy.deepcopy(RELEASES[tag])
+        return self._releases[tag]
+
+    def get_root(self, tag):
+        """
+        Retorna la carpeta raíz de un release como ruta absoluta.
+
+        :param tag: Tag del release
+        :type tag: str
+        :return: Ruta
+        :rtype: str
+        """
+        return _abs_root(self.get_release(tag)['ROOT'], self.mainroot)
+
+    def get_files(self, tag):
+        """
+        Retorna los archivos cargados en memoria de un release.
+
+        :param tag: Tag del release
+        :type tag: str
+        :return: Archivos
+        :rtype: dict
+        """
+        return self.get_release(tag)['FILES']
+
+    def clear(self, tag):
+        """
+        Borra los archivos cargados de un release.
+
+        :param tag: Tag del release
+        :type tag: str, list
+        :return: None
+        """
+        if isinstance(tag, list):
+            for t in tag:
+                self.clear(t)
+        else:
+            self._releases.pop(tag, None)
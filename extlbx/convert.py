@@ -36,22 +36,35 @@ __all__ = [
     'export_presentacion',
     'export_reporte',
     'export_tesis',
+    'get_exporter',
     'MSG_FOKTIMER'
 ]
 
 # Importación de librerías
+from extlbx.compiler import BUILD_FOLDER, BuildCache, build_state, COMPILE_MAX_PASSES, dist_hash, FMT_FOLDER, \
+    FormatCache, LogParser
+from extlbx.context import ExportContext
 from extlbx.latex import *
+from extlbx.profiler import span
 from extlbx.releases import *
 from extlbx.utils import *
 from shutil import copyfile
 from extlbx.stats import *
+from extlbx.texconfig import TexConfig
 from extlbx.ziputils import *
 import copy
 import time
 import os
 
 # Constantes
+MSG_CTIME_REGRESSION = 'ADVERTENCIA: COMPILACION LENTA [t {ctime:.3g}, base {baseline:.3g}, z {zscore:.3g}]'
+MSG_COMPILE_ERROR = 'ERROR LATEX: {0} [LINEA {1}]'
+MSG_COMPILE_FATAL = 'ERROR: LA COMPILACION FALLO, NO SE GUARDA EL PDF NI LAS ESTADISTICAS'
 MSG_DCOMPILE = 'COMPILANDO ... '
+MSG_DIAGNOSTICS = 'PAGINAS {pages}, PASADAS {passes}, ADVERTENCIAS {nwarnings}, OVERFULL {overfull}, ' \
+                  'UNDERFULL {underfull}, ERRORES {nerrors}, BIBTEX {bibtex[nwarnings]}/{bibtex[nerrors]}'
+MSG_FOKCACHED = 'OK [t {0:.3g}, GUARDADA]'
+MSG_FMT_ERROR = 'ADVERTENCIA: NO SE PUDO PRECOMPILAR EL PREAMBULO, SE COMPILA SIN FORMATO'
 MSG_FOKTIMER = 'OK [t {0:.3g}]'
 MSG_GEN_FILE = 'GENERANDO ARCHIVOS ... '
 MSG_LAST_VER = 'ULTIMA VERSION:\t {0}'
@@ -136,36 +149,35 @@ def assemble_template_file(templatef, configfile, distfolder, headersize, files)
     :param headersize: Tamaño del header
     :param files: Lista de archivos
     """
-    modlists = [' !DELCOM', ' !DISTNL', ' !NL', ' !STRIP', ' !PREVNL', ' !PREVDISTNL']
-    new_template_file = []
-    for d in range(len(templatef)):
-        lined = templatef[d]
-        if '\\input{' == lined.strip()[0:7]:
-            ifile = get_file_from_input(lined)
-            if ifile == configfile:
-                new_template_file.append('\\input{template_config}\n')
-            else:
-                if STRIP_TEMPLATE_FILE:
-                    dataifile = file_to_list(distfolder + ifile)
+    with span('assemble'):
+        modlists = [' !DELCOM', ' !DISTNL', ' !NL', ' !STRIP', ' !PREVNL', ' !PREVDISTNL']
+        new_template_file = []
+        for d in range(len(templatef)):
+            lined = templatef[d]
+            tokd = tokenize_line(lined)
+            if tokd.kind == TOKEN_INPUT:
+                ifile = tokd.key
+                if ifile == configfile:
+                    new_template_file.append('\\input{template_config}\n')
                 else:
-                    dataifile = files[ifile]
-                if new_template_file[-1].strip() != '' and '% ' not in new_template_file[-1]:
-                    new_template_file.append('\n')
-                for j in range(len(dataifile)):
-                    jline = dataifile[j]
-                    if j < headersize:
-                        continue
-                    if jline.strip() == '' and STRIP_TEMPLATE_FILE:
-                        continue
-                    if j == len(dataifile) - 1 and jline.strip() == '':
-                        continue
-                    if '% ' in jline:
-                        for mod in modlists:
-                            jline = jline.replace(mod, '')
-                    new_template_file.append(jline)
-        else:
-            new_template_file.append(lined)
-    save_list_to_file(new_template_file, distfolder + 'template.tex')
+                    if STRIP_TEMPLATE_FILE:
+                        dataifile = file_to_list(distfolder + ifile)
+                    else:
+                        dataifile = files[ifile]
+                    if tokenize_line(new_template_file[-1]).kind != TOKEN_BLANK and '% ' not in new_template_file[-1]:
+                        new_template_file.append('\n')
+                    for j in range(headersize, len(dataifile)):
+                        jline = dataifile[j]
+                        tokj = tokenize_line(jline)
+                        if tokj.kind == TOKEN_BLANK and (STRIP_TEMPLATE_FILE or j == len(dataifile) - 1):
+                            continue
+                        if len(tokj.directives) > 0 and '% ' in jline:
+                            for mod in modlists:
+                                jline = jline.replace(mod, '')
+                        new_template_file.append(jline)
+            else:
+                new_template_file.append(lined)
+        save_list_to_file(new_template_file, distfolder + 'template.tex')
 
 
 def change_header_tex_files(files, release, headersize, headerversionpos, versionhead):
@@ -193,12 +205,68 @@ def change_header_tex_files(files, release, headersize, headerversionpos, versio
             print('Error en archivo ' + fl)
 
 
+def _compile_pdflatex(subrlfolder, mainfile, printfun, run, ctx):
+    """
+    Ejecuta pdflatex y bibtex sobre el archivo principal, la salida de cada
+    comando se lee con LogParser. Desde la segunda pasada de pdflatex se
+    termina cuando el log no pide otra, con un máximo de COMPILE_MAX_PASSES.
+    Si el contexto usa partida en caliente además se termina tras la primera
+    pasada si los aux y bbl no cambiaron y el log no pide otra. Un error fatal
+    detiene las pasadas.
+
+    :param subrlfolder: Carpeta de distribución, se compila dentro de ella
+    :param mainfile: Archivo principal
+    :param printfun: Función para imprimir en consola
+    :param run: Función que ejecuta los comandos
+    :param ctx: Contexto de la exportación
+    :return: Tiempo de compilación (el menor de las dos primeras pasadas) y diagnóstico de la última pasada
+    :rtype: tuple
+    """
+    converge = ctx is not None and ctx.compilewarm
+    with open(os.devnull, 'w') as FNULL:
+
+        # Formato del preámbulo, se compila una vez y lo usan todas las pasadas
+        fmtname = None
+        if ctx is not None and ctx.compilefmt:
+            fmtname = FormatCache(ctx.mainroot + FMT_FOLDER).get(subrlfolder, mainfile, run, FNULL)
+            if fmtname is None:
+                printfun(MSG_FMT_ERROR)
+        pdflatex = ['pdflatex', '-interaction=nonstopmode', mainfile]
+        if fmtname is not None:
+            pdflatex.insert(1, f'-fmt={fmtname}')
+
+        try:
+            state = build_state(subrlfolder) if converge else None
+            log = LogParser()
+            t = [run(pdflatex, stdout=None, cwd=subrlfolder, output=log.feed)]
+            log.close()  # La última línea puede quedar cortada, se procesa antes de decidir otra pasada
+            bibtex = LogParser()
+            run(['bibtex', mainfile.replace('.tex', '')], stdout=None, cwd=subrlfolder, output=bibtex.feed)
+            bibtex.close()
+            while len(t) < COMPILE_MAX_PASSES and not log.fatal:
+                if not log.rerun and (len(t) >= 2 or (converge and build_state(subrlfolder) == state)):
+                    break
+                if len(t) >= 2:  # Actualización final para reparar el PDF
+                    time.sleep(1)
+                log = LogParser()
+                t.append(run(pdflatex, stdout=None, cwd=subrlfolder, output=log.feed))
+                log.close()
+            tmean = min(t[0:2])
+            printfun(MSG_FOKTIMER.format(tmean))
+        finally:
+            FormatCache.release(subrlfolder, fmtname)
+    diagnostics = log.summary()
+    diagnostics['bibtex'] = bibtex.summary()
+    diagnostics['passes'] = len(t)
+    return tmean, diagnostics
+
+
 def compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                     release, version, stat, versiondev, dia, versionhash, plotstats, prefixpath=''):
+                     release, version, stat, versiondev, dia, versionhash, plotstats, prefixpath='', ctx=None):
     """
     Compila el template.
 
-    :param subrlfolder: Carpeta de distribución
+    :param subrlfolder: Carpeta de distribución, se compila dentro de ella
     :param printfun: Función para imprimir en consola
     :param mainfile: Archivo principal
     :param savepdf: Guarda el pdf
@@ -212,41 +280,73 @@ def compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroo
     :param versionhash: Hash de la versión
     :param plotstats: Imprime estadísticas
     :param prefixpath: Agrega prefijo al path del pdf
+    :param ctx: Contexto de la exportación, permite cancelar la compilación, usar el formato precompilado y las
+        compilaciones guardadas
     """
     lc = 1
-    with open(os.devnull, 'w') as FNULL:
-        printfun(MSG_DCOMPILE, end='')
-        with Cd(subrlfolder):
-            # print(subrlfolder, mainfile)
-            t1 = call(['pdflatex', '-interaction=nonstopmode', mainfile], stdout=FNULL)
-            call(['bibtex', mainfile.replace('.tex', '')], stdout=FNULL)
-            t2 = call(['pdflatex', '-interaction=nonstopmode', mainfile], stdout=FNULL)
-            tmean = min(t1, t2)
-            printfun(MSG_FOKTIMER.format(tmean))
-
-            # Actualización final para reparar el PDF
-            time.sleep(1)
-            call(['pdflatex', '-interaction=nonstopmode', mainfile], stdout=FNULL)
-            time.sleep(1)
-            call(['pdflatex', '-interaction=nonstopmode', mainfile], stdout=FNULL)
-
-            # Cuenta el número de líneas
-            f = open('template.tex', encoding='utf8')
-            for _ in f:
-                lc += 1
-            f.close()
-
-            # Copia a la carpeta pdf_version
-            if savepdf:
-                copyfile(mainfile.replace('.tex', '.pdf'), prefixpath + release['PDF_FOLDER'].format(version))
 
-    # Se agregan las estadísticas
-    if addstat:
-        add_stat(statsroot + stat['FILE'], versiondev, tmean, dia, lc, versionhash)
+    # Los comandos se ejecutan a través del contexto para poder cancelarlos
+    run = call if ctx is None else ctx.call
+    with span('compile'):
+        printfun(MSG_DCOMPILE, end='')
 
-    # Se plotean las estadísticas
-    if plotstats:
-        plot_stats(statsroot + stat['FILE'], statsroot + stat['CTIME'], statsroot + stat['LCODE'])
+        # Si las fuentes no cambiaron se restaura la compilación guardada
+        build, buildcache, buildkey = None, None, None
+        if ctx is not None and (ctx.compilecache or ctx.compilewarm):
+            buildcache = BuildCache(ctx.mainroot + BUILD_FOLDER)
+            buildkey = dist_hash(subrlfolder, mainfile)
+            if ctx.compilecache:
+                build = buildcache.restore(buildkey, subrlfolder)
+            if build is not None and 'diagnostics' not in build:  # Guardada antes de leer los logs
+                build = None
+        if build is not None:
+            tmean, diagnostics = build['tmean'], build['diagnostics']
+            printfun(MSG_FOKCACHED.format(tmean))
+        else:
+            # Partida en caliente con los aux y bbl de la última compilación del template
+            if ctx is not None and ctx.compilewarm:
+                buildcache.seed(release['NAME'], subrlfolder, mainfile)
+            tmean, diagnostics = _compile_pdflatex(subrlfolder, mainfile, printfun, run, ctx)
+
+    # Una compilación cancelada no genera estadísticas
+    if ctx is not None:
+        ctx.check_cancelled()
+
+    # Resumen de los logs de la compilación
+    printfun(MSG_DIAGNOSTICS.format(**dict(diagnostics, pages=diagnostics['pages'] or '-')))
+    for msg, line in diagnostics['errors']:
+        printfun(MSG_COMPILE_ERROR.format(msg, line or '-'))
+    if diagnostics['fatal']:
+        printfun(MSG_COMPILE_FATAL)
+        return
+    if build is None and buildcache is not None:
+        buildcache.save(buildkey, subrlfolder, mainfile, release=release['NAME'], tmean=tmean,
+                        diagnostics=diagnostics)
+
+    # Cuenta el número de líneas
+    f = open(subrlfolder + 'template.tex', encoding='utf8')
+    for _ in f:
+        lc += 1
+    f.close()
+
+    # Copia a la carpeta pdf_version
+    if savepdf:
+        copyfile(subrlfolder + mainfile.replace('.tex', '.pdf'),
+                 subrlfolder + prefixpath + release['PDF_FOLDER'].format(version))
+
+    with span('stats'):
+        # Se agregan las estadísticas
+        if addstat:
+            add_stat(statsroot + stat['FILE'], versiondev, tmean, dia, lc, versionhash)
+
+            # Se compara el tiempo con las compilaciones anteriores del template
+            regression = detect_ctime_regression(statsroot + stat['FILE'])
+            if regression is not None:
+                printfun(MSG_CTIME_REGRESSION.format(**regression))
+
+        # Se plotean las estadísticas en segundo plano
+        if plotstats:
+            plot_stats_async(statsroot + stat['FILE'], statsroot + stat['CTIME'], statsroot + stat['LCODE'])
 
 
 def copy_assemble_template(files, distfolder, headersize, configfile, mainfile, examplefile):
@@ -261,31 +361,32 @@ def copy_assemble_template(files, distfolder, headersize, configfile, mainfile,
     :param examplefile: Archivo de ejemplo
     :return: None
     """
-    for f in files.keys():
-        fl = open(distfolder + f, 'w', encoding='utf8')
-
-        # Se escribe el header
-        if '.tex' in f:
-            data = files[f]
-            kline = 0
-            for d in data:
-                if kline < headersize:
-                    fl.write(d)
-                else:
-                    break
-                kline += 1
-
-        # Strip
-        dostrip = False
-        if f == configfile or f == mainfile or f == examplefile or '_config' in f:
+    with span('write'):
+        for f in files.keys():
+            fl = open(distfolder + f, 'w', encoding='utf8')
+
+            # Se escribe el header
+            if '.tex' in f:
+                data = files[f]
+                kline = 0
+                for d in data:
+                    if kline < headersize:
+                        fl.write(d)
+                    else:
+                        break
+                    kline += 1
+
+            # Strip
             dostrip = False
+            if f == configfile or f == mainfile or f == examplefile or '_config' in f:
+                dostrip = False
 
-        # Se escribe el documento
-        paste_external_tex_into_file(fl, f, files, headersize, STRIP_ALL_GENERATED_FILES and dostrip, dostrip,
-                                     True, configfile, False, dist=True, add_ending_line=False and dostrip)
+            # Se escribe el documento
+            paste_external_tex_into_file(fl, f, files, headersize, STRIP_ALL_GENERATED_FILES and dostrip, dostrip,
+                                         True, configfile, False, dist=True, add_ending_line=False and dostrip)
 
-        # Se elimina la última linea en blanco si hay doble
-        fl.close()
+            # Se elimina la última linea en blanco si hay doble
+            fl.close()
 
     # Mueve el archivo de configuraciones
     copyfile(distfolder + configfile, distfolder + 'template_config.tex')
@@ -295,7 +396,7 @@ def copy_assemble_template(files, distfolder, headersize, configfile, mainfile,
     assemble_template_file(files['template.tex'], configfile, distfolder, headersize, files)
 
 
-def export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder,
+def export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder, mainroot,
                                  deptimg=None, finalimg='fcfm'):
     """
     Exporta los departamentos.
@@ -304,17 +405,17 @@ def export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder,
     :param subrlfolder: Carpeta de los releases
     :param mainfile: Archivo principal
     :param distfolder: Carpeta de salida
+    :param mainroot: Carpeta raíz del export
     :param deptimg: Imagen del departamento fija
     :param finalimg: Imagen final
     :return: None
     """
     czip = release['ZIP']['NORMAL']
-    export_normal = Zip(czip['FILE'])
-    with Cd(subrlfolder):
-        export_normal.set_ghostpath(czip['GHOST'])
-        export_normal.add_excepted_file(czip['EXCEPTED'])
-        export_normal.add_file(czip['ADD']['FILES'])
-        export_normal.add_folder(czip['ADD']['FOLDER'])
+    export_normal = Zip(mainroot + czip['FILE'], root=subrlfolder)
+    export_normal.set_ghostpath(czip['GHOST'])
+    export_normal.add_excepted_file(czip['EXCEPTED'])
+    export_normal.add_file(czip['ADD']['FILES'])
+    export_normal.add_folder(czip['ADD']['FOLDER'])
     export_normal.save()
 
     # Se exportan los distintos estilos de versiones
@@ -337,15 +438,14 @@ def export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder,
 
         # Se genera el .zip
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(release['ZIP']['OTHERS']['NORMAL'].format(m[1]))
-        with Cd(subrlfolder):
-            export_normal.set_ghostpath(distfolder)
-            export_normal.add_excepted_file(czip['EXCEPTED'])
-            export_normal.add_file(czip['ADD']['FILES'])
-            export_normal.add_folder(release['ZIP']['OTHERS']['EXPATH'])
-            export_normal.add_file(release['ZIP']['OTHERS']['IMGPATH'].format(m[1]))
-            for k in m[2]:
-                export_normal.add_file(release['ZIP']['OTHERS']['IMGPATH'].format(k))
+        export_normal = Zip(mainroot + release['ZIP']['OTHERS']['NORMAL'].format(m[1]), root=subrlfolder)
+        export_normal.set_ghostpath(distfolder)
+        export_normal.add_excepted_file(czip['EXCEPTED'])
+        export_normal.add_file(czip['ADD']['FILES'])
+        export_normal.add_folder(release['ZIP']['OTHERS']['EXPATH'])
+        export_normal.add_file(release['ZIP']['OTHERS']['IMGPATH'].format(m[1]))
+        for k in m[2]:
+            export_normal.add_file(release['ZIP']['OTHERS']['IMGPATH'].format(k))
         export_normal.save()
 
     # Rollback archivo principal. Necesario para subtemplates
@@ -359,12 +459,12 @@ def export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder,
 # noinspection PyBroadException
 def export_informe(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                    plotstats=True, doclean=False, addstat=True, savepdf=True,
-                   informeroot=None, mainroot=None, backtoroot=False, statsroot=None):
+                   informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta el archivo principal, actualiza version.
 
     :param addstat: Agrega las estadísticas
-    :param backtoroot: Se devuelve a la carpeta root
+    :param ctx: Contexto de la exportación
     :param doclean: Limpia el diccionario
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -379,11 +479,18 @@ def export_informe(version, versiondev, versionhash, printfun=print, dosave=True
     :param versionhash: Hash de la versión
     :return: None
     """
-    # Tipo release
-    release = RELEASES[REL_INFORME]
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
 
-    # Se cambia de carpeta
-    os.chdir(informeroot)
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
+    # Tipo release
+    release = ctx.get_release(REL_INFORME)
 
     # Obtiene archivos
     configfile = 'src/config.tex'
@@ -395,19 +502,19 @@ def export_informe(version, versiondev, versionhash, printfun=print, dosave=True
     stat = release['STATS']
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionheader = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header de la versión
     versionhead = versionheader.format(version, dia)
 
     # Se buscan números de lineas de hyperref
-    initconf_data = file_to_list(initconffile)
+    initconf_data = file_to_list(informeroot + initconffile)
     l_tdate, d_tdate = find_line_str(initconf_data, 'Template.Date', True)
     l_thash, d_thash = find_line_str(initconf_data, 'Template.Version.Hash', True)
     l_ttype, d_ttype = find_line_str(initconf_data, 'Template.Type', True)
@@ -433,7 +540,7 @@ def export_informe(version, versiondev, versionhash, printfun=print, dosave=True
         data = files[f]
         # noinspection PyBroadException
         try:
-            fl = open(f, encoding='utf8')
+            fl = open(informeroot + f, encoding='utf8')
             for line in fl:
                 data.append(line)
             fl.close()
@@ -454,36 +561,37 @@ def export_informe(version, versiondev, versionhash, printfun=print, dosave=True
 
         # Se reescribe el archivo
         if dosave and (f == mainfile or f == examplefile):  # Se desactiva la escritura de archivos
-            save_list_to_file(data, f)
+            save_list_to_file(data, informeroot + f)
 
     # Se guardan archivos en DIST
     if dosave:
         files_dist = files.copy()
-        files_dist['library.bib'] = file_to_list('library.bib')
-        files_dist['natnumurl.bst'] = file_to_list('natnumurl.bst')
-        copy_assemble_template(files_dist, distfolder, headersize, configfile, mainfile, examplefile)
+        files_dist['library.bib'] = file_to_list(informeroot + 'library.bib')
+        files_dist['natnumurl.bst'] = file_to_list(informeroot + 'natnumurl.bst')
+        copy_assemble_template(files_dist, informeroot + distfolder, headersize, configfile, mainfile, examplefile)
 
     printfun(MSG_FOKTIMER.format(time.time() - t))
 
     # Compila el archivo
     if docompile and dosave:
-        compile_template(distfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats, prefixpath='../')
+        compile_template(informeroot + distfolder, printfun, mainfile, savepdf, addstat, statsroot,
+                         release, version, stat, versiondev, dia, versionhash, plotstats, prefixpath='../',
+                         ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
         # Se exportan los distintos estilos de versiones
         jmainfilel = 0
-        data_mainfile = file_to_list(distfolder + mainfile)
+        data_mainfile = file_to_list(informeroot + distfolder + mainfile)
         for j in range(len(data_mainfile)):
             if get_file_from_input(data_mainfile[j]) == examplefile:
                 data_mainfile[j] = '\\input{example} % Ejemplo, se puede borrar\n'
                 jmainfilel = j
-        save_list_to_file(data_mainfile, distfolder + mainfile)
+        save_list_to_file(data_mainfile, informeroot + distfolder + mainfile)
 
         # Se crea el archivo principal
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(mainroot + czip['FILE'])
+        export_normal = Zip(mainroot + czip['FILE'], root=informeroot)
         export_normal.set_ghostpath(distfolder)
         export_normal.add_excepted_file(czip['EXCEPTED'])
         export_normal.add_file(czip['ADD']['FILES'])
@@ -500,11 +608,11 @@ def export_informe(version, versiondev, versionhash, printfun=print, dosave=True
             data_mainfile[fl_pos_im_mainfile] = '\\def\\universitydepartmentimage {departamentos/' + m[1] + '}\n'
 
             # Se reescriben los archivos
-            save_list_to_file(data_mainfile, distfolder + mainfile)
+            save_list_to_file(data_mainfile, informeroot + distfolder + mainfile)
 
             # Se genera el .zip
             czip = release['ZIP']['NORMAL']
-            export_normal = Zip(mainroot + release['ZIP']['OTHERS']['NORMAL'].format(m[1]))
+            export_normal = Zip(mainroot + release['ZIP']['OTHERS']['NORMAL'].format(m[1]), root=informeroot)
             export_normal.set_ghostpath(distfolder)
             export_normal.add_excepted_file(czip['EXCEPTED'])
             export_normal.add_file(czip['ADD']['FILES'])
@@ -520,24 +628,21 @@ def export_informe(version, versiondev, versionhash, printfun=print, dosave=True
         data_mainfile[fl_pos_im_mainfile] = replace_argument(data_mainfile[fl_pos_im_mainfile], 1,
                                                              'departamentos/fcfm')
         data_mainfile[jmainfilel] = examplefile + ' % Ejemplo, se puede borrar\n'
-        save_list_to_file(data_mainfile, distfolder + mainfile)
+        save_list_to_file(data_mainfile, informeroot + distfolder + mainfile)
 
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-
-    # Se cambia a carpeta root
-    if backtoroot:
-        os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
 
 
 # noinspection PyUnboundLocalVariable
 def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                       plotstats=True, addstat=True, doclean=True,
-                      savepdf=True, informeroot=None, mainroot=None, statsroot=None):
+                      savepdf=True, informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta las auxiliares.
 
     :param addstat: Agrega las estadísticas
+    :param ctx: Contexto de la exportación
     :param doclean: Borra los archivos generados en lista
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -552,8 +657,18 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_AUXILIAR]
+    release = ctx.get_release(REL_AUXILIAR)
 
     # Obtiene archivos
     t = time.time()
@@ -562,18 +677,18 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     # noinspection PyTypeChecker
     export_informe(version, versiondev, versionhash, dosave=False, docompile=False,
                    plotstats=False, printfun=nonprint, addstat=False, savepdf=False,
-                   informeroot=informeroot)
+                   informeroot=informeroot, ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
-    mainf = RELEASES[REL_INFORME]['FILES']
+    mainf = ctx.get_files(REL_INFORME)
     files = release['FILES']
     files['main.tex'] = copy.copy(mainf['main.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
     files['src/cfg/page.tex'] = copy.copy(mainf['src/cfg/page.tex'])
-    files['src/cmd/auxiliar.tex'] = file_to_list('src/cmd/auxiliar.tex')
+    files['src/cmd/auxiliar.tex'] = file_to_list(informeroot + 'src/cmd/auxiliar.tex')
     files['src/cmd/column.tex'] = copy.copy(mainf['src/cmd/column.tex'])
     files['src/cmd/core.tex'] = copy.copy(mainf['src/cmd/core.tex'])
     files['src/cmd/equation.tex'] = copy.copy(mainf['src/cmd/equation.tex'])
@@ -584,24 +699,24 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     files['src/config.tex'] = copy.copy(mainf['src/config.tex'])
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_auxiliar.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_auxiliar.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_auxiliar.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_auxiliar.tex')
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_AUXILIAR)
     stat = release['STATS']
     configfile = 'src/config.tex'
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -609,7 +724,7 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     # -------------------------------------------------------------------------
     # MODIFICA EL MAIN
     # -------------------------------------------------------------------------
-    main_auxiliar = file_to_list('main_auxiliar.tex')
+    main_auxiliar = file_to_list(informeroot + 'main_auxiliar.tex')
     nb = find_extract(main_auxiliar, '% EQUIPO DOCENTE')
     nb.append('\n')
     files[mainfile] = find_replace_block(files[mainfile], '% INTEGRANTES, PROFESORES Y FECHAS', nb)
@@ -634,6 +749,7 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     # MODIFICA CONFIGURACIONES
     # -------------------------------------------------------------------------
     fl = 'src/config.tex'
+    cfg = TexConfig(files[fl])
 
     # Configuraciones que se borran
     cdel = ['nameportraitpage', 'indextitlecolor', 'firstpagemargintop',
@@ -643,40 +759,23 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
             'bibtexindexbibliography', 'anumsecaddtocounter', 'predocpageromanupper',
             'linkcolorindex']
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
+        cfg.delete(cdel)
+    files[fl] = cfg.to_list()
     files[fl] = find_delete_block(files[fl], '% CONFIGURACIÓN DEL ÍNDICE', white_end_block=True)
     ra, rb = find_block(files[fl], '% ESTILO PORTADA Y HEADER-FOOTER', True)
     files[fl] = del_block_from_list(files[fl], ra, rb)
-    for cdel in []:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('   %', '%')
-    ra, _ = find_block(files[fl], 'equationrestart', True)
-    nconf = replace_argument(files[fl][ra], 1, 'none')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'stylecitereferences', True)
-    nconf = replace_argument(files[fl][ra], 1, 'bibtex')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'natbibrefstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'ieeetr').replace('%', '   %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemargintop', True)
-    nconf = replace_argument(files[fl][ra], 1, '2.3').replace('  %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'cfgbookmarksopenlevel', True)
-    nconf = replace_argument(files[fl][ra], 1, '1')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'showlinenumbers', True)
-    files[fl].insert(ra + 1, '\\def\\templatestyle {style1}        % Estilo del template: style1 a style4\n')
-    ra, _ = find_block(files[fl], '\\sssectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\normalsize').replace('    %', '%').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\ssectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\large')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\Large')
-    files[fl][ra] = nconf
+    cfg = TexConfig(files[fl])
+    cfg.replace_value('equationrestart', 'none')
+    cfg.replace_value('stylecitereferences', 'bibtex')
+    cfg.replace_value('natbibrefstyle', 'ieeetr')
+    cfg.replace_value('pagemargintop', '2.3')
+    cfg.replace_value('cfgbookmarksopenlevel', '1')
+    cfg.insert_after('showlinenumbers',
+                     ['\\def\\templatestyle {style1}        % Estilo del template: style1 a style4\n'])
+    cfg.replace_value('sssectionfontsize', '\\normalsize')
+    cfg.replace_value('ssectionfontsize', '\\large')
+    cfg.replace_value('sectionfontsize', '\\Large')
+    files[fl] = cfg.to_list()
 
     # -------------------------------------------------------------------------
     # CAMBIA LAS ECUACIONES
@@ -692,7 +791,7 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     for idel in idel:
         ra, _ = find_block(files[fl], idel, True)
         files[fl].pop(ra)
-    aux_imports = file_to_list('src/env/imports_auxiliar.tex')
+    aux_imports = file_to_list(informeroot + 'src/env/imports_auxiliar.tex')
     nl = find_extract(aux_imports, '% Anexos/Apéndices', True)
     files[fl] = find_replace_block(files[fl], '\\ifthenelse{\\equal{\\showappendixsecindex}', nl, jadd=-1,
                                    white_end_block=True)
@@ -744,7 +843,7 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     # PAGECONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/page.tex'
-    aux_pageconf = file_to_list('src/cfg/page_auxiliar.tex')
+    aux_pageconf = file_to_list(informeroot + 'src/cfg/page_auxiliar.tex')
     nl = find_extract(aux_pageconf, '% Numeración de páginas', True)
     files[fl] = find_replace_block(files[fl], '% Numeración de páginas', nl, white_end_block=True, jadd=-1)
     nl = find_extract(aux_pageconf, '% Márgenes de páginas y tablas', True)
@@ -774,7 +873,7 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     # -------------------------------------------------------------------------
     fl = 'src/cmd/auxiliar.tex'
     files[fl] = find_delete_block(files[fl], '% COMPILACION', white_end_block=True)
-    aux_fun = file_to_list('src/env/environments.tex')
+    aux_fun = file_to_list(informeroot + 'src/env/environments.tex')
     nl = find_extract(aux_fun, '% Crea una sección de referencias solo para bibtex', True)
     files[fl] = add_block_from_list(files[fl], nl, LIST_END_LINE)
     nl = find_extract(aux_fun, '% Crea una sección de anexos', True)
@@ -832,7 +931,6 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -841,35 +939,33 @@ def export_auxiliares(version, versiondev, versionhash, printfun=print, dosave=T
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(czip['FILE'])
-        with Cd(subrlfolder):
-            export_normal.set_ghostpath(czip['GHOST'])
-            export_normal.add_excepted_file(czip['EXCEPTED'])
-            export_normal.add_file(czip['ADD']['FILES'])
-            export_normal.add_folder(czip['ADD']['FOLDER'])
+        export_normal = Zip(mainroot + czip['FILE'], root=subrlfolder)
+        export_normal.set_ghostpath(czip['GHOST'])
+        export_normal.add_excepted_file(czip['EXCEPTED'])
+        export_normal.add_file(czip['ADD']['FILES'])
+        export_normal.add_folder(czip['ADD']['FOLDER'])
         export_normal.save()
 
     # Limpia el diccionario
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-        clear_dict(RELEASES[REL_AUXILIAR], 'FILES')
-
-    # Retorna a root
-    os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
+        ctx.clear(REL_AUXILIAR)
 
 
 def export_controles(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
-                     plotstats=True, addstat=True, savepdf=True,
-                     informeroot=None, mainroot=None, statsroot=None):
+                     plotstats=True, addstat=True, doclean=True, savepdf=True,
+                     informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta los controles.
 
     :param addstat: Agrega las estadísticas
+    :param ctx: Contexto de la exportación
+    :param doclean: Limpia el diccionario
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
     :param informeroot: Raíz de informe-template
@@ -883,8 +979,18 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_CONTROLES]
+    release = ctx.get_release(REL_CONTROLES)
 
     # Obtiene archivos
     t = time.time()
@@ -893,15 +999,14 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     # noinspection PyTypeChecker
     export_auxiliares(version, versiondev, versionhash, dosave=False, docompile=False,
                       plotstats=False, printfun=nonprint, addstat=False, doclean=False, savepdf=False,
-                      informeroot=informeroot, mainroot=mainroot)
+                      informeroot=informeroot, mainroot=mainroot, ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
 
-    os.chdir(informeroot)
-    mainf = RELEASES[REL_AUXILIAR]['FILES']
+    mainf = ctx.get_files(REL_AUXILIAR)
     files = release['FILES']
     files['main.tex'] = copy.copy(mainf['main.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
@@ -917,24 +1022,24 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     files['src/config.tex'] = copy.copy(mainf['src/config.tex'])
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_control.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_control.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_control.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_control.tex')
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_CONTROLES)
     stat = release['STATS']
     configfile = 'src/config.tex'
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -942,7 +1047,7 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     # -------------------------------------------------------------------------
     # MODIFICA EL MAIN
     # -------------------------------------------------------------------------
-    main_auxiliar = file_to_list('main_control.tex')
+    main_auxiliar = file_to_list(informeroot + 'main_control.tex')
     nb = find_extract(main_auxiliar, '% EQUIPO DOCENTE')
     nb.append('\n')
     files[mainfile] = find_replace_block(files[mainfile], '% EQUIPO DOCENTE', nb)
@@ -956,7 +1061,7 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     # -------------------------------------------------------------------------
     fl = 'src/cmd/control.tex'
     files[fl][1] = '% Documento:    Funciones exclusivas de Template-Controles\n'
-    fun_control = file_to_list(fl)
+    fun_control = file_to_list(informeroot + fl)
     files[fl].append('\n')
     nl = find_extract(fun_control, '\\newcommand{\\newquestionthemed}')
     files[fl] = add_block_from_list(files[fl], nl, LIST_END_LINE, addnewline=True)
@@ -971,7 +1076,7 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     # PAGECONFFILE
     # -------------------------------------------------------------------------
     fl = 'src/cfg/page.tex'
-    control_pageconf = file_to_list('src/cfg/page_control.tex')
+    control_pageconf = file_to_list(informeroot + 'src/cfg/page_control.tex')
     nl = find_extract(control_pageconf, '% Se crean los header-footer', True)
     files[fl] = find_replace_block(files[fl], '% Se crean los header-footer', nl, white_end_block=True, jadd=-1)
 
@@ -981,10 +1086,11 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     fl = 'src/config.tex'
     ra = find_line(files[fl], '% CONFIGURACIONES DE OBJETOS')
     files[fl][ra] += '\\def\\bolditempto {true}            % Puntaje item en negrita\n'
+    cfg = TexConfig(files[fl])
     cdel = ['templatestyle']
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
+        cfg.delete(cdel)
+    files[fl] = cfg.to_list()
 
     # -------------------------------------------------------------------------
     # CAMBIO INITCONF
@@ -1018,7 +1124,6 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -1027,35 +1132,34 @@ def export_controles(version, versiondev, versionhash, printfun=print, dosave=Tr
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(czip['FILE'])
-        with Cd(subrlfolder):
-            export_normal.set_ghostpath(czip['GHOST'])
-            export_normal.add_excepted_file(czip['EXCEPTED'])
-            export_normal.add_file(czip['ADD']['FILES'])
-            export_normal.add_folder(czip['ADD']['FOLDER'])
+        export_normal = Zip(mainroot + czip['FILE'], root=subrlfolder)
+        export_normal.set_ghostpath(czip['GHOST'])
+        export_normal.add_excepted_file(czip['EXCEPTED'])
+        export_normal.add_file(czip['ADD']['FILES'])
+        export_normal.add_folder(czip['ADD']['FOLDER'])
         export_normal.save()
 
     # Limpia el diccionario
-    clear_dict(RELEASES[REL_INFORME], 'FILES')
-    clear_dict(RELEASES[REL_AUXILIAR], 'FILES')
-    clear_dict(RELEASES[REL_CONTROLES], 'FILES')
-
-    os.chdir(mainroot)
+    if doclean:
+        ctx.clear(REL_INFORME)
+        ctx.clear(REL_AUXILIAR)
+        ctx.clear(REL_CONTROLES)
 
 
 # noinspection PyUnboundLocalVariable
 def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                    plotstats=True, addstat=True, doclean=True,
-                   savepdf=True, informeroot=None, mainroot=None, statsroot=None):
+                   savepdf=True, informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta los reportes.
 
     :param addstat: Agrega las estadísticas
+    :param ctx: Contexto de la exportación
     :param doclean: Borra los archivos generados en lista
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -1070,8 +1174,18 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_REPORTE]
+    release = ctx.get_release(REL_REPORTE)
 
     # Obtiene archivos
     t = time.time()
@@ -1079,17 +1193,18 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     # Genera informe
     # noinspection PyTypeChecker
     export_informe(version, versiondev, versionhash, dosave=False, docompile=False,
-                   plotstats=False, printfun=nonprint, addstat=False, savepdf=False, informeroot=informeroot)
+                   plotstats=False, printfun=nonprint, addstat=False, savepdf=False, informeroot=informeroot,
+                   ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
-    mainf = RELEASES[REL_INFORME]['FILES']
+    mainf = ctx.get_files(REL_INFORME)
     files = release['FILES']
-    files['library.bib'] = file_to_list('library.bib')
+    files['library.bib'] = file_to_list(informeroot + 'library.bib')
     files['main.tex'] = copy.copy(mainf['main.tex'])
-    files['natnumurl.bst'] = file_to_list('natnumurl.bst')
+    files['natnumurl.bst'] = file_to_list(informeroot + 'natnumurl.bst')
     files['src/cfg/final.tex'] = copy.copy(mainf['src/cfg/final.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
     files['src/cfg/page.tex'] = copy.copy(mainf['src/cfg/page.tex'])
@@ -1104,25 +1219,25 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/environments.tex'] = copy.copy(mainf['src/env/environments.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_reporte.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_reporte.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_reporte.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_reporte.tex')
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_REPORTE)
     stat = release['STATS']
     configfile = 'src/config.tex'
     distfolder = release['DIST']
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -1130,7 +1245,7 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     # -------------------------------------------------------------------------
     # MODIFICA EL MAIN
     # -------------------------------------------------------------------------
-    main_reporte = file_to_list('main_reporte.tex')
+    main_reporte = file_to_list(informeroot + 'main_reporte.tex')
     files[mainfile] = find_delete_block(files[mainfile], '% INTEGRANTES, PROFESORES Y FECHAS', jadd=1)
     files[mainfile][1] = '% Documento:    Archivo principal\n'
     files[mainfile] = find_delete_block(files[mainfile], '% PORTADA', white_end_block=True)
@@ -1154,7 +1269,8 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     # MODIFICA CONFIGURACIONES
     # -------------------------------------------------------------------------
     fl = 'src/config.tex'
-    config_reporte = file_to_list('src/config_reporte.tex')
+    cfg = TexConfig(files[fl])
+    config_reporte = file_to_list(informeroot + 'src/config_reporte.tex')
 
     # Configuraciones que se borran
     cdel = ['firstpagemargintop', 'portraitstyle', 'predocpageromannumber', 'predocpageromanupper',
@@ -1162,45 +1278,25 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
             'indextitlecolor', 'addindextobookmarks', 'portraittitlecolor', 'margineqnindexbottom',
             'margineqnindextop', 'bibtexindexbibliography', 'linkcolorindex']
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
+        cfg.delete(cdel)
+    files[fl] = cfg.to_list()
     files[fl] = find_delete_block(files[fl], '% CONFIGURACIÓN DEL ÍNDICE', white_end_block=True)
-    for cdel in ['pagemargintop']:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('  %', '%')
-    ra, _ = find_block(files[fl], 'cfgshowbookmarkmenu', True)
-    files[fl] = add_block_from_list(files[fl], [files[fl][ra],
-                                                '\\def\\indexdepth {4}                % Profundidad de los marcadores\n'],
-                                    ra, addnewline=True)
-    ra, _ = find_block(files[fl], 'pagemarginbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '2.5')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemarginleft', True)
-    nconf = replace_argument(files[fl][ra], 1, '3.81')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemarginright', True)
-    nconf = replace_argument(files[fl][ra], 1, '3.81')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemargintop', True)
-    nconf = replace_argument(files[fl][ra], 1, '2.5')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'hfstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'style7')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\Large')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sssectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\normalsize').replace('    %', '%').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\ssectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\large')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'hfwidthwrap', True)
+    cfg = TexConfig(files[fl])
+    cfg.insert_after('cfgshowbookmarkmenu', ['\\def\\indexdepth {4}                % Profundidad de los marcadores\n'])
+    cfg.replace_value('pagemarginbottom', '2.5')
+    cfg.replace_value('pagemarginleft', '3.81')
+    cfg.replace_value('pagemarginright', '3.81')
+    cfg.replace_value('pagemargintop', '2.5')
+    cfg.replace_value('hfstyle', 'style7')
+    cfg.replace_value('sectionfontsize', '\\Large')
+    cfg.replace_value('sssectionfontsize', '\\normalsize')
+    cfg.replace_value('ssectionfontsize', '\\large')
+    files[fl] = cfg.to_list()
+    ra = TexConfig(files[fl]).find('hfwidthwrap')
     files[fl] = replace_block_from_list(files[fl], config_reporte, ra, ra)
-    ra, _ = find_block(files[fl], 'documentfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '11')
-    files[fl][ra] = nconf
+    cfg = TexConfig(files[fl])
+    cfg.replace_value('documentfontsize', '11')
+    files[fl] = cfg.to_list()
 
     ra, _ = find_block(files[fl], '% CONFIGURACIÓN DE LAS LEYENDAS - CAPTION', True)
     files[fl][ra] = '\n' + files[fl][ra]
@@ -1222,7 +1318,7 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     # CAMBIO INITCONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/init.tex'
-    init_auxiliar = file_to_list('src/cfg/init_reporte.tex')
+    init_auxiliar = file_to_list(informeroot + 'src/cfg/init_reporte.tex')
     nl = find_extract(init_auxiliar, 'Operaciones especiales Template-Reporte', True)
     nl.insert(0, '% -----------------------------------------------------------------------------\n')
     files[fl] = add_block_from_list(files[fl], nl, LIST_END_LINE)
@@ -1294,7 +1390,6 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -1303,28 +1398,26 @@ def export_reporte(version, versiondev, versionhash, printfun=print, dosave=True
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
-        export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder)
+        export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder, mainroot)
 
     # Limpia el diccionario
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-
-    # Retorna a root
-    os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
 
 
 # noinspection PyUnboundLocalVariable
 def export_articulo(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                     plotstats=True, addstat=True, doclean=True,
-                    savepdf=True, informeroot=None, mainroot=None, statsroot=None):
+                    savepdf=True, informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta los articulos.
 
     :param addstat: Agrega las estadísticas
+    :param ctx: Contexto de la exportación
     :param doclean: Borra los archivos generados en lista
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -1339,8 +1432,18 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_ARTICULO]
+    release = ctx.get_release(REL_ARTICULO)
 
     # Obtiene archivos
     t = time.time()
@@ -1349,23 +1452,22 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     # noinspection PyTypeChecker
     export_reporte(version, versiondev, versionhash, dosave=False, docompile=False,
                    plotstats=False, printfun=nonprint, addstat=False, doclean=False, savepdf=False,
-                   informeroot=informeroot, mainroot=mainroot)
+                   informeroot=informeroot, mainroot=mainroot, ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
 
-    os.chdir(informeroot)
-    mainf = RELEASES[REL_REPORTE]['FILES']
+    mainf = ctx.get_files(REL_REPORTE)
     files = release['FILES']
-    files['library.bib'] = file_to_list('library.bib')
-    files['main.tex'] = file_to_list('main_articulo.tex')
-    files['natnumurl.bst'] = file_to_list('natnumurl.bst')
+    files['library.bib'] = file_to_list(informeroot + 'library.bib')
+    files['main.tex'] = file_to_list(informeroot + 'main_articulo.tex')
+    files['natnumurl.bst'] = file_to_list(informeroot + 'natnumurl.bst')
     files['src/cfg/final.tex'] = copy.copy(mainf['src/cfg/final.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
     files['src/cfg/page.tex'] = copy.copy(mainf['src/cfg/page.tex'])
-    files['src/cmd/articulo.tex'] = file_to_list('src/cmd/articulo.tex')
+    files['src/cmd/articulo.tex'] = file_to_list(informeroot + 'src/cmd/articulo.tex')
     files['src/cmd/column.tex'] = copy.copy(mainf['src/cmd/column.tex'])
     files['src/cmd/core.tex'] = copy.copy(mainf['src/cmd/core.tex'])
     files['src/cmd/equation.tex'] = copy.copy(mainf['src/cmd/equation.tex'])
@@ -1377,24 +1479,24 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/environments.tex'] = copy.copy(mainf['src/env/environments.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_articulo.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_articulo.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_articulo.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_articulo.tex')
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_ARTICULO)
     stat = release['STATS']
     configfile = 'src/config.tex'
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -1403,6 +1505,7 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     # MODIFICA CONFIGURACIONES
     # -------------------------------------------------------------------------
     fl = 'src/config.tex'
+    cfg = TexConfig(files[fl])
 
     # Configuraciones que se borran
     cdel = ['hfpdashcharstyle', 'titlefontsize', 'titlefontstyle', 'titlelinemargin',
@@ -1411,104 +1514,46 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
             'marginequationbottom', 'marginequationtop', 'margingatherbottom',
             'margingathertop']
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
-    ra, _ = find_block(files[fl], 'pagemarginbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.91').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemarginleft', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.27')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemarginright', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.27')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemargintop', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.91').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '9.5').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'fontdocument', True)
-    nconf = replace_argument(files[fl][ra], 1, 'libertine').replace('  %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentinterline', True)
-    nconf = replace_argument(files[fl][ra], 1, '1').replace('%', '    %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'fontsizerefbibl', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\small').replace('%', '     %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'natbibrefsep', True)
-    nconf = replace_argument(files[fl][ra], 1, '2')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'apaciterefsep', True)
-    nconf = replace_argument(files[fl][ra], 1, '2')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'bibtexrefsep', True)
-    nconf = replace_argument(files[fl][ra], 1, '2')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captiontextbold', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionlrmarginmc', True)
-    nconf = replace_argument(files[fl][ra], 1, '0')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionlrmargin', True)
-    nconf = replace_argument(files[fl][ra], 1, '0')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginimagebottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '-0.2').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'margingathercapttop', True)
-    nconf = replace_argument(files[fl][ra], 1, '-0.7')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginlinenumbers', True)
-    nconf = replace_argument(files[fl][ra], 1, '6').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'tablenotesfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\footnotesize').replace('  %', '%').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sectionspacingtop', True)
-    nconf = replace_argument(files[fl][ra], 1, '15')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\ssectionspacingbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '8').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sssectionspacingbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '6')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\ssssectionspacingbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '4')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'charappendixsection', True)
-    nconf = replace_argument(files[fl][ra], 1, '').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'charaftersectionnum', True)
-    nconf = replace_argument(files[fl][ra], 1, '').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmargini {', True)
-    nconf = replace_argument(files[fl][ra], 1, '20')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '17')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginiii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', '   %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginiv {', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'footnoterulepage', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true').replace('%', ' %')
-    files[fl][ra] = nconf
-
-    ra, _ = find_block(files[fl], 'hfstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'style1').replace('16 estilos', '19 estilos')
-    files[fl][ra] = nconf + '\\def\\titleauthorspacing {0.35}     % Distancia entre autores [cm]\n' \
-                            '\\def\\titleauthormarginbottom {0.2} % Margen inferior autores [cm]\n' \
-                            '\\def\\titleauthormargintop {0.6}    % Margen superior autores [cm]\n' \
-                            '\\def\\titleauthormaxwidth {0.85}    % Tamaño máximo datos autores [linewidth]\n' \
-                            '\\def\\titlebold {true}              % Título en negrita\n' \
-                            '\\def\\titlestyle {style1}           % Estilo título (5 estilos)\n'
+        cfg.delete(cdel)
+    cfg.replace_value('pagemarginbottom', '1.91')
+    cfg.replace_value('pagemarginleft', '1.27')
+    cfg.replace_value('pagemarginright', '1.27')
+    cfg.replace_value('pagemargintop', '1.91')
+    cfg.replace_value('documentfontsize', '9.5')
+    cfg.replace_value('fontdocument', 'libertine')
+    cfg.replace_value('documentinterline', '1')
+    cfg.replace_value('fontsizerefbibl', '\\small')
+    cfg.replace_value('natbibrefsep', '2')
+    cfg.replace_value('apaciterefsep', '2')
+    cfg.replace_value('bibtexrefsep', '2')
+    cfg.replace_value('captiontextbold', 'true')
+    cfg.replace_value('captionlrmarginmc', '0')
+    cfg.replace_value('captionlrmargin', '0')
+    cfg.replace_value('marginimagebottom', '-0.2')
+    cfg.replace_value('margingathercapttop', '-0.7')
+    cfg.replace_value('marginlinenumbers', '6')
+    cfg.replace_value('tablenotesfontsize', '\\footnotesize')
+    cfg.replace_value('sectionspacingtop', '15')
+    cfg.replace_value('ssectionspacingbottom', '8')
+    cfg.replace_value('sssectionspacingbottom', '6')
+    cfg.replace_value('ssssectionspacingbottom', '4')
+    cfg.replace_value('charappendixsection', '')
+    cfg.replace_value('charaftersectionnum', '')
+    cfg.replace_value('sitemsmargini', '20')
+    cfg.replace_value('sitemsmarginii', '17')
+    cfg.replace_value('sitemsmarginiii', '0')
+    cfg.replace_value('sitemsmarginiv', '0')
+    cfg.replace_value('footnoterulepage', 'true')
+
+    cfg.replace_value('hfstyle', 'style1')
+    cfg['hfstyle'] = cfg['hfstyle'].replace('16 estilos', '19 estilos')
+    cfg.insert_after('hfstyle', ['\\def\\titleauthorspacing {0.35}     % Distancia entre autores [cm]\n',
+                                 '\\def\\titleauthormarginbottom {0.2} % Margen inferior autores [cm]\n',
+                                 '\\def\\titleauthormargintop {0.6}    % Margen superior autores [cm]\n',
+                                 '\\def\\titleauthormaxwidth {0.85}    % Tamaño máximo datos autores [linewidth]\n',
+                                 '\\def\\titlebold {true}              % Título en negrita\n',
+                                 '\\def\\titlestyle {style1}           % Estilo título (5 estilos)\n'])
+    files[fl] = cfg.to_list()
     ra, _ = find_block(files[fl], '% CONFIGURACIONES DE OBJETOS', True)
     files[fl][ra] += '\\def\\abstractmarginbottom {0.5}    % Margen inferior abstract [cm]\n' \
                      '\\def\\abstractmargintop {0}         % Margen superior abstract [cm]\n'
@@ -1583,7 +1628,7 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     # CAMBIO PAGECONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/page.tex'
-    page_articulo = file_to_list('src/cfg/page_articulo.tex')
+    page_articulo = file_to_list(informeroot + 'src/cfg/page_articulo.tex')
     nl = find_extract(page_articulo, '% Se crean los header-footer', white_end_block=True)
     files[fl] = find_replace_block(files[fl], '% Se crean los header-footer', nl, white_end_block=True,
                                    jadd=-1)
@@ -1610,7 +1655,6 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -1619,36 +1663,33 @@ def export_articulo(version, versiondev, versionhash, printfun=print, dosave=Tru
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(czip['FILE'])
-        with Cd(subrlfolder):
-            export_normal.set_ghostpath(czip['GHOST'])
-            export_normal.add_excepted_file(czip['EXCEPTED'])
-            export_normal.add_file(czip['ADD']['FILES'])
-            export_normal.add_folder(czip['ADD']['FOLDER'])
+        export_normal = Zip(mainroot + czip['FILE'], root=subrlfolder)
+        export_normal.set_ghostpath(czip['GHOST'])
+        export_normal.add_excepted_file(czip['EXCEPTED'])
+        export_normal.add_file(czip['ADD']['FILES'])
+        export_normal.add_folder(czip['ADD']['FOLDER'])
         export_normal.save()
 
     # Limpia el diccionario
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-        clear_dict(RELEASES[REL_REPORTE], 'FILES')
-
-    # Retorna a root
-    os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
+        ctx.clear(REL_REPORTE)
 
 
 # noinspection PyUnboundLocalVariable
 def export_poster(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                   plotstats=True, addstat=True, doclean=True,
-                  savepdf=True, informeroot=None, mainroot=None, statsroot=None):
+                  savepdf=True, informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta poster.
 
     :param addstat: Agrega las estadísticas
+    :param ctx: Contexto de la exportación
     :param doclean: Borra los archivos generados en lista
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -1663,8 +1704,18 @@ def export_poster(version, versiondev, versionhash, printfun=print, dosave=True,
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_POSTER]
+    release = ctx.get_release(REL_POSTER)
 
     # Obtiene archivos
     t = time.time()
@@ -1673,18 +1724,17 @@ def export_poster(version, versiondev, versionhash, printfun=print, dosave=True,
     # noinspection PyTypeChecker
     export_presentacion(version, versiondev, versionhash, dosave=False, docompile=False,
                         plotstats=False, printfun=nonprint, addstat=False, doclean=False, savepdf=False,
-                        informeroot=informeroot, mainroot=mainroot, cfgfile='src/config_poster.tex')
+                        informeroot=informeroot, mainroot=mainroot, cfgfile='src/config_poster.tex', ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
 
-    os.chdir(informeroot)
-    mainf = RELEASES[REL_PRESENTACION]['FILES']
+    mainf = ctx.get_files(REL_PRESENTACION)
     files = release['FILES']
-    files['library.bib'] = file_to_list('library.bib')
-    files['main.tex'] = file_to_list('main_poster.tex')
+    files['library.bib'] = file_to_list(informeroot + 'library.bib')
+    files['main.tex'] = file_to_list(informeroot + 'main_poster.tex')
     files['src/cfg/final.tex'] = copy.copy(mainf['src/cfg/final.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
     files['src/cfg/page.tex'] = copy.copy(mainf['src/cfg/page.tex'])
@@ -1695,30 +1745,30 @@ def export_poster(version, versiondev, versionhash, printfun=print, dosave=True,
     files['src/cmd/math.tex'] = copy.copy(mainf['src/cmd/math.tex'])
     files['src/cmd/other.tex'] = copy.copy(mainf['src/cmd/other.tex'])
     files['src/cmd/title.tex'] = copy.copy(mainf['src/cmd/title.tex'])
-    files['src/cmd/poster.tex'] = file_to_list('src/cmd/poster.tex')
+    files['src/cmd/poster.tex'] = file_to_list(informeroot + 'src/cmd/poster.tex')
     files['src/config.tex'] = copy.copy(mainf['src/config.tex'])
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/environments.tex'] = copy.copy(mainf['src/env/environments.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_poster.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_poster.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_poster.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_poster.tex')
 
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_POSTER)
     stat = release['STATS']
     configfile = 'src/config.tex'
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -1727,100 +1777,47 @@ def export_poster(version, versiondev, versionhash, printfun=print, dosave=True,
     # MODIFICA CONFIGURACIONES
     # -------------------------------------------------------------------------
     fl = 'src/config.tex'
+    cfg = TexConfig(files[fl])
 
     # Configuraciones que se borran
     cdel = []
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
-
-    ra, _ = find_block(files[fl], 'documentfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '23').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'fontdocument', True)
-    nconf = replace_argument(files[fl][ra], 1, 'ralewaylight').replace('      %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captioncolor', True)
-    nconf = replace_argument(files[fl][ra], 1, 'mitred').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captiontbmarginfigure', True)
-    nconf = replace_argument(files[fl][ra], 1, '20').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captiontextbold', True)
-    nconf = replace_argument(files[fl][ra], 1, 'false').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'bibtexstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'ieeetr').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'tablenotesfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\scriptsize').replace('  %', '%').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, 'small').replace('%', '       %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\captionmarginimagesmc', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', '    %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\captionmarginimages', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', '    %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'bibtexrefsep', True)
-    nconf = replace_argument(files[fl][ra], 1, '0')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodefonts', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\normalsize').replace('{', ' {').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodeilfonts', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\normalsize').replace(' {', '{').replace('    %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodenumbersep', True)
-    nconf = replace_argument(files[fl][ra], 1, '12').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodenumbersize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\scriptsize').replace(' %', '%').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodeskipbelow', True)
-    nconf = replace_argument(files[fl][ra], 1, '0.5').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captiontextsubnumbold', True)
-    nconf = replace_argument(files[fl][ra], 1, 'false').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmargini {', True)
-    nconf = replace_argument(files[fl][ra], 1, '85').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'itemizeitemcolor', True)
-    nconf = replace_argument(files[fl][ra], 1, 'mitred').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'enumerateitemcolor', True)
-    nconf = replace_argument(files[fl][ra], 1, 'mitred').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sitemizei {', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\iitembsquare').replace('  %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sitemizeii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\iitembcirc').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sitemizeiii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\iitemdash')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sitemizeiv {', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\iitemcirc').replace('%', '   %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '50.6')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginiii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '43').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginimagemultright', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.25')
-    files[fl][ra] = nconf
+        cfg.delete(cdel)
+
+    cfg.replace_value('documentfontsize', '23')
+    cfg.replace_value('fontdocument', 'ralewaylight')
+    cfg.replace_value('captioncolor', 'mitred')
+    cfg.replace_value('captiontbmarginfigure', '20')
+    cfg.replace_value('captiontextbold', 'false')
+    cfg.replace_value('bibtexstyle', 'ieeetr')
+    cfg.replace_value('tablenotesfontsize', '\\scriptsize')
+    cfg.replace_value('captionfontsize', 'small')
+    cfg.replace_value('captionmarginimagesmc', '0')
+    cfg.replace_value('captionmarginimages', '0')
+    cfg.replace_value('bibtexrefsep', '0')
+    cfg.replace_value('sourcecodefonts', '\\normalsize')
+    cfg.replace_value('sourcecodeilfonts', '\\normalsize')
+    cfg.replace_value('sourcecodenumbersep', '12')
+    cfg.replace_value('sourcecodenumbersize', '\\scriptsize')
+    cfg.replace_value('sourcecodeskipbelow', '0.5')
+    cfg.replace_value('captiontextsubnumbold', 'false')
+    cfg.replace_value('sitemsmargini', '85')
+    cfg.replace_value('itemizeitemcolor', 'mitred')
+    cfg.replace_value('enumerateitemcolor', 'mitred')
+    cfg.replace_value('sitemizei', '\\iitembsquare')
+    cfg.replace_value('sitemizeii', '\\iitembcirc')
+    cfg.replace_value('sitemizeiii', '\\iitemdash')
+    cfg.replace_value('sitemizeiv', '\\iitemcirc')
+    cfg.replace_value('sitemsmarginii', '50.6')
+    cfg.replace_value('sitemsmarginiii', '43')
+    cfg.replace_value('marginimagemultright', '1.25')
+    files[fl] = cfg.to_list()
 
     # -------------------------------------------------------------------------
     # CAMBIO INITCONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/init.tex'
-    init_poster = file_to_list('src/cfg/init_poster.tex')
+    init_poster = file_to_list(informeroot + 'src/cfg/init_poster.tex')
 
     # Elimina
     for i in ['\\def\\pdfmetainfosubject {\\documentsubject}', '\\def\\pdfmetainfosubject {}',
@@ -1904,7 +1901,6 @@ def export_poster(version, versiondev, versionhash, printfun=print, dosave=True,
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -1913,37 +1909,34 @@ def export_poster(version, versiondev, versionhash, printfun=print, dosave=True,
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(czip['FILE'])
-        with Cd(subrlfolder):
-            export_normal.set_ghostpath(czip['GHOST'])
-            export_normal.add_excepted_file(czip['EXCEPTED'])
-            export_normal.add_file(czip['ADD']['FILES'])
-            export_normal.add_folder(czip['ADD']['FOLDER'])
+        export_normal = Zip(mainroot + czip['FILE'], root=subrlfolder)
+        export_normal.set_ghostpath(czip['GHOST'])
+        export_normal.add_excepted_file(czip['EXCEPTED'])
+        export_normal.add_file(czip['ADD']['FILES'])
+        export_normal.add_folder(czip['ADD']['FOLDER'])
         export_normal.save()
 
     # Limpia el diccionario
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-        clear_dict(RELEASES[REL_PRESENTACION], 'FILES')
-
-    # Retorna a root
-    os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
+        ctx.clear(REL_PRESENTACION)
 
 
 # noinspection PyUnboundLocalVariable
 def export_presentacion(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                         plotstats=True, addstat=True, doclean=True, cfgfile='src/config_presentacion.tex',
-                        savepdf=True, informeroot=None, mainroot=None, statsroot=None):
+                        savepdf=True, informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta la presentacion.
 
     :param addstat: Agrega las estadísticas
     :param cfgfile: Archivo de configuraciones
+    :param ctx: Contexto de la exportación
     :param doclean: Borra los archivos generados en lista
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -1958,8 +1951,18 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_PRESENTACION]
+    release = ctx.get_release(REL_PRESENTACION)
 
     # Obtiene archivos
     t = time.time()
@@ -1967,16 +1970,17 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     # Genera informe
     # noinspection PyTypeChecker
     export_informe(version, versiondev, versionhash, dosave=False, docompile=False,
-                   plotstats=False, printfun=nonprint, addstat=False, savepdf=False, informeroot=informeroot)
+                   plotstats=False, printfun=nonprint, addstat=False, savepdf=False, informeroot=informeroot,
+                   ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
-    mainf = RELEASES[REL_INFORME]['FILES']
+    mainf = ctx.get_files(REL_INFORME)
     files = release['FILES']
-    files['library.bib'] = file_to_list('library.bib')
-    files['main.tex'] = file_to_list('main_presentacion.tex')
+    files['library.bib'] = file_to_list(informeroot + 'library.bib')
+    files['main.tex'] = file_to_list(informeroot + 'main_presentacion.tex')
     files['src/cfg/final.tex'] = copy.copy(mainf['src/cfg/final.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
     files['src/cfg/page.tex'] = copy.copy(mainf['src/cfg/page.tex'])
@@ -1986,31 +1990,31 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     files['src/cmd/image.tex'] = copy.copy(mainf['src/cmd/image.tex'])
     files['src/cmd/math.tex'] = copy.copy(mainf['src/cmd/math.tex'])
     files['src/cmd/other.tex'] = copy.copy(mainf['src/cmd/other.tex'])
-    files['src/cmd/presentacion.tex'] = file_to_list('src/cmd/presentacion.tex')
+    files['src/cmd/presentacion.tex'] = file_to_list(informeroot + 'src/cmd/presentacion.tex')
     files['src/cmd/title.tex'] = copy.copy(mainf['src/cmd/title.tex'])
     files['src/config.tex'] = copy.copy(mainf['src/config.tex'])
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/environments.tex'] = copy.copy(mainf['src/env/environments.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_presentacion.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_presentacion.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_presentacion.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_presentacion.tex')
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_PRESENTACION)
     stat = release['STATS']
     configfile = 'src/config.tex'
     distfolder = release['DIST']
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -2019,6 +2023,7 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     # MODIFICA CONFIGURACIONES
     # -------------------------------------------------------------------------
     fl = 'src/config.tex'
+    cfg = TexConfig(files[fl])
 
     # Configuraciones que se borran
     cdel = ['predocpageromannumber', 'predocpageromanupper', 'predocresetpagenumber',
@@ -2038,130 +2043,59 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
             'footnotetopmargin', 'linkcolorindex'
             ]
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
+        cfg.delete(cdel)
+    files[fl] = cfg.to_list()
     files[fl] = find_delete_block(files[fl], '% CONFIGURACIÓN DEL ÍNDICE', white_end_block=True)
     files[fl] = find_delete_block(files[fl], '% ESTILO PORTADA Y HEADER-FOOTER', white_end_block=True)
     files[fl] = find_delete_block(files[fl], '% MÁRGENES DE PÁGINA', white_end_block=True)
     files[fl] = find_delete_block(files[fl], '% CONFIGURACIÓN DE LOS TÍTULOS', white_end_block=True)
-    for cdel in ['captionmarginimagesmc', 'captionmarginimages']:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('    %', '%')
+    cfg = TexConfig(files[fl])
     for cdel in ['namemathcol', 'namemathdefn', 'namemathej',
                  'namemathlem', 'namemathobs', 'namemathprp', 'namemaththeorem',
                  'namereferences', 'nameltappendixsection', 'nameltwfigure',
                  'nameltwsrc', 'nameltwtable']:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('   %', '%')
-    for cdel in ['cfgpdfpageview', 'bibtexstyle', 'marginimagemultright']:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace(' %', '%')
-    for cdel in ['captiontextbold', 'captiontextsubnumbold', 'cfgpdffitwindow']:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('%', ' %')
-    for cdel in []:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('%', '  %')
-    for cdel in ['documentinterline']:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('%', '    %')
-    ra, _ = find_block(files[fl], 'cfgshowbookmarkmenu', True)
-    files[fl] = add_block_from_list(
-        files[fl], [files[fl][ra], '\\def\\indexdepth {4}                % Profundidad de los marcadores\n'],
-        ra, addnewline=True)
+        cfg.align_comment(cdel)
+    cfg.insert_after('cfgshowbookmarkmenu', ['\\def\\indexdepth {4}                % Profundidad de los marcadores\n'])
+    files[fl] = cfg.to_list()
 
     files[fl].pop()
-    for i in file_to_list(cfgfile):
+    for i in file_to_list(informeroot + cfgfile):
         files[fl].append(i)
 
-    ra, _ = find_block(files[fl], 'cfgpdfpageview', True)
-    nconf = replace_argument(files[fl][ra], 1, 'FitBV')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '9.5').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'bibtexstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'apalike')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodenumbersep', True)
-    nconf = replace_argument(files[fl][ra], 1, '4')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginimagemulttop', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', '   %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodeskipbelow', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.15')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodebgmarginleft', True)
-    nconf = replace_argument(files[fl][ra], 1, '-1').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentparindent', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionlrmarginmc', True)
-    nconf = replace_argument(files[fl][ra], 1, '0')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionlrmargin', True)
-    nconf = replace_argument(files[fl][ra], 1, '0')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentinterline', True)
-    nconf = replace_argument(files[fl][ra], 1, '1')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captiontextbold', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captiontextsubnumbold', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'cfgpdffitwindow', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginimagebottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '-0.50')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginimagemultright', True)
-    nconf = replace_argument(files[fl][ra], 1, '0.35')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'marginimagemultbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', '   %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionmarginimagesmc', True)
-    nconf = replace_argument(files[fl][ra], 1, '-0.04')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'captionmarginimages', True)
-    nconf = replace_argument(files[fl][ra], 1, '-0.04')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sourcecodefonts', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\footnotesize').replace(' {', '{').replace('      %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'stylecitereferences', True)
-    nconf = replace_argument(files[fl][ra], 1, 'bibtex')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmargini {', True)
-    nconf = replace_argument(files[fl][ra], 1, '21.9').replace('  %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '21.9').replace('  %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginiii {', True)
-    nconf = replace_argument(files[fl][ra], 1, '21.9')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'sitemsmarginiv {', True)
-    nconf = replace_argument(files[fl][ra], 1, '0').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'subcaptionfsize', True)
-    nconf = replace_argument(files[fl][ra], 1, 'scriptsize').replace('%', ' %').replace('{', ' {')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'fontdocument', True)
-    nconf = replace_argument(files[fl][ra], 1, 'roboto').replace('%', ' %')
-    files[fl][ra] = nconf
-
-    ra, _ = find_block(files[fl], 'stylecitereferences', True)
-    files[fl][ra] = '\\def\\stylecitereferences {bibtex}  % Estilo cita/ref {bibtex,custom}\n'
-    ra, _ = find_block(files[fl], 'captionfontsize', True)
-    files[fl][ra] = '\\def\\captionfontsize{footnotesize} % Tamaño de fuente de los caption\n'
-    ra, _ = find_block(files[fl], 'fonturl', True)
-    files[fl][ra] += '\\def\\frametextjustified {true}     % Justifica todos los párrafos de los frames\n'
+    cfg = TexConfig(files[fl])
+    cfg.replace_value('cfgpdfpageview', 'FitBV')
+    cfg.replace_value('documentfontsize', '9.5')
+    cfg.replace_value('bibtexstyle', 'apalike')
+    cfg.replace_value('sourcecodenumbersep', '4')
+    cfg.replace_value('marginimagemulttop', '0')
+    cfg.replace_value('sourcecodeskipbelow', '1.15')
+    cfg.replace_value('sourcecodebgmarginleft', '-1')
+    cfg.replace_value('documentparindent', '0')
+    cfg.replace_value('captionlrmarginmc', '0')
+    cfg.replace_value('captionlrmargin', '0')
+    cfg.replace_value('documentinterline', '1')
+    cfg.replace_value('captiontextbold', 'true')
+    cfg.replace_value('captiontextsubnumbold', 'true')
+    cfg.replace_value('cfgpdffitwindow', 'true')
+    cfg.replace_value('marginimagebottom', '-0.50')
+    cfg.replace_value('marginimagemultright', '0.35')
+    cfg.replace_value('marginimagemultbottom', '0')
+    cfg.replace_value('captionmarginimagesmc', '-0.04')
+    cfg.replace_value('captionmarginimages', '-0.04')
+    cfg.replace_value('sourcecodefonts', '\\footnotesize')
+    cfg.replace_value('stylecitereferences', 'bibtex')
+    cfg.replace_value('sitemsmargini', '21.9')
+    cfg.replace_value('sitemsmarginii', '21.9')
+    cfg.replace_value('sitemsmarginiii', '21.9')
+    cfg.replace_value('sitemsmarginiv', '0')
+    cfg.replace_value('subcaptionfsize', 'scriptsize')
+    cfg.replace_value('fontdocument', 'roboto')
+
+    cfg['stylecitereferences'] = '\\def\\stylecitereferences {bibtex}  % Estilo cita/ref {bibtex,custom}\n'
+    cfg['captionfontsize'] = '\\def\\captionfontsize{footnotesize} % Tamaño de fuente de los caption\n'
+    cfg.insert_after('fonturl',
+                     ['\\def\\frametextjustified {true}     % Justifica todos los párrafos de los frames\n'])
+    files[fl] = cfg.to_list()
 
     # -------------------------------------------------------------------------
     # CAMBIA LAS ECUACIONES
@@ -2235,7 +2169,7 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     # CAMBIO INITCONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/init.tex'
-    init_presentacion = file_to_list('src/cfg/init_presentacion.tex')
+    init_presentacion = file_to_list(informeroot + 'src/cfg/init_presentacion.tex')
 
     files[fl] = find_delete_block(files[fl], 'Se revisa si se importa tikz', True, iadd=-1)
     files[fl] = find_delete_block(files[fl], 'Agrega compatibilidad de sub-sub-sub-secciones al TOC', True, iadd=-1)
@@ -2316,7 +2250,7 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     # PAGECONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/page.tex'
-    aux_pageconf = file_to_list('src/cfg/page_presentacion.tex')
+    aux_pageconf = file_to_list(informeroot + 'src/cfg/page_presentacion.tex')
     nl = find_extract(aux_pageconf, '% Numeración de páginas', True)
     files[fl] = find_replace_block(files[fl], '% Numeración de páginas', nl, white_end_block=True, jadd=-1)
     nl = find_extract(aux_pageconf, '% Estilo de títulos', True)
@@ -2462,7 +2396,6 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -2471,28 +2404,26 @@ def export_presentacion(version, versiondev, versionhash, printfun=print, dosave
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
-        export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder)
+        export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder, mainroot)
 
     # Limpia el diccionario
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-
-    # Retorna a root
-    os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
 
 
 # noinspection PyUnboundLocalVariable
 def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
                  plotstats=True, addstat=True, doclean=True,
-                 savepdf=True, informeroot=None, mainroot=None, statsroot=None):
+                 savepdf=True, informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta las tesis.
 
     :param addstat: Agrega las estadísticas
+    :param ctx: Contexto de la exportación
     :param doclean: Borra los archivos generados en lista
     :param docompile: Compila automáticamente
     :param dosave: Guarda o no los archivos
@@ -2507,8 +2438,18 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot,
+                            informeroot=informeroot, statsroot=statsroot)
+
+    # Rutas de la exportación
+    informeroot = ctx.informeroot
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+
     # Tipo release
-    release = RELEASES[REL_TESIS]
+    release = ctx.get_release(REL_TESIS)
 
     # Obtiene archivos
     t = time.time()
@@ -2516,17 +2457,18 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # Genera informe
     # noinspection PyTypeChecker
     export_informe(version, versiondev, versionhash, dosave=False, docompile=False,
-                   plotstats=False, printfun=nonprint, addstat=False, savepdf=False, informeroot=informeroot)
+                   plotstats=False, printfun=nonprint, addstat=False, savepdf=False, informeroot=informeroot,
+                   ctx=ctx)
 
     if dosave:
         printfun(MSG_GEN_FILE, end='')
     else:
         printfun(MSG_UPV_FILE, end='')
-    mainf = RELEASES[REL_INFORME]['FILES']
+    mainf = ctx.get_files(REL_INFORME)
     files = release['FILES']
-    files['library.bib'] = file_to_list('library.bib')
-    files['main.tex'] = file_to_list('main_tesis.tex')
-    files['natnumurl.bst'] = file_to_list('natnumurl.bst')
+    files['library.bib'] = file_to_list(informeroot + 'library.bib')
+    files['main.tex'] = file_to_list(informeroot + 'main_tesis.tex')
+    files['natnumurl.bst'] = file_to_list(informeroot + 'natnumurl.bst')
     files['src/cfg/final.tex'] = copy.copy(mainf['src/cfg/final.tex'])
     files['src/cfg/init.tex'] = copy.copy(mainf['src/cfg/init.tex'])
     files['src/cfg/page.tex'] = copy.copy(mainf['src/cfg/page.tex'])
@@ -2541,27 +2483,27 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     files['src/defs.tex'] = copy.copy(mainf['src/defs.tex'])
     files['src/env/environments.tex'] = copy.copy(mainf['src/env/environments.tex'])
     files['src/env/imports.tex'] = copy.copy(mainf['src/env/imports.tex'])
-    files['src/etc/example.tex'] = file_to_list('src/etc/example_tesis.tex')
+    files['src/etc/example.tex'] = file_to_list(informeroot + 'src/etc/example_tesis.tex')
     files['src/page/index.tex'] = copy.copy(mainf['src/page/index.tex'])
-    files['src/page/portrait.tex'] = file_to_list('src/page/portrait_tesis.tex')
+    files['src/page/portrait.tex'] = file_to_list(informeroot + 'src/page/portrait_tesis.tex')
     files['src/style/code.tex'] = copy.copy(mainf['src/style/code.tex'])
     files['src/style/other.tex'] = copy.copy(mainf['src/style/other.tex'])
-    files['template.tex'] = file_to_list('template_tesis.tex')
+    files['template.tex'] = file_to_list(informeroot + 'template_tesis.tex')
     mainfile = release['MAINFILE']
     examplefile = 'src/etc/example.tex'
-    subrlfolder = release['ROOT']
+    subrlfolder = ctx.get_root(REL_TESIS)
     stat = release['STATS']
     configfile = 'src/config.tex'
     distfolder = release['DIST']
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(informeroot + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionhead = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header
     versionhead = versionhead.format(version, dia)
@@ -2570,105 +2512,46 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # MODIFICA CONFIGURACIONES
     # -------------------------------------------------------------------------
     fl = 'src/config.tex'
+    cfg = TexConfig(files[fl])
 
     # Añade configuraciones
-    cfg = '\\def\\objectchaptermargin {false}   % Activa margen de objetos entre capítulos\n'
-    ra, _ = find_block(files[fl], 'objectindexindent', True)
-    nl = [cfg, files[fl][ra]]
-    files[fl] = add_block_from_list(files[fl], nl, ra)
+    cfg.insert_before('objectindexindent',
+                      ['\\def\\objectchaptermargin {false}   % Activa margen de objetos entre capítulos\n'])
 
     # Modifica configuraciones
-    ra, _ = find_block(files[fl], 'showsectioncaptioncode', True)
-    nconf = replace_argument(files[fl][ra], 1, 'chap')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'showsectioncaptioneqn', True)
-    nconf = replace_argument(files[fl][ra], 1, 'chap')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'showsectioncaptionfig', True)
-    nconf = replace_argument(files[fl][ra], 1, 'chap')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'showsectioncaptionmat', True)
-    nconf = replace_argument(files[fl][ra], 1, 'chap')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'showsectioncaptiontab', True)
-    nconf = replace_argument(files[fl][ra], 1, 'chap')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentinterline', True)
-    nconf = replace_argument(files[fl][ra], 1, '1.0').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemarginbottom', True)
-    nconf = replace_argument(files[fl][ra], 1, '2').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sssectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\normalsize').replace('    %', '%').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\ssectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\large')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\sectionfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\Large')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'indexstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'tf').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'documentfontsize', True)
-    nconf = replace_argument(files[fl][ra], 1, '12')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'pagemarginleft', True)
-    nconf = replace_argument(files[fl][ra], 1, '3').replace('%', '   %')
-    nl = [nconf,
-          '\\def\\pagemarginleftportrait {2.5}  % Margen izquierdo página portada [cm]\n']
-    files[fl] = add_block_from_list(files[fl], nl, ra)
-    ra, _ = find_block(files[fl], 'pagemarginright', True)
-    nconf = replace_argument(files[fl][ra], 1, '2').replace('%', '   %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], '\\pagemargintop', True)
-    nconf = replace_argument(files[fl][ra], 1, '2')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'hfstyle', True)
-    nconf = replace_argument(files[fl][ra], 1, 'style7')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'cfgbookmarksopenlevel', True)
-    nconf = replace_argument(files[fl][ra], 1, '0')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'addindexsubtobookmarks', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true').replace('{', ' {')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'showappendixsecindex', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'formatnumapchapter', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\Alph').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'formatnumapsection', True)
-    nconf = replace_argument(files[fl][ra], 1, '\\arabic').replace('  %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'cfgshowbookmarkmenu', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'addindexsubtobookmarks', True)
-    nl = ['\\def\\addabstracttobookmarks {true} % Añade el resumen a los marcadores del pdf\n',
-          '\\def\\addagradectobookmarks {true}  % Añade el agradecimiento a los marcadores\n',
-          files[fl][ra]
-          ]
-    files[fl] = replace_block_from_list(files[fl], nl, ra, ra - 1)
-    ra, _ = find_block(files[fl], 'namereferences', True)
-    nconf = replace_argument(files[fl][ra], 1, 'Bibliografía').replace(' %', '%')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'nameltcont', True)
-    nconf = replace_argument(files[fl][ra], 1, 'Tabla de Contenido').replace('%', '  %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'footnoterulepage', True)
-    nconf = replace_argument(files[fl][ra], 1, 'true').replace('%', ' %')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'nameltfigure', True)
-    nconf = replace_argument(files[fl][ra], 1, 'Índice de Ilustraciones').replace(' {', '{')
-    files[fl][ra] = nconf
-    ra, _ = find_block(files[fl], 'nameabstract', True)
-    nl = [files[fl][ra],
-          '\\def\\nameagradec {Agradecimientos}    % Nombre del cap. de agradecimientos\n',
-          ]
-    files[fl] = add_block_from_list(files[fl], nl, ra, True)
+    cfg.replace_value('showsectioncaptioncode', 'chap')
+    cfg.replace_value('showsectioncaptioneqn', 'chap')
+    cfg.replace_value('showsectioncaptionfig', 'chap')
+    cfg.replace_value('showsectioncaptionmat', 'chap')
+    cfg.replace_value('showsectioncaptiontab', 'chap')
+    cfg.replace_value('documentinterline', '1.0')
+    cfg.replace_value('pagemarginbottom', '2')
+    cfg.replace_value('sssectionfontsize', '\\normalsize')
+    cfg.replace_value('ssectionfontsize', '\\large')
+    cfg.replace_value('sectionfontsize', '\\Large')
+    cfg.replace_value('indexstyle', 'tf')
+    cfg.replace_value('documentfontsize', '12')
+    cfg.replace_value('pagemarginleft', '3')
+    cfg.insert_after('pagemarginleft',
+                     ['\\def\\pagemarginleftportrait {2.5}  % Margen izquierdo página portada [cm]\n'])
+    cfg.replace_value('pagemarginright', '2')
+    cfg.replace_value('pagemargintop', '2')
+    cfg.replace_value('hfstyle', 'style7')
+    cfg.replace_value('cfgbookmarksopenlevel', '0')
+    cfg.replace_value('addindexsubtobookmarks', 'true')
+    cfg.replace_value('showappendixsecindex', 'true')
+    cfg.replace_value('formatnumapchapter', '\\Alph')
+    cfg.replace_value('formatnumapsection', '\\arabic')
+    cfg.replace_value('cfgshowbookmarkmenu', 'true')
+    cfg.insert_before('addindexsubtobookmarks',
+                      ['\\def\\addabstracttobookmarks {true} % Añade el resumen a los marcadores del pdf\n',
+                       '\\def\\addagradectobookmarks {true}  % Añade el agradecimiento a los marcadores\n'])
+    cfg.replace_value('namereferences', 'Bibliografía')
+    cfg.replace_value('nameltcont', 'Tabla de Contenido')
+    cfg.replace_value('footnoterulepage', 'true')
+    cfg.replace_value('nameltfigure', 'Índice de Ilustraciones')
+    cfg.insert_after('nameabstract',
+                     ['\\def\\nameagradec {Agradecimientos}    % Nombre del cap. de agradecimientos\n'])
 
     # Configuraciones que se borran
     cdel = ['portraitstyle', 'firstpagemargintop', 'bibtexenvrefsecnum',
@@ -2676,21 +2559,17 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
             'indexnewpaget', 'showindexofcontents', 'indexsectionfontsize', 'indexsectionstyle', 'indexnewpagee',
             'hfpdashcharstyle', 'portraittitlecolor']
     for cdel in cdel:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl].pop(ra)
-    for cdel in []:
-        ra, _ = find_block(files[fl], cdel, True)
-        files[fl][ra] = files[fl][ra].replace('   %', '%')  # Reemplaza espacio en comentarios de la lista
-    ra, _ = find_block(files[fl], '% ESTILO PORTADA Y HEADER-FOOTER', True)
-    files[fl][ra] = '% ESTILO HEADER-FOOTER\n'
+        cfg.delete(cdel)
 
     # Añade nuevas entradas
+    cfg.insert_after('anumsecaddtocounter',
+                     ['\\def\\chapterfontsize {\\huge}       % Tamaño fuente de los capítulos\n',
+                      '\\def\\chapterfontstyle {\\bfseries}  % Estilo fuente de los capítulos\n'])
+    files[fl] = cfg.to_list()
+    ra, _ = find_block(files[fl], '% ESTILO PORTADA Y HEADER-FOOTER', True)
+    files[fl][ra] = '% ESTILO HEADER-FOOTER\n'
     files[fl] = search_append_line(files[fl], '% CONFIGURACIÓN DE LOS COLORES DEL DOCUMENTO',
                                    '\\def\\chaptercolor {black}          % Color de los capítulos\n')
-    files[fl] = search_append_line(files[fl], 'anumsecaddtocounter',
-                                   '\\def\\chapterfontsize {\\huge}       % Tamaño fuente de los capítulos\n')
-    files[fl] = search_append_line(files[fl], 'chapterfontsize',
-                                   '\\def\\chapterfontstyle {\\bfseries}  % Estilo fuente de los capítulos\n')
     files[fl] = search_append_line(files[fl], '% ESTILO HEADER-FOOTER',
                                    '\\def\\chapterstyle {style1}         % Estilo de los capítulos (12 estilos)\n')
 
@@ -2710,7 +2589,7 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # CAMBIO INITCONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/init.tex'
-    init_tesis = file_to_list('src/cfg/init_tesis.tex')
+    init_tesis = file_to_list(informeroot + 'src/cfg/init_tesis.tex')
 
     files[fl] = find_delete_block(files[fl], 'Se revisa si se importa tikz', True, iadd=-1)
     files[fl] = find_delete_block(files[fl], '\\ifthenelse{\\isundefined{\\authortable}}{', True)
@@ -2768,7 +2647,7 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # ÍNDICE
     # -------------------------------------------------------------------------
     fl = 'src/page/index.tex'
-    index_tesis = file_to_list('src/page/index_tesis.tex')
+    index_tesis = file_to_list(informeroot + 'src/page/index_tesis.tex')
 
     # Agrega inicial
     ra, _ = find_block(files[fl], 'Crea nueva página y establece estilo de títulos', True)
@@ -2802,7 +2681,7 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # PAGECONF
     # -------------------------------------------------------------------------
     fl = 'src/cfg/page.tex'
-    page_tesis = file_to_list('src/cfg/page_tesis.tex')
+    page_tesis = file_to_list(informeroot + 'src/cfg/page_tesis.tex')
     ra, _ = find_block(files[fl], '\\renewcommand{\\appendixtocname}{\\nameappendixsection}')
     files[fl] = add_block_from_list(files[fl], [files[fl][ra],
                                                 '\t\\renewcommand{\\chaptername}{\\namechapter}  % Nombre de los capítulos\n'],
@@ -2815,7 +2694,7 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # ENVIRONMENTS
     # -------------------------------------------------------------------------
     fl = 'src/env/environments.tex'
-    env_tesis = file_to_list('src/env/environments_tesis.tex')
+    env_tesis = file_to_list(informeroot + 'src/env/environments_tesis.tex')
 
     # Reemplaza bloques
     w = '% Crea una sección de referencias solo para bibtex'
@@ -2884,7 +2763,6 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     change_header_tex_files(files, release, headersize, headerversionpos, versionhead)
 
     # Guarda los archivos
-    os.chdir(mainroot)
     if dosave:
         copy_assemble_template(files, subrlfolder, headersize, configfile, mainfile, examplefile)
 
@@ -2893,33 +2771,31 @@ def export_tesis(version, versiondev, versionhash, printfun=print, dosave=True,
     # Compila el archivo
     if docompile and dosave:
         compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
-        export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder,
+        export_subdeptos_subtemplate(release, subrlfolder, mainfile, distfolder, mainroot,
                                      deptimg='uchile2', finalimg='uchile2')
 
     # Limpia el diccionario
     if doclean:
-        clear_dict(RELEASES[REL_INFORME], 'FILES')
-
-    # Retorna a root
-    os.chdir(mainroot)
+        ctx.clear(REL_INFORME)
 
 
 # noinspection PyBroadException
 def export_cv(version, versiondev, versionhash, printfun=print, dosave=True, docompile=True,
               plotstats=False, doclean=True, addstat=True, savepdf=True,
-              mainroot=None, backtoroot=False, statsroot=None):
+              informeroot=None, mainroot=None, statsroot=None, ctx=None):
     """
     Exporta Professional-CV.
 
     :param addstat: Añade estadísticas
-    :param backtoroot: Devuelve al root
+    :param ctx: Contexto de la exportación
     :param doclean: Limpia las variables al terminar
     :param docompile: Indica si compila
     :param dosave: Indica si guarda
+    :param informeroot: No se usa, mantiene la firma común de los exportadores
     :param mainroot: Carpeta principal de Export-Subtemplate
     :param plotstats: Plotea estadísticas
     :param printfun: Función para imprimir
@@ -2930,12 +2806,18 @@ def export_cv(version, versiondev, versionhash, printfun=print, dosave=True, doc
     :param versionhash: Hash de la versión
     :return: None
     """
+    # Contexto de la exportación
+    if ctx is None:
+        ctx = ExportContext(version, versiondev, versionhash, mainroot=mainroot, statsroot=statsroot)
+
     # Tipo release
     reltag = REL_PROFESSIONALCV
-    release = RELEASES[reltag]
+    release = ctx.get_release(reltag)
 
-    # Se cambia de carpeta
-    os.chdir(release['ROOT'])
+    # Rutas de la exportación
+    mainroot = ctx.mainroot
+    statsroot = ctx.statsroot
+    subrlfolder = ctx.get_root(reltag)
 
     # Obtiene archivos
     configfile = 'src/config.tex'
@@ -2945,19 +2827,19 @@ def export_cv(version, versiondev, versionhash, printfun=print, dosave=True, doc
     stat = release['STATS']
 
     # Constantes
-    main_data = file_to_list(mainfile)
+    main_data = file_to_list(subrlfolder + mainfile)
     headersize = find_line(main_data, '% Licencia MIT:') + 2
     headerversionpos = find_line(main_data, '% Versión:      ')
     versionheader = '% Versión:      {0} ({1})\n'
 
     # Se obtiene el día
-    dia = time.strftime('%d/%m/%Y')
+    dia = ctx.dia
 
     # Se crea el header de la versión
     versionhead = versionheader.format(version, dia)
 
     # Se buscan números de lineas de hyperref
-    initconf_data = file_to_list(initconffile)
+    initconf_data = file_to_list(subrlfolder + initconffile)
     l_tdate, d_tdate = find_line_str(initconf_data, 'Template.Date', True)
     l_thash, d_thash = find_line_str(initconf_data, 'Template.Version.Hash', True)
     l_ttype, d_ttype = find_line_str(initconf_data, 'Template.Type', True)
@@ -2983,7 +2865,7 @@ def export_cv(version, versiondev, versionhash, printfun=print, dosave=True, doc
         data = files[f]
         # noinspection PyBroadException
         try:
-            fl = open(f, encoding='utf8')
+            fl = open(subrlfolder + f, encoding='utf8')
             for line in fl:
                 data.append(line)
             fl.close()
@@ -3004,29 +2886,29 @@ def export_cv(version, versiondev, versionhash, printfun=print, dosave=True, doc
 
         # Se reescribe el archivo
         if dosave:
-            newfl = open(f, 'w', encoding='utf8')
+            newfl = open(subrlfolder + f, 'w', encoding='utf8')
             for j in data:
                 newfl.write(j)
             newfl.close()
 
     if dosave:
         # Mueve el archivo de configuraciones
-        copyfile(configfile, 'template_config.tex')
+        copyfile(subrlfolder + configfile, subrlfolder + 'template_config.tex')
 
         # Ensambla el archivo del template
-        assemble_template_file(files['source_template.tex'], configfile, '', headersize, files)
+        assemble_template_file(files['source_template.tex'], configfile, subrlfolder, headersize, files)
 
     printfun(MSG_FOKTIMER.format(time.time() - t))
 
     # Compila el archivo
     if docompile and dosave:
-        compile_template(None, printfun, mainfile, savepdf, addstat, statsroot,
-                         release, version, stat, versiondev, dia, versionhash, plotstats)
+        compile_template(subrlfolder, printfun, mainfile, savepdf, addstat, statsroot,
+                         release, version, stat, versiondev, dia, versionhash, plotstats, ctx=ctx)
 
     # Se exporta el proyecto normal
     if dosave:
         czip = release['ZIP']['NORMAL']
-        export_normal = Zip(mainroot + czip['FILE'])
+        export_normal = Zip(mainroot + czip['FILE'], root=subrlfolder)
         export_normal.add_excepted_file(czip['EXCEPTED'])
         export_normal.add_file(czip['ADD']['FILES'])
         export_normal.add_folder(czip['ADD']['FOLDER'])
@@ -3034,8 +2916,33 @@ def export_cv(version, versiondev, versionhash, printfun=print, dosave=True, doc
 
     # Se borra la información generada en las listas
     if doclean:
-        clear_dict(RELEASES[reltag], 'FILES')
+        ctx.clear(reltag)
+
+
+# Función de exportación de cada release, todas aceptan los mismos argumentos
+_EXPORTERS = {
+    REL_ARTICULO: export_articulo,
+    REL_AUXILIAR: export_auxiliares,
+    REL_CONTROLES: export_controles,
+    REL_INFORME: export_informe,
+    REL_POSTER: export_poster,
+    REL_PRESENTACION: export_presentacion,
+    REL_PROFESSIONALCV: export_cv,
+    REL_REPORTE: export_reporte,
+    REL_TESIS: export_tesis
+}
 
-    # Se cambia a carpeta root
-    if backtoroot:
-        os.chdir(mainroot)
+
+def get_exporter(releaseid):
+    """
+    Retorna la función que exporta un release.
+
+    :param releaseid: ID del release
+    :type releaseid: int
+    :return: Función de exportación
+    :rtype: callable
+    """
+    release = REGISTRY.by_id(releaseid)
+    if release is None or release.tag not in _EXPORTERS:
+        raise ValueError('ERROR: ID INCORRECTO')
+    return _EXPORTERS[release.tag]
@@ -27,18 +27,157 @@ Licencia:
 """
 
 __all__ = [
+    'clear_token_cache',
+    'find_arguments',
     'find_block',
     'find_command',
     'find_line',
+    'LATEX_DIRECTIVES',
+    'LineToken',
     'paste_external_tex_into_file',
-    'replace_argument'
+    'replace_argument',
+    'replace_arguments',
+    'TOKEN_BLANK',
+    'TOKEN_COMMAND',
+    'TOKEN_COMMENT',
+    'TOKEN_DEF',
+    'TOKEN_INPUT',
+    'TOKEN_TEXT',
+    'tokenize',
+    'tokenize_line'
 ]
 
 # Importación de librerías
+import re
 import types
 import sys
 
-from extlbx.utils import del_block_from_list, extract_block_from_list, replace_block_from_list
+from extlbx.utils import del_block_from_list, extract_block_from_list, get_file_from_input, \
+    replace_block_from_list
+
+# Constantes
+LATEX_DIRECTIVES = (' !DELCOM', ' !DISTNL', ' !NL', ' !PREVDISTNL', ' !PREVNL', ' !STRIP', '% !FILE')
+TOKEN_BLANK = 'blank'
+TOKEN_CACHE_SIZE = 1 << 16  # Líneas guardadas antes de vaciar la caché
+TOKEN_COMMAND = 'command'
+TOKEN_COMMENT = 'comment'
+TOKEN_DEF = 'def'
+TOKEN_INPUT = 'input'
+TOKEN_TEXT = 'text'
+_DEF_KEY = re.compile(r'\\def\\([A-Za-z@]+)')
+_NEWCOMMAND_KEY = re.compile(r'\\(?:re)?newcommand\{?\\([A-Za-z@]+)')
+
+# Expresiones de los separadores de argumentos, (inicio, fin) -> patrón
+_ARG_PATTERNS = {}
+
+# Caché de líneas clasificadas, línea -> LineToken
+_TOKEN_CACHE = {}
+
+
+class LineToken(object):
+    """
+    Clasificación de una línea de código LaTeX. Es inmutable y se comparte
+    entre todas las líneas con el mismo texto.
+
+    kind es TOKEN_BLANK, TOKEN_COMMENT, TOKEN_DEF, TOKEN_INPUT, TOKEN_COMMAND o
+    TOKEN_TEXT. key es el nombre de la variable en \\def, el archivo importado
+    en \\input o el nombre del comando en \\newcommand. directives contiene las
+    directivas de LATEX_DIRECTIVES presentes en la línea y comment la columna
+    del primer % no escapado, -1 si no hay comentario.
+    """
+
+    __slots__ = ('comment', 'directives', 'hascomment', 'key', 'kind', 'lower', 'strip')
+
+    def __init__(self, line):
+        """
+        Constructor.
+
+        :param line: Línea
+        :type line: str
+        """
+        strip = line.strip()
+        self.strip = strip
+        self.lower = strip.lower()
+        self.key = None
+        self.hascomment = '%' in line and '\\%' not in line and '}%' not in line and '{%' not in line
+        c = line.find('%')
+        while c > 0 and line[c - 1] == '\\':
+            c = line.find('%', c + 1)
+        self.comment = c
+        self.directives = ()
+        if ' !' in line:
+            self.directives = tuple(d for d in LATEX_DIRECTIVES if d in line)
+
+        if strip == '':
+            self.kind = TOKEN_BLANK
+        elif strip[0] == '%':
+            self.kind = TOKEN_COMMENT
+        elif strip[0:7] == '\\input{':
+            self.kind = TOKEN_INPUT
+            self.key = get_file_from_input(line)
+        elif strip[0] == '\\':
+            m = _DEF_KEY.match(strip)
+            if m is not None:
+                self.kind = TOKEN_DEF
+                self.key = m.group(1)
+            else:
+                self.kind = TOKEN_COMMAND
+                m = _NEWCOMMAND_KEY.match(strip)
+                if m is not None:
+                    self.key = m.group(1)
+        else:
+            self.kind = TOKEN_TEXT
+
+    def __repr__(self):
+        """
+        Retorna la representación de la línea.
+
+        :return: String
+        :rtype: str
+        """
+        return f'LineToken({self.kind}, {self.key!r}, {self.strip!r})'
+
+
+def tokenize_line(line):
+    """
+    Clasifica una línea. El resultado se guarda en una caché indexada por el
+    texto de la línea, así las funciones que recorren los mismos archivos no
+    vuelven a analizarla aunque la lista se modifique.
+
+    :param line: Línea
+    :return: Línea clasificada
+    :rtype: LineToken
+    """
+    try:
+        return _TOKEN_CACHE[line]
+    except KeyError:
+        pass
+    line = decodeline(line)
+    if len(_TOKEN_CACHE) >= TOKEN_CACHE_SIZE:
+        _TOKEN_CACHE.clear()
+    tok = LineToken(line)
+    _TOKEN_CACHE[line] = tok
+    return tok
+
+
+def tokenize(data):
+    """
+    Clasifica las líneas de un archivo.
+
+    :param data: Lista de un archivo
+    :return: Lista de líneas clasificadas
+    :rtype: list
+    """
+    return [tokenize_line(k) for k in data]
+
+
+def clear_token_cache():
+    """
+    Vacía la caché de líneas clasificadas.
+
+    :return: None
+    """
+    _TOKEN_CACHE.clear()
 
 
 def find_block(data, initstr, blankend=False, altend=None):
@@ -51,27 +190,28 @@ def find_block(data, initstr, blankend=False, altend=None):
     :param altend: Final alternativo bloque
     :return:
     """
-    j = 0
+    initlower = initstr.lower()
     i = -1
     f = -1
-    for k in data:
-        k = decodeline(k)
-        if initstr.lower() in k.strip().lower() and i < 0:
+    for j in range(len(data)):
+        k = tokenize_line(data[j])
+        if i < 0:
+            if initlower not in k.lower:
+                continue
             i = j
         if not blankend:
             if altend is None:
-                if i >= 0 and ((k.strip() == '}' and len(k.strip()) == 1) or k.strip() == '%ENDBLOCK'):
+                if k.strip == '}' or k.strip == '%ENDBLOCK':
                     f = j
                     break
             else:
-                if i >= 0 and k.strip() == altend:
+                if k.strip == altend:
                     f = j
                     break
         else:
-            if i >= 0 and k.strip() == '':
+            if k.kind == TOKEN_BLANK:
                 f = j
                 break
-        j += 1
     if i == -1:
         raise ValueError(f'No se encontró la cadena {initstr}')
     return i, f
@@ -128,9 +268,93 @@ def decodeline(line):
         return str(line)
 
 
+def _argument_pattern(arginitsep, argendsep):
+    """
+    Retorna la expresión que encuentra los separadores de argumentos. Los
+    separadores escapados con \\ no abren ni cierran argumentos.
+
+    :param argendsep: Keyword al finalizar argumento
+    :param arginitsep: Keyword al iniciar argumento
+    :return: Expresión regular compilada
+    """
+    key = (arginitsep, argendsep)
+    if key not in _ARG_PATTERNS:
+        seps = re.escape(arginitsep) + '|' + re.escape(argendsep)
+        _ARG_PATTERNS[key] = re.compile('\\\\(?:\\\\|' + seps + ')|' + seps)
+    return _ARG_PATTERNS[key]
+
+
+def find_arguments(line, argnum=0, arginitsep='{', argendsep='}'):
+    """
+    Busca los argumentos entre llaves de una línea en una sola pasada. Las
+    llaves anidadas quedan dentro del argumento que las contiene y las llaves
+    escapadas (\\{, \\}) se ignoran.
+
+    :param argendsep: Keyword al finalizar argumento
+    :param arginitsep: Keyword al iniciar argumento
+    :param argnum: Deja de buscar al encontrar este número de argumentos, 0 busca todos
+    :param line: Línea
+    :return: Lista de posiciones (inicio, fin) del contenido de cada argumento
+    :rtype: list
+    """
+    spans = []
+    depth = 0
+    ki = 0
+    for m in _argument_pattern(arginitsep, argendsep).finditer(line):
+        sep = m.group()
+        if sep == arginitsep:
+            if depth == 0:
+                ki = m.end()
+            depth += 1
+        elif sep == argendsep:
+            if depth == 0:  # Cierre sin apertura
+                continue
+            depth -= 1
+            if depth == 0:
+                spans.append((ki, m.start()))
+                if len(spans) == argnum:
+                    break
+    return spans
+
+
+def replace_arguments(line, args, arginitsep='{', argendsep='}'):
+    """
+    Reemplaza varios argumentos entre llaves de una línea con una sola búsqueda.
+    Lanza una excepción si un número es menor a 1 o si la línea no tiene ese
+    argumento, la línea no se modifica a medias.
+
+    :param argendsep: Keyword al finalizar argumento
+    :param arginitsep: Keyword al iniciar argumento
+    :param args: Diccionario número del argumento -> nuevos datos
+    :param line: Línea a reemplazar
+    :type args: dict
+    :return: String
+    """
+    if len(args) == 0:
+        return line
+    if min(args.keys()) < 1:
+        raise Exception('Numero de argumento invalido')
+    line = decodeline(line)
+    last = max(args.keys())
+    spans = find_arguments(line, last, arginitsep, argendsep)
+    if len(spans) < last:
+        raise Exception('No se encontro el numero de argumento')
+    z = []
+    ke = 0
+    for argnum in sorted(args.keys()):
+        ki, kf = spans[argnum - 1]
+        z.append(line[ke:ki])
+        z.append(args[argnum])
+        ke = kf
+    z.append(line[ke:])
+    return ''.join(z)
+
+
 def replace_argument(line, argnum, new, arginitsep='{', argendsep='}'):
     """
-    Reemplaza el argumento entre llaves de una determinada línea.
+    Reemplaza el argumento entre llaves de una determinada línea. Las llaves
+    anidadas quedan dentro del argumento y las escapadas se ignoran. Lanza una
+    excepción si el número es menor a 1 o si la línea no tiene ese argumento.
 
     :param argendsep: Keyword al finalizar argumento
     :param arginitsep: Keyword al iniciar argumento
@@ -141,42 +365,12 @@ def replace_argument(line, argnum, new, arginitsep='{', argendsep='}'):
     """
     if argnum < 1:
         raise Exception('Numero de argumento invalido')
-    n = len(line)
-    c = False
-    ki = -1
-    ke = 0
-    a = []
     line = decodeline(line)
-    for k in range(0, n):
-        if line[k] is arginitsep and c is not True:
-            c = True
-            k += 1
-            ki = k
-            a.append([line[ke:ki], False])
-        elif line[k] is argendsep and c:
-            c = False
-            ke = k
-            k += 1
-            if ke < ki:
-                raise Exception('Error al encontrar cierre parametro')
-            a.append([line[ki:ke], True])
-    a.append([line[ke:n], True])
-
-    d = 0
-    f = False
-    for k in range(0, len(a)):
-        if a[k][1]:
-            d += 1
-        if d == argnum:
-            a[k][0] = new
-            f = True
-            break
-    if not f:
+    spans = find_arguments(line, argnum, arginitsep, argendsep)
+    if len(spans) < argnum:
         raise Exception('No se encontro el numero de argumento')
-    z = ''
-    for k in a:
-        z += k[0]
-    return z
+    ki, kf = spans[-1]
+    return ''.join((line[:ki], new, line[kf:]))
 
 
 def paste_external_tex_into_file(fl, libr, files, headersize, libstrip, libdelcom, deletecoments, configfile,
@@ -224,43 +418,49 @@ def paste_external_tex_into_file(fl, libr, files, headersize, libstrip, libdelco
 
     for libdatapos in range(headersize, len(libdata)):
         srclin = libdata[libdatapos]
+        tok = tokenize_line(srclin)
+        directives = tok.directives
 
         # Forzar nueva línea
         forcenl = False or force_nl
-        if ' !NL' in srclin:
+        if ' !NL' in directives:
             forcenl = True
             srclin = srclin.replace(' !NL', '')
-        if ' !DISTNL' in srclin:
+        if ' !DISTNL' in directives:
             print(srclin)
             forcenl = True and dist
             srclin = srclin.replace(' !DISTNL', '')
 
         # Forzar borrado de comentarios
         forcedelcom = False
-        if ' !DELCOM' in srclin:
+        if ' !DELCOM' in directives:
             forcedelcom = True
             srclin = srclin.replace(' !DELCOM', '')
 
         # Forzar strip
         forcestrip = False
-        if ' !STRIP' in srclin:
+        if ' !STRIP' in directives:
             forcestrip = True
             srclin = srclin.replace(' !STRIP', '')
 
         # Insertar una línea nueva modo normal
-        if ' !PREVNL' in srclin:
+        if ' !PREVNL' in directives:
             if not dist:
                 fl.write('\n')
             srclin = srclin.replace(' !PREVNL', '')
 
         # Insertar una línea nueva modo normal
-        if ' !PREVDISTNL' in srclin:
+        if ' !PREVDISTNL' in directives:
             if dist:
                 fl.write('\n')
             srclin = srclin.replace(' !PREVDISTNL', '')
 
+        # La línea sin directivas se vuelve a clasificar
+        if len(directives) > 0:
+            tok = tokenize_line(srclin)
+
         # Si es un archivo
-        if '% !FILE' in srclin:
+        if '% !FILE' in directives:
 
             # Obtiene el archivo
             file_libr = srclin.replace('\\input{', '').replace('}', '').strip()
@@ -289,7 +489,7 @@ def paste_external_tex_into_file(fl, libr, files, headersize, libstrip, libdelco
 
         # Se borran los comentarios
         if deletecoments and libdelcom or forcedelcom:
-            if '%' in srclin and '\\%' not in srclin and '}%' not in srclin and '{%' not in srclin:
+            if tok.hascomment:
                 if libr == configfile:
                     if srclin.upper() == srclin:
                         if stconfig:
@@ -306,7 +506,7 @@ def paste_external_tex_into_file(fl, libr, files, headersize, libstrip, libdelco
                         srclin = srclin.strip() + '\n'
                     else:
                         srclin = srclin.strip()
-            elif srclin.strip() == '':
+            elif tok.kind == TOKEN_BLANK:
                 srclin = ''
         else:
             if libr == configfile:
@@ -0,0 +1,171 @@
+"""
+LOGGER
+Registro asíncrono de eventos en archivo
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = ['AsyncLogger']
+
+# Importación de librerías
+import os
+import queue
+import threading
+import time
+
+# Constantes
+LOG_BACKUPS = 3  # Número de archivos rotados que se mantienen
+LOG_BATCH_SIZE = 100  # Número máximo de entradas escritas por lote
+LOG_FLUSH_TIME = 0.5  # Tiempo máximo que una entrada espera en la cola (s)
+LOG_MAX_SIZE = 1024 * 1024  # Tamaño del archivo a partir del cual se rota (bytes)
+LOG_QUEUE_SIZE = 1000  # Número máximo de entradas pendientes
+
+
+class AsyncLogger(object):
+    """
+    Escribe las entradas del log desde un hilo secundario. Las entradas se
+    encolan sin bloquear a quien registra, se escriben por lotes y el archivo
+    se rota al superar un tamaño.
+    """
+
+    def __init__(self, filename, maxsize=LOG_MAX_SIZE, backups=LOG_BACKUPS,
+                 queuesize=LOG_QUEUE_SIZE, flushtime=LOG_FLUSH_TIME):
+        """
+        Constructor.
+
+        :param backups: Número de archivos rotados que se mantienen
+        :param filename: Archivo del log
+        :param flushtime: Tiempo máximo que una entrada espera en la cola (s)
+        :param maxsize: Tamaño máximo del archivo (bytes)
+        :param queuesize: Número máximo de entradas pendientes
+        """
+        self._backups = backups
+        self._filename = filename
+        self._flushtime = flushtime
+        self._maxsize = maxsize
+        self._queue = queue.Queue(maxsize=queuesize)
+
+        # Entradas descartadas por cola llena
+        self.dropped = 0
+
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _format(mode, msg, fields):
+        """
+        Genera la línea del log. Los campos se añaden como clave=valor.
+
+        :param fields: Campos estructurados
+        :param mode: Tipo de entrada
+        :param msg: Mensaje
+        :return: Línea
+        :rtype: str
+        """
+        d = time.strftime('%d/%m/%Y %H:%M:%S')
+        line = '{0} [{1}] {2}'.format(mode, d, msg)
+        if fields:
+            line += ' |' + ''.join(' {0}={1}'.format(k, fields[k]) for k in sorted(fields.keys()))
+        return line + '\n'
+
+    def log(self, mode, msg, **fields):
+        """
+        Registra una entrada. No bloquea, si la cola está llena la entrada se descarta.
+
+        :param fields: Campos estructurados (release, phase, elapsed_ms, ...)
+        :param mode: Tipo de entrada
+        :param msg: Mensaje
+        :return: None
+        """
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(self._format(mode, msg, fields))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2):
+        """
+        Escribe las entradas pendientes y termina el hilo.
+
+        :param timeout: Tiempo máximo de espera (s)
+        :return: None
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _rotate(self):
+        """
+        Rota el archivo si supera el tamaño máximo: log.txt pasa a log.txt.1,
+        log.txt.1 a log.txt.2 y así hasta el número de respaldos.
+
+        :return: None
+        """
+        if not os.path.isfile(self._filename) or os.path.getsize(self._filename) < self._maxsize:
+            return
+        for i in range(self._backups - 1, 0, -1):
+            src = '{0}.{1}'.format(self._filename, i)
+            if os.path.isfile(src):
+                os.replace(src, '{0}.{1}'.format(self._filename, i + 1))
+        if self._backups > 0:
+            os.replace(self._filename, self._filename + '.1')
+        else:
+            os.remove(self._filename)
+
+    def _run(self):
+        """
+        Hilo de escritura, junta las entradas pendientes y las escribe en lote.
+
+        :return: None
+        """
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self._flushtime)]
+            except queue.Empty:
+                continue
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [b for b in batch if b is not None]
+            if len(batch) == 0:
+                continue
+            if self.dropped > 0:
+                batch.append(self._format('WARNING', 'Entradas descartadas del log',
+                                          {'dropped': self.dropped}))
+                self.dropped = 0
+            try:
+                self._rotate()
+                with open(self._filename, 'a', encoding='utf8') as logfile:
+                    logfile.writelines(batch)
+            except OSError:
+                pass
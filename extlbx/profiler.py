@@ -0,0 +1,298 @@
+"""
+PROFILER
+Mide el tiempo, uso de cpu, entrada/salida y memoria de cada etapa de la exportación
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = [
+    'PROFILE_SPANS',
+    'Profiler',
+    'span'
+]
+
+# Importación de librerías
+from contextlib import contextmanager, nullcontext
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Constantes
+PROFILE_SPANS = ('load', 'transform', 'assemble', 'write', 'compile', 'zip', 'stats')
+_IO_FILE = '/proc/thread-self/io'  # Bytes leídos y escritos por el hilo (Linux)
+
+# Profiler activo de cada hilo
+_ACTIVE = threading.local()
+
+
+def _read_io():
+    """
+    Retorna los bytes leídos y escritos por el hilo actual.
+
+    :return: Tupla (leídos, escritos), None si el sistema no lo informa
+    :rtype: tuple, None
+    """
+    try:
+        with open(_IO_FILE, 'rb') as f:
+            data = f.read().split()
+        return int(data[1]), int(data[3])  # rchar, wchar
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class _Span(object):
+    """
+    Medición en curso de una etapa.
+    """
+
+    __slots__ = ('cpu', 'io', 'name', 'prof', 'wall')
+
+    def __init__(self, name, prof):
+        """
+        Constructor.
+
+        :param name: Nombre de la etapa
+        :param prof: Perfil cProfile de la etapa, None si no se perfila
+        """
+        self.cpu = 0
+        self.io = None
+        self.name = name
+        self.prof = prof
+        self.wall = 0
+
+
+class Profiler(object):
+    """
+    Acumula las mediciones de las etapas de una exportación. Las etapas se
+    anidan y cada una mide sólo su propio tiempo, el de las etapas internas se
+    descuenta, así la suma de las etapas es el tiempo total.
+    """
+
+    def __init__(self, memory=False, cprofile=None):
+        """
+        Constructor.
+
+        :param cprofile: Etapas perfiladas con cProfile
+        :param memory: Mide el peak de memoria con tracemalloc, más lento
+        :type cprofile: list, tuple, None
+        :type memory: bool
+        """
+        self._cprofile = tuple(cprofile or ())
+        self._memory = memory
+        self._profiles = {}
+        self._spans = {}
+        self._stack = []
+
+    def _start(self, s):
+        """
+        Inicia o reanuda la medición de una etapa.
+
+        :param s: Etapa
+        :type s: _Span
+        :return: None
+        """
+        s.io = _read_io()
+        if self._memory and tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            tracemalloc.reset_peak()
+        if s.prof is not None:
+            s.prof.enable()
+        s.cpu = time.thread_time()
+        s.wall = time.perf_counter()
+
+    def _stop(self, s):
+        """
+        Pausa o termina la medición de una etapa y acumula sus valores.
+
+        :param s: Etapa
+        :type s: _Span
+        :return: None
+        """
+        wall = time.perf_counter() - s.wall
+        cpu = time.thread_time() - s.cpu
+        if s.prof is not None:
+            s.prof.disable()
+        st = self._spans[s.name]
+        st['wall'] += wall
+        st['cpu'] += cpu
+        io = _read_io()
+        if io is not None and s.io is not None:
+            st['read'] += io[0] - s.io[0]
+            st['written'] += io[1] - s.io[1]
+        if self._memory and tracemalloc.is_tracing():
+            st['peak'] = max(st['peak'], tracemalloc.get_traced_memory()[1])
+
+    @contextmanager
+    def span(self, name):
+        """
+        Mide una etapa.
+
+        :param name: Nombre de la etapa
+        :type name: str
+        """
+        if name not in self._spans:
+            self._spans[name] = {'calls': 0, 'cpu': 0, 'peak': 0, 'read': 0, 'wall': 0, 'written': 0}
+        self._spans[name]['calls'] += 1
+        prof = None
+        if name in self._cprofile:
+            prof = self._profiles.setdefault(name, cProfile.Profile())
+        s = _Span(name, prof)
+        if len(self._stack) > 0:
+            self._stop(self._stack[-1])
+        self._stack.append(s)
+        self._start(s)
+        try:
+            yield
+        finally:
+            self._stop(s)
+            self._stack.pop()
+            if len(self._stack) > 0:
+                self._start(self._stack[-1])
+
+    @contextmanager
+    def activate(self):
+        """
+        Usa el profiler en las etapas medidas por el hilo actual.
+        """
+        prev = getattr(_ACTIVE, 'profiler', None)
+        _ACTIVE.profiler = self
+        tracing = self._memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            yield self
+        finally:
+            if tracing:
+                tracemalloc.stop()
+            _ACTIVE.profiler = prev
+
+    def report(self):
+        """
+        Retorna las mediciones de cada etapa. Los tiempos están en segundos y la
+        memoria en bytes, read y written son None si el sistema no los informa.
+
+        :return: Diccionario etapa -> mediciones
+        :rtype: dict
+        """
+        hasio = _read_io() is not None
+        rep = {}
+        for name in sorted(self._spans.keys(), key=_span_order):
+            st = dict(self._spans[name])
+            if not hasio:
+                st['read'] = st['written'] = None
+            if not self._memory:
+                st['peak'] = None
+            rep[name] = st
+        return rep
+
+    def table(self):
+        """
+        Retorna las mediciones como una tabla de texto.
+
+        :return: Tabla
+        :rtype: str
+        """
+
+        def _kb(x):
+            return '-' if x is None else '{0:.0f}'.format(x / 1024)
+
+        lines = ['{0:<10}{1:>7}{2:>10}{3:>10}{4:>10}{5:>10}{6:>10}'.format(
+            'ETAPA', 'N', 'WALL [s]', 'CPU [s]', 'READ [kB]', 'WRIT [kB]', 'PEAK [kB]')]
+        total = 0
+        for name, st in self.report().items():
+            total += st['wall']
+            lines.append('{0:<10}{1:>7}{2:>10.3f}{3:>10.3f}{4:>10}{5:>10}{6:>10}'.format(
+                name, st['calls'], st['wall'], st['cpu'], _kb(st['read']), _kb(st['written']), _kb(st['peak'])))
+        lines.append('{0:<17}{1:>10.3f}'.format('TOTAL', total))
+        return '\n'.join(lines)
+
+    def save(self, filename, **info):
+        """
+        Guarda las mediciones en un archivo json. Las etapas perfiladas con
+        cProfile se guardan junto al json con extensión .<etapa>.prof.
+
+        :param filename: Archivo json
+        :param info: Datos de la ejecución (release, versión, etc.)
+        :return: Archivos escritos
+        :rtype: list
+        """
+        folder = os.path.dirname(filename)
+        if folder != '':
+            os.makedirs(folder, exist_ok=True)
+        written = [filename]
+        info['spans'] = self.report()
+        with open(filename, 'w', encoding='utf8') as f:
+            json.dump(info, f, indent=2)
+        base = os.path.splitext(filename)[0]
+        for name, prof in self._profiles.items():
+            pfile = f'{base}.{name}.prof'
+            prof.dump_stats(pfile)
+            written.append(pfile)
+        return written
+
+    def cprofile_summary(self, name, limit=15):
+        """
+        Retorna las funciones con mayor tiempo acumulado de una etapa perfilada.
+
+        :param limit: Número de funciones
+        :param name: Etapa
+        :return: Texto de pstats, vacío si la etapa no se perfiló
+        :rtype: str
+        """
+        if name not in self._profiles:
+            return ''
+        out = io.StringIO()
+        pstats.Stats(self._profiles[name], stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+
+def _span_order(name):
+    """
+    Orden de las etapas en el reporte, primero las conocidas.
+
+    :param name: Etapa
+    :return: Llave de orden
+    :rtype: tuple
+    """
+    if name in PROFILE_SPANS:
+        return 0, PROFILE_SPANS.index(name), name
+    return 1, 0, name
+
+
+def span(name):
+    """
+    Mide una etapa con el profiler activo del hilo, si no hay uno no hace nada.
+
+    :param name: Nombre de la etapa
+    :type name: str
+    :return: Administrador de contexto
+    """
+    profiler = getattr(_ACTIVE, 'profiler', None)
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name)
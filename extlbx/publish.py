@@ -0,0 +1,158 @@
+"""
+PUBLISH
+Publica los cambios de los repositorios git
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = [
+    'git',
+    'GitPublisher'
+]
+
+# Importación de librerías
+from concurrent.futures import ThreadPoolExecutor
+from extlbx.utils import popen
+import subprocess
+import time
+
+# Constantes
+GIT_TIMEOUT = {  # Tiempo máximo de cada paso (s)
+    'add': 60,
+    'commit': 60,
+    'diff': 60,
+    'push': 180
+}
+
+
+def git(args, cwd, timeout):
+    """
+    Ejecuta un comando git en un repositorio. Si supera el tiempo máximo el
+    proceso se termina y el código retornado es None.
+
+    :param args: Argumentos de git
+    :param cwd: Carpeta del repositorio
+    :param timeout: Tiempo máximo (s)
+    :return: Código de salida, tiempo de ejecución y salida del comando
+    :rtype: tuple
+    """
+    t = time.time()
+    proc = popen(['git'] + args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd)
+    try:
+        out = proc.communicate(timeout=timeout)[0]
+        code = proc.returncode
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        out = proc.communicate()[0]
+        code = None
+    return code, time.time() - t, out.decode('utf8', errors='replace')
+
+
+class GitPublisher(object):
+    """
+    Publica commits en varios repositorios. Cada repositorio hace sus commits
+    en orden y un único push, los repositorios se publican en paralelo.
+    """
+
+    def __init__(self, timeout=None):
+        """
+        Constructor.
+
+        :param timeout: Tiempo máximo de cada paso, reemplaza los valores de GIT_TIMEOUT
+        :type timeout: dict
+        """
+        self._repos = {}
+        self._timeout = dict(GIT_TIMEOUT)
+        if timeout:
+            self._timeout.update(timeout)
+
+    def add_commit(self, repo, paths, message, name=None):
+        """
+        Añade un commit a un repositorio.
+
+        :param message: Mensaje del commit
+        :param name: Nombre del repositorio en los resultados
+        :param paths: Archivos a añadir, se pasan a git add
+        :param repo: Carpeta del repositorio
+        :type paths: list
+        :return: None
+        """
+        if repo not in self._repos:
+            self._repos[repo] = {'name': name or repo, 'commits': []}
+        self._repos[repo]['commits'].append((paths, message))
+
+    def _publish_repo(self, repo):
+        """
+        Hace los commits de un repositorio y el push.
+
+        :param repo: Carpeta del repositorio
+        :return: Resultado
+        :rtype: dict
+        """
+        result = {
+            'error': '',
+            'name': self._repos[repo]['name'],
+            'ok': False,
+            'repo': repo,
+            'steps': [],
+            'time': 0
+        }
+
+        def _step(step, args, valid=(0,)):
+            code, t, out = git(args, repo, self._timeout[step])
+            result['steps'].append({'code': code, 'step': step, 'time': t})
+            result['time'] += t
+            if code is None:
+                result['error'] = 'TIMEOUT ({0})'.format(step)
+                return None
+            if code not in valid:
+                result['error'] = '{0}: {1}'.format(step, out.strip())
+                return None
+            return code
+
+        try:
+            for paths, message in self._repos[repo]['commits']:
+                if _step('add', ['add'] + paths) is None:
+                    return result
+
+                # Sin cambios en el índice no se hace el commit, diff retorna 1 si hay cambios
+                staged = _step('diff', ['diff', '--cached', '--quiet'], valid=(0, 1))
+                if staged is None or staged == 1 and _step('commit', ['commit', '-m', message]) is None:
+                    return result
+            result['ok'] = _step('push', ['push']) is not None
+        except OSError as e:
+            result['error'] = str(e)
+        return result
+
+    def publish(self):
+        """
+        Publica todos los repositorios en paralelo.
+
+        :return: Resultado de cada repositorio, en el orden en que se añadieron
+        :rtype: list
+        """
+        if len(self._repos) == 0:
+            return []
+        with ThreadPoolExecutor(max_workers=len(self._repos)) as executor:
+            return list(executor.map(self._publish_repo, list(self._repos.keys())))
@@ -28,6 +28,7 @@ Licencia:
 
 __all__ = [
     'DEPTOS',
+    'REGISTRY',
     'REL_ARTICULO',
     'REL_AUXILIAR',
     'REL_CONTROLES',
@@ -37,20 +38,20 @@ __all__ = [
     'REL_PROFESSIONALCV',
     'REL_REPORTE',
     'REL_TESIS',
+    'Release',
+    'ReleaseRegistry',
     'RELEASES'
 ]
 
 # Importación de librerías
 import json
+import marshal
 import os
 
-# Se carga json
+# Los json se cargan al primer acceso a RELEASES, REGISTRY o DEPTOS
 __actualpath = str(os.path.abspath(os.path.dirname(__file__))).replace('\\', '/') + '/'
-
-with open(__actualpath + 'releases.json', encoding='utf8') as json_data:
-    RELEASES = json.load(json_data)
-with open(__actualpath + 'deptos.json', encoding='utf8') as json_data:
-    DEPTOS = json.load(json_data)['DEPTOS']
+_CACHE_FOLDER = __actualpath + '__pycache__/'
+_JSON_DATA = {}
 
 # Constantes
 REL_ARTICULO = 'ARTICULO'
@@ -62,3 +63,184 @@ REL_PRESENTACION = 'PRESENTACION'
 REL_PROFESSIONALCV = 'PROFESSIONAL-CV'
 REL_REPORTE = 'REPORTE'
 REL_TESIS = 'TESIS'
+
+
+class Release(object):
+    """
+    Release del registro. Los campos más usados son atributos, el resto se
+    lee como en el diccionario de releases.json.
+    """
+
+    __slots__ = ('data', 'id', 'message', 'name', 'statfile', 'tag')
+
+    def __init__(self, tag, data):
+        """
+        Constructor.
+
+        :param data: Entrada del release en releases.json
+        :param tag: Tag del release
+        :type data: dict
+        :type tag: str
+        """
+        self.data = data
+        self.id = data['ID']
+        self.message = data['MESSAGE']
+        self.name = data['NAME']
+        self.statfile = data['STATS']['FILE']
+        self.tag = tag
+
+    def __getitem__(self, key):
+        """
+        Retorna un campo del release.
+
+        :param key: Campo
+        :return: Valor
+        """
+        return self.data[key]
+
+    def __repr__(self):
+        """
+        Representación del release.
+
+        :return: Texto
+        :rtype: str
+        """
+        return f'Release({self.tag!r}, id={self.id})'
+
+
+class ReleaseRegistry(object):
+    """
+    Registro de releases con índices por tag, ID y nombre.
+    """
+
+    def __init__(self, releases):
+        """
+        Constructor.
+
+        :param releases: Diccionario tag -> release de releases.json
+        :type releases: dict
+        """
+        self._bytag = {}
+        for tag in sorted(releases.keys()):
+            self._bytag[tag] = Release(tag, releases[tag])
+        self._byid = {}
+        self._byname = {}
+        for r in self._bytag.values():
+            if r.id in self._byid or r.name in self._byname:
+                raise ValueError(f'release {r.tag} repite ID o nombre')
+            self._byid[r.id] = r
+            self._byname[r.name] = r
+
+    def __iter__(self):
+        """
+        Recorre los releases ordenados por tag.
+
+        :return: Iterador
+        """
+        return iter(self._bytag.values())
+
+    def __len__(self):
+        """
+        Número de releases.
+
+        :return: Largo
+        :rtype: int
+        """
+        return len(self._bytag)
+
+    def by_id(self, releaseid):
+        """
+        Busca un release por su ID.
+
+        :param releaseid: ID del release
+        :type releaseid: int
+        :return: Release, None si no existe
+        :rtype: Release
+        """
+        return self._byid.get(releaseid)
+
+    def by_name(self, name):
+        """
+        Busca un release por su nombre.
+
+        :param name: Nombre del release
+        :type name: str
+        :return: Release, None si no existe
+        :rtype: Release
+        """
+        return self._byname.get(name)
+
+    def get(self, tag):
+        """
+        Busca un release por su tag.
+
+        :param tag: Tag del release
+        :type tag: str
+        :return: Release, None si no existe
+        :rtype: Release
+        """
+        return self._bytag.get(tag)
+
+    def names(self):
+        """
+        Retorna los nombres de los releases ordenados por tag.
+
+        :return: Lista de nombres
+        :rtype: list
+        """
+        return [r.name for r in self._bytag.values()]
+
+
+def _load_json(filename):
+    """
+    Carga un archivo json de la carpeta del módulo, se lee una única vez. El
+    contenido se guarda serializado con marshal en __pycache__ y se usa
+    mientras el json no cambie.
+
+    :param filename: Nombre del archivo
+    :return: Contenido del archivo
+    :rtype: dict
+    """
+    if filename in _JSON_DATA:
+        return _JSON_DATA[filename]
+    st = os.stat(__actualpath + filename)
+    key = (st.st_mtime_ns, st.st_size)
+    cachefile = _CACHE_FOLDER + filename + '.marshal'
+    data = None
+    try:
+        with open(cachefile, 'rb') as f:
+            cachekey, cachedata = marshal.loads(f.read())
+        if tuple(cachekey) == key:
+            data = cachedata
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    if data is None:
+        with open(__actualpath + filename, encoding='utf8') as json_data:
+            data = json.load(json_data)
+        try:
+            os.makedirs(_CACHE_FOLDER, exist_ok=True)
+            with open(cachefile + '.tmp', 'wb') as f:
+                f.write(marshal.dumps((key, data)))
+            os.replace(cachefile + '.tmp', cachefile)
+        except OSError:  # Carpeta sin permisos de escritura, se usa el json
+            pass
+    _JSON_DATA[filename] = data
+    return data
+
+
+def __getattr__(name):
+    """
+    Carga RELEASES, REGISTRY y DEPTOS de forma diferida.
+
+    :param name: Nombre del atributo
+    :return: Valor del atributo
+    """
+    if name == 'RELEASES':
+        return _load_json('releases.json')
+    if name == 'REGISTRY':
+        if 'REGISTRY' not in _JSON_DATA:
+            _JSON_DATA['REGISTRY'] = ReleaseRegistry(_load_json('releases.json'))
+        return _JSON_DATA['REGISTRY']
+    if name == 'DEPTOS':
+        return _load_json('deptos.json')['DEPTOS']
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -28,20 +28,44 @@ Licencia:
 
 __all__ = [
     'add_stat',
+    'build_columnar_stats',
+    'detect_ctime_regression',
     'generate_statline',
-    'plot_stats'
+    'load_stats',
+    'plot_stats',
+    'plot_stats_async',
+    'rolling_mean',
+    'rolling_trimmed_mean',
+    'trimmed_mean'
 ]
 
 # Importación de librerías
-from extlbx.utils import split_str
+from contextlib import nullcontext
+from extlbx.utils import FileLock, read_last_line, read_last_lines, split_str
+import io
+import os
+import threading
 
-SCIPY = True
+NUMPY = True
 
 try:
     # noinspection PyUnresolvedReferences
-    from scipy import stats  # type: ignore
+    import numpy as np  # type: ignore
 except (ImportError, ModuleNotFoundError):
-    SCIPY = False
+    NUMPY = False
+
+# Constantes
+PLOT_DPI = 600
+PLOT_ROLLING_WINDOW = 10  # Número de compilaciones de la media móvil
+REGRESSION_MIN_RATIO = 1.10  # Aumento mínimo respecto a la línea base
+REGRESSION_MIN_SAMPLES = 5  # Compilaciones necesarias para tener línea base
+REGRESSION_STD_FLOOR = 0.05  # Desviación mínima, proporción de la línea base
+REGRESSION_WINDOW = 20  # Compilaciones anteriores usadas como línea base
+REGRESSION_ZSCORE = 3.0  # Umbral del z-score acotado
+TRIM_PROPORTION = 0.15  # Proporción recortada en cada extremo de la media acotada
+
+# Matplotlib no es seguro entre hilos, los gráficos se generan de a uno
+_PLOT_LOCK = threading.Lock()
 
 
 def generate_statline(statid, version, time, date, lc, vh):
@@ -66,124 +90,370 @@ def generate_statline(statid, version, time, date, lc, vh):
     return f'{statid}{version}{time}{date}{lc}{vh}'
 
 
-# noinspection PyBroadException,PyUnboundLocalVariable
 def add_stat(statfile, version, time, date, lc, vh, test=False):
     """
-    Agrega una entrada al archivo de estadísticas.
+    Agrega una entrada al archivo de estadísticas. Sólo se lee la última línea
+    y la entrada nueva se añade al final del archivo, bajo un archivo de lock
+    para que dos compilaciones no escriban a la vez.
 
-    :param test: Indica testeo
+    :param test: Indica testeo, no se escribe el archivo ni se crea el lock
     :param statfile: Archivo de estadísticas
     :param version: Versión del template
     :param time: Tiempo de compilación
     :param date: Fecha de compilación
     :param lc: Total de líneas de código
     :param vh: Version hash
-    :return:
+    :return: Línea agregada
+    :rtype: str
     """
+    with nullcontext() if test else FileLock(statfile + '.lock'):
 
-    # Se carga el archivo y se encuentra la última entrada
-    dataarr = []
-    try:
-        data = open(statfile, encoding='utf8')
-        for i in data:
-            dataarr.append(i)
-        lastentrypos = len(dataarr) - 1
-    except:
-        data = open(statfile, 'w', encoding='utf8')
-        lastentrypos = -1
-    if lastentrypos >= 0:
-        lastentry = split_str(dataarr[lastentrypos].strip(), ' ')
-        lastid = int(lastentry[0])
-        lastver = lastentry[1].split('.')
-        if len(lastver) == 4:
-            lastverid = int(lastver[3])
-            lastver = lastentry[1]
-            lastver = lastver.replace('.' + str(lastverid), '')
-        else:
-            lastverid = 0
-            lastver = lastentry[1]
-
-        dataarr[lastentrypos] = f'{dataarr[lastentrypos]}\n'
-    else:
+        # Se encuentra la última entrada
+        lastline = None
+        if os.path.isfile(statfile):
+            lastline = read_last_line(statfile)
         lastid = 0
         lastver = ''
-        dataarr.append(generate_statline('ID', 'VERSION', 'CTIME', 'FECHA',
-                                         'LINEAS', 'HASH\n'))
-    data.close()
+        lastverid = 0
+        newdata = ''
+        if lastline is None:
+            newdata = generate_statline('ID', 'VERSION', 'CTIME', 'FECHA', 'LINEAS', 'HASH\n')
+        else:
+            lastentry = split_str(lastline, ' ')
+            if lastentry[0] != 'ID':
+                lastid = int(lastentry[0])
+                lastver = lastentry[1].split('.')
+                if len(lastver) == 4:
+                    lastverid = int(lastver[3])
+                    lastver = lastentry[1]
+                    lastver = lastver.replace('.' + str(lastverid), '')
+                else:
+                    lastver = lastentry[1]
+
+            # La última línea del archivo no termina en salto de línea
+            with open(statfile, 'rb') as data:
+                data.seek(-1, os.SEEK_END)
+                if data.read(1) != b'\n':
+                    newdata = '\n'
+
+        # Se comprueba que la version sea distinta
+        if version == lastver:
+            version = f'{version}.{lastverid + 1}'
+
+        # Se crea una nueva línea
+        newentry = generate_statline(lastid + 1, version, str(time)[0:5], date,
+                                     lc, vh)
+
+        # Se añade la línea al archivo
+        if not test:
+            with open(statfile, 'a', encoding='utf8') as data:
+                data.write(newdata + newentry)
+                data.flush()
+                os.fsync(data.fileno())
+            if NUMPY:
+                _append_columnar_stats(statfile, lastid, [lastid + 1, float(str(time)[0:5]), lc])
+
+    return newentry
+
+
+def _columnar_file(statfile):
+    """
+    Retorna el archivo columnar asociado a un archivo de estadísticas.
+
+    :param statfile: Archivo de estadísticas
+    :return: Archivo .npy
+    :rtype: str
+    """
+    return os.path.splitext(statfile)[0] + '.npy'
+
+
+def _parse_stats_text(statfile):
+    """
+    Lee las columnas id, tiempo de compilación y líneas de código del archivo
+    de estadísticas en texto.
+
+    :param statfile: Archivo de estadísticas
+    :return: Listas de id, tiempo de compilación y líneas de código
+    :rtype: tuple
+    """
+    numcomp = []
+    timecomp = []
+    lcode = []
+    with open(statfile, encoding='utf8') as data:
+        k = 0
+        for i in data:
+            if k > 0 and i.strip() != '':
+                j = split_str(i.strip(), ' ')
+                numcomp.append(int(j[0]))
+                timecomp.append(float(j[2]))
+                lcode.append(int(j[4]))
+            k += 1
+    return numcomp, timecomp, lcode
+
+
+def build_columnar_stats(statfile):
+    """
+    Regenera el archivo columnar (.npy junto al archivo de texto) con las
+    columnas id, tiempo de compilación y líneas de código. El archivo de texto
+    sigue siendo el registro completo.
+
+    :param statfile: Archivo de estadísticas
+    :return: Arreglo de n x 3
+    """
+    numcomp, timecomp, lcode = _parse_stats_text(statfile)
+    arr = np.column_stack((numcomp, timecomp, lcode)).astype(np.float64).reshape(-1, 3)  # Orden C, ver append
+    npyfile = _columnar_file(statfile)
+    with open(npyfile + '.tmp', 'wb') as f:
+        np.save(f, arr)
+    os.replace(npyfile + '.tmp', npyfile)
+    return arr
+
+
+def _append_columnar_stats(statfile, lastid, row):
+    """
+    Añade una fila al archivo columnar reescribiendo sólo su encabezado. Si el
+    archivo no existe o no está al día con el texto, se regenera completo.
+
+    :param lastid: ID de la última entrada antes de agregar la fila
+    :param row: Fila (id, tiempo de compilación, líneas de código)
+    :param statfile: Archivo de estadísticas
+    :return: None
+    """
+    npyfile = _columnar_file(statfile)
+    try:
+        if os.path.isfile(npyfile):
+            with open(npyfile, 'r+b') as f:
+                if np.lib.format.read_magic(f) == (1, 0):
+                    shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+                    hlen = f.tell()
+                    if not fortran and len(shape) == 2 and shape[1] == 3 and dtype == np.float64:
+                        last = 0
+                        if shape[0] > 0:
+                            f.seek(hlen + (shape[0] - 1) * 3 * dtype.itemsize)
+                            last = int(np.frombuffer(f.read(3 * dtype.itemsize), dtype=dtype)[0])
+                        header = io.BytesIO()
+                        np.lib.format.write_array_header_1_0(header, {
+                            'descr': np.lib.format.dtype_to_descr(dtype),
+                            'fortran_order': False,
+                            'shape': (shape[0] + 1, 3)
+                        })
+                        header = header.getvalue()
+
+                        # El encabezado nuevo debe ocupar el mismo espacio
+                        if last == lastid and len(header) == hlen:
+                            f.seek(0, os.SEEK_END)
+                            f.write(np.asarray(row, dtype=dtype).tobytes())
+                            f.seek(0)
+                            f.write(header)
+                            f.flush()
+                            os.fsync(f.fileno())
+                            return
+        build_columnar_stats(statfile)
+    except (OSError, ValueError):
+        if os.path.isfile(npyfile):
+            os.remove(npyfile)
+
+
+def load_stats(statfile):
+    """
+    Carga las columnas id, tiempo de compilación y líneas de código. Si numpy
+    está disponible se usa el archivo columnar mapeado en memoria, que se
+    regenera si no coincide con la última entrada del texto.
+
+    :param statfile: Archivo de estadísticas
+    :return: Id, tiempo de compilación y líneas de código
+    :rtype: tuple
+    """
+    if NUMPY:
+        try:
+            npyfile = _columnar_file(statfile)
+            arr = None
+            if os.path.isfile(npyfile):
+                arr = np.load(npyfile, mmap_mode='r')
+                lastline = split_str(read_last_line(statfile), ' ')
+                lastid = int(lastline[0]) if lastline[0] != 'ID' else 0
+                if arr.ndim != 2 or arr.shape[0] == 0 or int(arr[-1, 0]) != lastid:
+                    arr = None
+            if arr is None:
+                arr = build_columnar_stats(statfile)
+            return arr[:, 0], arr[:, 1], arr[:, 2]
+        except (OSError, ValueError):
+            pass
+    return _parse_stats_text(statfile)
+
 
-    # Se comprueba que la version sea distinta
-    if version == lastver:
-        version = f'{version}.{lastverid + 1}'
+def trimmed_mean(x, proportion=TRIM_PROPORTION):
+    """
+    Media acotada, descarta la proporción indicada de valores en cada extremo.
+
+    :param proportion: Proporción recortada en cada extremo
+    :param x: Valores
+    :return: Media acotada
+    :rtype: float
+    """
+    x = np.sort(np.asarray(x, dtype=np.float64))
+    cut = int(proportion * len(x))
+    return float(x[cut:len(x) - cut].mean())
+
+
+def rolling_mean(x, window):
+    """
+    Media móvil. Los primeros window - 1 valores son nan.
+
+    :param window: Tamaño de la ventana
+    :param x: Valores
+    :return: Arreglo del mismo largo que x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if 0 < window <= len(x):
+        c = np.cumsum(np.insert(x, 0, 0))
+        out[window - 1:] = (c[window:] - c[:-window]) / window
+    return out
 
-    # Se crea una nueva línea
-    newentry = generate_statline(lastid + 1, version, str(time)[0:5], date,
-                                 lc, vh)
-    dataarr.append(newentry)
 
-    # Se guarda el nuevo archivo
-    if not test:
-        data = open(statfile, 'w', encoding='utf8')
-        for i in dataarr:
-            data.write(i)
-        data.close()
+def rolling_trimmed_mean(x, window, proportion=TRIM_PROPORTION):
+    """
+    Media acotada móvil, cada valor usa la ventana que termina en él. Los
+    primeros window - 1 valores son nan.
+
+    :param proportion: Proporción recortada en cada extremo
+    :param window: Tamaño de la ventana
+    :param x: Valores
+    :return: Arreglo del mismo largo que x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if 0 < window <= len(x):
+        cut = int(proportion * window)
+        w = np.sort(np.lib.stride_tricks.sliding_window_view(x, window), axis=1)
+        out[window - 1:] = w[:, cut:window - cut].mean(axis=1)
+    return out
 
 
-# noinspection PyUnresolvedReferences
 def plot_stats(statfile, statplotctime, statplotlcode):
     """
-    Grafica las estadísticas.
+    Grafica las estadísticas. Los gráficos se dibujan fuera de pantalla con Agg
+    y no usan el estado global de pyplot.
 
     :param statplotlcode: Archivo de gráficos línea de código
     :param statplotctime: Archivo de gráficos tiempo de compilación
     :param statfile: Archivo de estadísticas
     :return:
     """
-    import matplotlib.pyplot as plt  # type: ignore
+    if not NUMPY:
+        return
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore
+    from matplotlib.figure import Figure  # type: ignore
     from matplotlib.ticker import MaxNLocator  # type: ignore
 
-    data = open(statfile, encoding='utf8')
-    numcomp = []
-    timecomp = []
-    lcode = []
-    k = 0
-    for i in data:
-        if k > 0:
-            j = split_str(i.strip(), ' ')
-            numcomp.append(int(j[0]))
-            timecomp.append(float(j[2]))
-            lcode.append(int(j[4]))
-        k += 1
+    numcomp, timecomp, lcode = load_stats(statfile)
+    numcomp = np.asarray(numcomp)
+    timecomp = np.asarray(timecomp, dtype=np.float64)
+    lcode = np.asarray(lcode)
     nlen = len(numcomp)
-    lastid = numcomp[nlen - 1]
-    if nlen >= 3 and SCIPY:
+    if nlen < 3:
+        return
+    lastid = numcomp[-1]
+
+    with _PLOT_LOCK:
         # Tiempo de compilación
-        tme = stats.tmean(timecomp)
-        trc = stats.trim_mean(timecomp, 0.15)
+        tme = float(timecomp.mean())
+        trc = trimmed_mean(timecomp)
+        window = min(PLOT_ROLLING_WINDOW, nlen)
+        rme = rolling_mean(timecomp, window)
+        rtm = rolling_trimmed_mean(timecomp, window)
 
-        plt.figure(1)
-        fig, ax = plt.subplots()
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         ax.plot(numcomp, timecomp, 'c', label=u'Tiempo compilación (s)')
-        ax.plot([numcomp[0], numcomp[nlen - 1]], [tme, tme], 'r--',
+        ax.plot(numcomp, rme, 'g', label=f'Media móvil ({window})')
+        ax.plot(numcomp, rtm, 'm', label=f'Media acotada móvil ({window})')
+        ax.plot([numcomp[0], lastid], [tme, tme], 'r--',
                 label=f'Tiempo medio ({tme:.3g}s)')
-        ax.plot([numcomp[0], numcomp[nlen - 1]], [tme, tme], 'b--',
+        ax.plot([numcomp[0], lastid], [trc, trc], 'b--',
                 label=f'Media acotada ({trc:.3g}s)')
         ax.xaxis.set_major_locator(MaxNLocator(integer=True))
         ax.set_xlabel(u'Número de compilación')
         ax.set_ylabel(u'Tiempo de compilación [s]')
         ax.set_title(u'Estadísticas')
-        plt.xlim(1, lastid)
+        ax.set_xlim(1, lastid)
         ax.legend()
-        fig.savefig(statplotctime, dpi=600)
+        fig.savefig(statplotctime, dpi=PLOT_DPI)
+        fig.clear()
 
         # Líneas de código
-        fig, ax = plt.subplots()
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         ax.plot(numcomp, lcode)
         ax.set_xlabel(u'Número de compilación')
         ax.set_ylabel(u'Líneas de código')
         ax.set_title(u'Estadísticas')
-        plt.ylim([min(lcode) * 0.97, max(lcode) * 1.03])
+        ax.set_ylim([lcode.min() * 0.97, lcode.max() * 1.03])
         ax.xaxis.set_major_locator(MaxNLocator(integer=True))
-        plt.xlim(1, lastid)
-        fig.savefig(statplotlcode, dpi=600)
+        ax.set_xlim(1, lastid)
+        fig.savefig(statplotlcode, dpi=PLOT_DPI)
+        fig.clear()
+
+
+def plot_stats_async(statfile, statplotctime, statplotlcode):
+    """
+    Grafica las estadísticas en un hilo secundario.
+
+    :param statplotlcode: Archivo de gráficos línea de código
+    :param statplotctime: Archivo de gráficos tiempo de compilación
+    :param statfile: Archivo de estadísticas
+    :return: Hilo
+    :rtype: threading.Thread
+    """
+    thread = threading.Thread(target=plot_stats, args=(statfile, statplotctime, statplotlcode))
+    thread.start()
+    return thread
+
+
+def detect_ctime_regression(statfile, window=REGRESSION_WINDOW, threshold=REGRESSION_ZSCORE,
+                            minratio=REGRESSION_MIN_RATIO):
+    """
+    Compara el tiempo de la última compilación con una línea base formada por
+    las window compilaciones anteriores. La línea base usa media y desviación
+    acotadas, así una compilación lenta aislada no la contamina. Sólo se leen
+    las últimas líneas del archivo y no se requiere numpy.
+
+    :param minratio: Razón mínima entre el tiempo y la línea base
+    :param statfile: Archivo de estadísticas
+    :param threshold: Umbral del z-score
+    :param window: Número de compilaciones de la línea base
+    :return: Diccionario con ctime, baseline, zscore y ratio si hay regresión, None si no
+    :rtype: dict, None
+    """
+    ctimes = []
+    for line in read_last_lines(statfile, window + 1):
+        j = split_str(line, ' ')
+        if len(j) > 2 and j[0] != 'ID':
+            ctimes.append(float(j[2]))
+    if len(ctimes) < REGRESSION_MIN_SAMPLES + 1:
+        return None
+    ctime = ctimes.pop()
+
+    # Línea base acotada
+    x = sorted(ctimes)
+    cut = int(TRIM_PROPORTION * len(x))
+    x = x[cut:len(x) - cut]
+    baseline = sum(x) / len(x)
+    if baseline <= 0:
+        return None
+    std = (sum((k - baseline) ** 2 for k in x) / len(x)) ** 0.5
+    std = max(std, REGRESSION_STD_FLOOR * baseline)
 
-    data.close()
+    zscore = (ctime - baseline) / std
+    ratio = ctime / baseline
+    if zscore < threshold or ratio < minratio:
+        return None
+    return {
+        'baseline': baseline,
+        'ctime': ctime,
+        'ratio': ratio,
+        'zscore': zscore
+    }
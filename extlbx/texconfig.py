@@ -0,0 +1,283 @@
+"""
+TEXCONFIG
+Modelo de los archivos de configuración basados en \\def
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = [
+    'align_line',
+    'comment_column',
+    'TexConfig'
+]
+
+# Importación de librerías
+from extlbx.latex import replace_argument, tokenize_line, TOKEN_BLANK, TOKEN_DEF
+
+
+def comment_column(line):
+    """
+    Retorna la columna en la que empieza el comentario de una línea.
+
+    :param line: Línea
+    :type line: str
+    :return: Columna del primer % no escapado, -1 si no tiene comentario
+    :rtype: int
+    """
+    return tokenize_line(line).comment
+
+
+def align_line(line, column):
+    """
+    Mueve el comentario de una línea \\def a una columna. Si el código no cabe
+    se quita el espacio entre la variable y su valor, y si sobra espacio se
+    agrega; el comentario queda al menos a un espacio del código.
+
+    :param column: Columna del comentario
+    :param line: Línea
+    :type column: int
+    :type line: str
+    :return: Línea alineada
+    :rtype: str
+    """
+    tok = tokenize_line(line)
+    if tok.comment < 0 or column < 0:
+        return line
+    code = line[:tok.comment].rstrip()
+    if tok.kind == TOKEN_DEF:
+        keyend = len(code) - len(code.lstrip()) + len('\\def\\' + tok.key)  # La línea parte con \def\key
+        if len(code) >= column and code[keyend:keyend + 2] == ' {':
+            code = code[:keyend] + code[keyend + 1:]
+        elif len(code) + 1 < column and code[keyend:keyend + 1] == '{':
+            code = code[:keyend] + ' ' + code[keyend:]
+    return code + ' ' * max(1, column - len(code)) + line[tok.comment:]
+
+
+class TexConfig(object):
+    """
+    Archivo de configuraciones indexado por las variables de sus líneas \\def.
+    Cada variable se busca por su nombre exacto, así captionmarginimages no
+    encuentra a captionmarginimagesmc. Borrar, reemplazar e insertar no
+    desplazan las posiciones del índice, las líneas borradas se marcan y las
+    insertadas se guardan aparte hasta llamar a to_list.
+
+    Al cargar el archivo se calcula la columna de los comentarios de cada
+    bloque (líneas separadas por una línea en blanco), la más usada por sus
+    líneas \\def. Las líneas cuyo valor cambia con replace_value se alinean a
+    esa columna en to_list.
+    """
+
+    def __init__(self, data):
+        """
+        Constructor.
+
+        :param data: Lista del archivo
+        :type data: list
+        """
+        self._after = {}  # Posición -> líneas insertadas después
+        self._before = {}  # Posición -> líneas insertadas antes
+        self._block = []  # Posición -> bloque
+        self._columns = []  # Bloque -> columna de los comentarios
+        self._edited = set()  # Posiciones de los valores reemplazados
+        self._index = {}  # Variable -> posiciones de sus líneas
+        self._lines = list(data)
+
+        # Se indexan las variables y se cuentan las columnas de cada bloque
+        count = {}
+        for i in range(len(self._lines)):
+            tok = tokenize_line(self._lines[i])
+            if tok.kind == TOKEN_BLANK and len(count) > 0:
+                self._columns.append(max(count.keys(), key=lambda c: (count[c], c)))
+                count = {}
+            self._block.append(len(self._columns))
+            if tok.kind == TOKEN_DEF:
+                self._index.setdefault(tok.key, []).append(i)
+                if tok.comment > 0:
+                    count[tok.comment] = count.get(tok.comment, 0) + 1
+        self._columns.append(max(count.keys(), key=lambda c: (count[c], c)) if len(count) > 0 else -1)
+
+    @staticmethod
+    def _key(key):
+        """
+        Normaliza el nombre de una variable, acepta \\key y key {.
+
+        :param key: Variable
+        :type key: str
+        :return: Nombre de la variable
+        :rtype: str
+        """
+        key = key.strip()
+        if key[-1:] == '{':
+            key = key[:-1].rstrip()
+        return key.lstrip('\\')
+
+    def find(self, key):
+        """
+        Retorna la posición de la línea que define una variable.
+
+        :param key: Variable
+        :type key: str
+        :return: Posición en la lista original
+        :rtype: int
+        """
+        pos = self._index.get(self._key(key))
+        if not pos:
+            raise ValueError(f'No se encontró la variable {key}')
+        return pos[0]
+
+    def __contains__(self, key):
+        """
+        Indica si el archivo define la variable.
+
+        :param key: Variable
+        :type key: str
+        :return: True si la variable existe
+        :rtype: bool
+        """
+        return bool(self._index.get(self._key(key)))
+
+    def __getitem__(self, key):
+        """
+        Retorna la línea de una variable.
+
+        :param key: Variable
+        :type key: str
+        :return: Línea
+        :rtype: str
+        """
+        return self._lines[self.find(key)]
+
+    def __setitem__(self, key, line):
+        """
+        Reemplaza la línea de una variable.
+
+        :param key: Variable
+        :param line: Nueva línea
+        :type key: str
+        :type line: str
+        :return: None
+        """
+        self._lines[self.find(key)] = line
+
+    def delete(self, key):
+        """
+        Borra la línea de una variable.
+
+        :param key: Variable
+        :type key: str
+        :return: None
+        """
+        i = self.find(key)
+        self._index[self._key(key)].pop(0)
+        self._lines[i] = None
+        self._edited.discard(i)
+
+    def replace_value(self, key, value, argnum=1):
+        """
+        Reemplaza el valor de una variable.
+
+        :param argnum: Número del argumento
+        :param key: Variable
+        :param value: Nuevo valor
+        :type key: str
+        :type value: str
+        :return: None
+        """
+        i = self.find(key)
+        self._lines[i] = replace_argument(self._lines[i], argnum, value)
+        self._edited.add(i)
+
+    def column(self, key):
+        """
+        Retorna la columna de los comentarios del bloque de una variable.
+
+        :param key: Variable
+        :type key: str
+        :return: Columna, -1 si el bloque no tiene comentarios
+        :rtype: int
+        """
+        return self._columns[self._block[self.find(key)]]
+
+    def align_comment(self, key, column=None):
+        """
+        Mueve el comentario de la línea de una variable a una columna.
+
+        :param column: Columna del comentario, si es None se usa la del bloque
+        :param key: Variable
+        :type column: int, None
+        :type key: str
+        :return: None
+        """
+        if column is None:
+            column = self.column(key)
+        i = self.find(key)
+        self._lines[i] = align_line(self._lines[i], column)
+
+    def insert_after(self, key, lines):
+        """
+        Inserta líneas después de la línea de una variable.
+
+        :param key: Variable
+        :param lines: Líneas
+        :type key: str
+        :type lines: list
+        :return: None
+        """
+        self._after.setdefault(self.find(key), []).extend(lines)
+
+    def insert_before(self, key, lines):
+        """
+        Inserta líneas antes de la línea de una variable.
+
+        :param key: Variable
+        :param lines: Líneas
+        :type key: str
+        :type lines: list
+        :return: None
+        """
+        self._before.setdefault(self.find(key), []).extend(lines)
+
+    def to_list(self):
+        """
+        Retorna el archivo con los cambios. Las líneas que no se modificaron se
+        mantienen idénticas y las de los valores reemplazados se alinean a la
+        columna de su bloque.
+
+        :return: Lista del archivo
+        :rtype: list
+        """
+        for i in self._edited:
+            self._lines[i] = align_line(self._lines[i], self._columns[self._block[i]])
+        self._edited.clear()
+        if len(self._after) == 0 and len(self._before) == 0:
+            return [k for k in self._lines if k is not None]
+        data = []
+        for i in range(len(self._lines)):
+            if i in self._before:
+                data += self._before[i]
+            if self._lines[i] is not None:
+                data.append(self._lines[i])
+            if i in self._after:
+                data += self._after[i]
+        return data
@@ -34,6 +34,7 @@ __all__ = [
     'del_block_from_list',
     'extract_block_from_list',
     'file_to_list',
+    'FileLock',
     'find_line_str',
     'get_file_from_input',
     'is_osx',
@@ -41,6 +42,10 @@ __all__ = [
     'LIST_END_LINE',
     'natural_keys',
     'nonprint',
+    'popen',
+    'read_last_line',
+    'read_last_lines',
+    'read_output',
     'replace_block_from_list',
     'save_list_to_file',
     'search_append_line',
@@ -48,10 +53,11 @@ __all__ = [
 ]
 
 # Importación de librerías
+from extlbx.profiler import span
 import os
 import re
 import time
-from subprocess import call as _call
+from subprocess import PIPE, Popen, STDOUT
 from platform import system
 
 # Constantes
@@ -61,27 +67,59 @@ POS_IZQ = 1
 POS_DER = 2
 
 
-def call(cmds, stdout, stderr=None):
+def popen(cmds, stdout, stderr=None, cwd=None):
+    """
+    Inicia una instrucción en consola sin esperar a que termine.
+
+    :param cmds: Lista de comandos
+    :param stdout: Salida estandar
+    :param stderr: Salida de errores
+    :param cwd: Carpeta en la que se ejecuta el comando, si es None se usa la actual
+    :return: Proceso
+    :rtype: Popen
+    """
+    kwargs = {'stdout': stdout, 'cwd': cwd}
+    if stderr:
+        kwargs['stderr'] = stderr
+    if is_windows():
+        kwargs['creationflags'] = CREATE_NO_WINDOW
+    return Popen(cmds, **kwargs)
+
+
+def read_output(proc, output):
+    """
+    Entrega cada línea de la salida de un proceso iniciado con stdout=PIPE a
+    una función, a medida que el proceso las escribe.
+
+    :param output: Función que recibe cada línea
+    :param proc: Proceso
+    :type proc: Popen
+    :return: None
+    """
+    with proc.stdout:
+        for line in proc.stdout:
+            output(line.decode('utf8', 'replace'))
+
+
+def call(cmds, stdout, stderr=None, cwd=None, output=None):
     """
     Llama a una instrucción en consola.
 
     :param cmds: Lista de comandos
     :param stdout: Salida estandar
     :param stderr: Salida de errores
+    :param cwd: Carpeta en la que se ejecuta el comando, si es None se usa la actual
+    :param output: Función que recibe cada línea de la salida, si no es None la salida se lee por un pipe
     :return: Tiempo de ejecución
     :rtype: float
     """
     t = time.time()
-    if stderr:
-        if is_windows():
-            _call(cmds, stdout=stdout, stderr=stderr, creationflags=CREATE_NO_WINDOW)
-        else:
-            _call(cmds, stdout=stdout, stderr=stderr)
+    if output is None:
+        popen(cmds, stdout, stderr=stderr, cwd=cwd).wait()
     else:
-        if is_windows():
-            _call(cmds, stdout=stdout, creationflags=CREATE_NO_WINDOW)
-        else:
-            _call(cmds, stdout=stdout)
+        proc = popen(cmds, PIPE, stderr=STDOUT, cwd=cwd)
+        read_output(proc, output)
+        proc.wait()
     return time.time() - t
 
 
@@ -107,6 +145,98 @@ class Cd(object):
         os.chdir(self.savedPath)
 
 
+class FileLock(object):
+    """
+    Bloqueo entre procesos basado en un archivo de lock. El archivo se crea de
+    forma exclusiva al entrar y se borra al salir; un lock más antiguo que
+    stale se considera abandonado.
+    """
+
+    def __init__(self, lockfile, timeout=30, stale=120):
+        """
+        Constructor.
+
+        :param lockfile: Archivo de lock
+        :param stale: Antigüedad a partir de la cual un lock se considera abandonado (s)
+        :param timeout: Tiempo máximo de espera (s)
+        """
+        self._lockfile = lockfile
+        self._stale = stale
+        self._timeout = timeout
+        self._fd = None
+
+    def __enter__(self):
+        t = time.time()
+        while True:
+            try:
+                self._fd = os.open(self._lockfile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self._lockfile) > self._stale:
+                        os.remove(self._lockfile)
+                        continue
+                except OSError:
+                    continue
+                if time.time() - t > self._timeout:
+                    raise TimeoutError(f'No se pudo obtener el lock {self._lockfile}')
+                time.sleep(0.05)
+
+    def __exit__(self, etype, value, traceback):
+        os.close(self._fd)
+        self._fd = None
+        try:
+            os.remove(self._lockfile)
+        except OSError:
+            pass
+
+
+def read_last_lines(filename, n, blocksize=4096):
+    """
+    Retorna las últimas n líneas no vacías de un archivo leyendo bloques desde
+    el final, sin recorrer el archivo completo.
+
+    :param blocksize: Tamaño de los bloques leídos (bytes)
+    :param filename: Archivo
+    :param n: Número de líneas
+    :return: Líneas sin espacios en los extremos, de la más antigua a la más nueva
+    :rtype: list
+    """
+    with open(filename, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b''
+        lines = []
+        while pos > 0:
+            step = min(blocksize, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = [j for j in tail.split(b'\n') if j.strip() != b'']
+
+            # La primera línea puede estar cortada mientras no se llegue al inicio
+            if len(lines) > n or (pos == 0 and len(lines) > 0):
+                break
+    return [j.decode('utf8').strip() for j in lines[-n:]]
+
+
+def read_last_line(filename, blocksize=4096):
+    """
+    Retorna la última línea no vacía de un archivo leyendo bloques desde el
+    final, sin recorrer el archivo completo.
+
+    :param blocksize: Tamaño de los bloques leídos (bytes)
+    :param filename: Archivo
+    :return: Última línea sin espacios en los extremos, None si el archivo está vacío
+    :rtype: str, None
+    """
+    lines = read_last_lines(filename, 1, blocksize=blocksize)
+    if len(lines) == 0:
+        return None
+    return lines[0]
+
+
 def find_line_str(data, line, returnline=False):
     """
     Encuentra la linea en un archivo y devuelve su ubicación.
@@ -249,7 +379,9 @@ def file_to_list(filename):
     :return: Lista
     :rtype: list[str]
     """
-    return open(filename, encoding='utf8').readlines()
+    with span('load'):
+        with open(filename, encoding='utf8') as f:
+            return f.readlines()
 
 
 def is_windows():
@@ -394,10 +526,11 @@ def save_list_to_file(lst, filename):
     :param filename: Archivo
     :type filename: str
     """
-    o = open(filename, 'w', encoding='utf8')
-    for j in lst:
-        o.write(j)
-    o.close()
+    with span('write'):
+        o = open(filename, 'w', encoding='utf8')
+        for j in lst:
+            o.write(j)
+        o.close()
 
 
 # noinspection PyUnusedLocal
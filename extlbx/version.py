@@ -36,32 +36,40 @@ __all__ = [
 ]
 
 # Importación de librerías
-from extlbx.utils import split_str
+from extlbx.utils import read_last_line, split_str
 import hashlib
+import os
 import time
 
+# Caché de get_last_ver, archivo -> ((mtime, tamaño), versión)
+_LAST_VER_CACHE = {}
+
 
 # noinspection PyBroadException
 def get_last_ver(statfile):
     """
-    Retorna la última versión compilada.
+    Retorna la última versión compilada. Sólo se lee el final del archivo y el
+    resultado se guarda en caché mientras el archivo no cambie de fecha de
+    modificación ni de tamaño.
 
-    :param statfile:
-    :return:
+    :param statfile: Archivo de estadísticas
+    :return: Versión y fecha
+    :rtype: str
     """
     try:
-        data = open(statfile, encoding='utf8')
-        datal = []
-        for d in data:
-            datal.append(d.strip())
-        lastline = split_str(datal[len(datal) - 1], ' ')
+        st = os.stat(statfile)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _LAST_VER_CACHE.get(statfile)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        lastline = split_str(read_last_line(statfile), ' ')
         ver = lastline[1]
         vtime = lastline[3]
         if ver.count('.') == 3:
             ver = ver.split('.')
             ver = f'{ver[0]}.{ver[1]}.{ver[2]}-{ver[3]}'
         lastver = f'{ver} ({vtime})'
-        data.close()
+        _LAST_VER_CACHE[statfile] = (key, lastver)
     except:
         return '0.0.0 (NO_DATE)'
 
@@ -29,6 +29,7 @@ Licencia:
 __all__ = ['Zip']
 
 # Importación de librerías
+from extlbx.profiler import span
 import os
 import zipfile
 
@@ -38,14 +39,18 @@ class Zip(object):
     Clase para administrar archivos zip.
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, root=''):
         """
         Constructor, crea un archivo zipfile con un nombre
         :param filename: Nombre del archivo
+        :param root: Carpeta desde la que se leen los archivos añadidos
         """
         if '.zip' not in filename:
             filename += '.zip'
 
+        # Carpeta base de los archivos
+        self._root = root
+
         # Crea un objeto zipfile
         self._zip = zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED)
 
@@ -90,17 +95,19 @@ class Zip(object):
 
         :return: None
         """
-        self._zip.close()
+        with span('zip'):
+            self._zip.close()
 
     def _writefile(self, f, fname):
         """
         Escribe un archivo en el zip.
 
-        :param f: Dirección del archivo
+        :param f: Dirección del archivo, relativa a la carpeta base
         :param fname: Nombre del archivo
         :return:
         """
-        self._zip.write(f, fname)
+        with span('zip'):
+            self._zip.write(self._root + f, fname)
 
     def add_file(self, ufile, ghostpath=None):
         """
@@ -135,12 +142,12 @@ class Zip(object):
             for f in folder:
                 self.add_folder(f)
         else:
-            for f in os.listdir(folder):
+            for f in os.listdir(self._root + folder):
                 full_path = os.path.join(folder, f)
-                if os.path.isfile(full_path):
+                if os.path.isfile(self._root + full_path):
                     if not self._check_excepted_file(full_path):
                         self.add_file(full_path)
-                elif os.path.isdir(full_path):
+                elif os.path.isdir(self._root + full_path):
                     self.add_folder(full_path)
 
     def set_ghostpath(self, path):
@@ -29,39 +29,43 @@ Licencia:
 __all__ = ['CreateVersion']
 
 # Importación de librerías
+import time
+
+_STARTUP_TIME = time.time()  # Inicio del programa, mide el tiempo de carga
+
 from extlbx import __author__, __version__
-from extlbx.releases import REL_PROFESSIONALCV, REL_INFORME, REL_CONTROLES, REL_AUXILIAR, \
-    RELEASES, REL_REPORTE, REL_TESIS, REL_ARTICULO, REL_PRESENTACION, REL_POSTER
-from extlbx.convert import *
+from extlbx.releases import REGISTRY
+from extlbx.context import ExportCancelled, ExportContext
+from extlbx.logger import AsyncLogger
+from extlbx.profiler import Profiler
+from extlbx.publish import GitPublisher
 from extlbx.version import *
 from extlbx.sound import Sound
 from extlbx.resources import *
 from extlbx.utils import *
 
-import ctypes
+import collections
 import tkinter as tk
 from tkinter import font
 from tkinter import messagebox
 from extlbx.vframe import VerticalScrolledFrame
 
-from extlbx.pyperclip import copy as extlbcbpaste
 from functools import partial
 
+import argparse
 import json
 import logging
 import os
+import queue
 import signal
+import threading
 import traceback
 
-PIL_EXIST = True
-
-try:
-    # noinspection PyUnresolvedReferences
-    from PIL import ImageTk
-except ImportError:
-    PIL_EXIST = False
-
 # Constantes
+CONSOLE_REFRESH_TIME = 50  # Tiempo mínimo entre actualizaciones de la consola (ms)
+GITHUB_BATCH_PDF_COMMIT = 'Se agregan pdf de {0}'
+GITHUB_BATCH_PRINT_MSG = 'SUBIENDO {0} VERSIONES PENDIENTES ... '
+GITHUB_BATCH_STAT_COMMIT = 'Estadisticas compilacion de {0}'
 GITHUB_PDF_COMMIT = 'Se agrega pdf v{0} de {1}'
 GITHUB_PRINT_MSG = 'SUBIENDO v{0} DE {1} ... '
 GITHUB_REP_COMMIT = 'Version {0}'
@@ -73,7 +77,8 @@ HELP = {
     'F2': 'Muestra las configuraciones',
     'F3': 'Muestra el acerca de',
     'F4': 'Limpia la ventana',
-    'ENTER': 'Inicia la rutina'
+    'ENTER': 'Inicia la rutina',
+    'Control-u': 'Sube a GitHub todas las versiones pendientes'
 }
 LIMIT_MESSAGES_CONSOLE = 1000
 LOG_FILE = 'log.txt'
@@ -94,6 +99,8 @@ LOG_MSG = {
     'UPLOAD_COMPLETE': 'Carga completa',
     'UPLOAD_V': 'Subiendo version {0} de {1} a GitHub',
 }
+PROFILE_FOLDER = 'dist/profile/'  # Reportes de --profile, relativo a MAIN_ROOT
+QUEUE_POLL_TIME = 50  # Tiempo entre lecturas de la cola de mensajes de la exportación (ms)
 TITLE = 'Export-Subtemplate'
 TITLE_LOADING = '{0} | Espere ...'
 TITLE_UPLOADING = '{0} | Cargando a GitHub ...'
@@ -105,7 +112,12 @@ class CreateVersion(object):
     Pide la versión al usuario y genera releases.
     """
 
-    def __init__(self):
+    def __init__(self, profile=False):
+        """
+        Constructor.
+
+        :param profile: Mide la memoria, perfila la etapa transform y guarda el reporte de cada exportación
+        """
 
         def _checkver(*args):
             """
@@ -135,13 +147,12 @@ class CreateVersion(object):
             :param args: Argumentos opcionales
             :return:
             """
-            for j in RELEASES.keys():
-                if self._release.get() == RELEASES[j]['NAME']:
-                    v = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[j]['STATS']['FILE']).split(' ')[0]
-                    self._versionstr.set(v_down(v))
-                    self._startbutton.focus_force()
-                    self._log('SUBV-', text=[RELEASES[j]['NAME'], v])
-                    return
+            release = REGISTRY.by_name(self._release.get())
+            if release is not None:
+                v = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile).split(' ')[0]
+                self._versionstr.set(v_down(v))
+                self._startbutton.focus_force()
+                self._log('SUBV-', text=[release.name, v])
 
         def _create_ver_u(*args):
             """
@@ -150,13 +161,12 @@ class CreateVersion(object):
             :param args: Argumentos opcionales
             :return:
             """
-            for j in RELEASES.keys():
-                if self._release.get() == RELEASES[j]['NAME']:
-                    v = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[j]['STATS']['FILE']).split(' ')[0]
-                    self._versionstr.set(v_up(v))
-                    self._startbutton.focus_force()
-                    self._log('SUBV+', text=[RELEASES[j]['NAME'], v])
-                    return
+            release = REGISTRY.by_name(self._release.get())
+            if release is not None:
+                v = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile).split(' ')[0]
+                self._versionstr.set(v_up(v))
+                self._startbutton.focus_force()
+                self._log('SUBV+', text=[release.name, v])
 
         def _copyver(*args):
             """
@@ -165,14 +175,15 @@ class CreateVersion(object):
             :param args: Argumentos opcionales
             :return:
             """
-            for j in RELEASES.keys():
-                if self._release.get() == RELEASES[j]['NAME']:
-                    v = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[j]['STATS']['FILE']).split(' ')[0]
-                    extlbcbpaste(self._getconfig('CLIPBOARD_FORMAT').format(v))
-                    if self._getconfig('INFOCONSOLE'):
-                        self._print('INFO: VERSION COPIADA')
-                    self._log('COPY', text=[v, RELEASES[j]['NAME']])
-                    return
+            from extlbx.pyperclip import copy as extlbcbpaste
+            release = REGISTRY.by_name(self._release.get())
+            if release is not None:
+                v = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile).split(' ')[0]
+                extlbcbpaste(self._getconfig('CLIPBOARD_FORMAT').format(v))
+                if self._getconfig('INFOCONSOLE'):
+                    self._print('INFO: VERSION COPIADA')
+                self._log('COPY', text=[v, release.name])
+                return
             if self._getconfig('INFOCONSOLE'):
                 self._print('ERROR: TEMPLATE NO ESCOGIDO')
             extlbcbpaste('')
@@ -202,7 +213,10 @@ class CreateVersion(object):
                 else:
                     os.kill(os.getpid(), signal.SIGKILL)
 
+            if self._ctx is not None:
+                self._ctx.cancel()
             self._log('END')
+            self._logger.close()
             self._root.destroy()
             exit()
 
@@ -324,21 +338,21 @@ class CreateVersion(object):
             self._versionstr.set('')
             self._versiontrace = self._versionstr.trace('w', self._checkver)
             self._clearconsole()
-            for j in RELEASES.keys():
-                if self._release.get() == RELEASES[j]['NAME']:
-                    v = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[j]['STATS']['FILE'])
-                    self._versiontxt.configure(state='normal')
-                    self._print('SELECCIONADO: {0}'.format(RELEASES[j]['NAME']))
-                    self._print('ÚLTIMA VERSIÓN: {0}'.format(v))
-                    if self._uploaded[j] != v.split(' ')[0]:
-                        self._uploadstatebtn('on')
-                    else:
-                        self._uploadstatebtn('off')
-                    self._lastloadedv = v.split(' ')[0]
-                    self._log('CHANGED', text=[RELEASES[j]['NAME'], v])
-                    return
+            release = REGISTRY.by_name(self._release.get())
+            if release is not None:
+                v = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile)
+                self._versiontxt.configure(state='normal')
+                self._print('SELECCIONADO: {0}'.format(release.name))
+                self._print('ÚLTIMA VERSIÓN: {0}'.format(v))
+                if self._uploaded[release.tag] != v.split(' ')[0]:
+                    self._uploadstatebtn('on')
+                else:
+                    self._uploadstatebtn('off')
+                self._lastloadedv = v.split(' ')[0]
+                self._log('CHANGED', text=[release.name, v])
 
         if os.name == 'nt':
+            import ctypes
             # noinspection PyBroadException
             try:
                 ctypes.windll.shcore.SetProcessDpiAwareness(1)
@@ -349,6 +363,9 @@ class CreateVersion(object):
 
         self._sounds = Sound()
 
+        # Log, se escribe en segundo plano
+        self._logger = AsyncLogger(LOG_FILE)
+
         # Se obtienen configuraciones
         with open(EXTLBX_CONFIGS, encoding='utf8') as json_data:
             d = json.load(json_data)
@@ -390,14 +407,9 @@ class CreateVersion(object):
         f2.pack(fill=tk.BOTH)
 
         # Selección versión a compilar
-        rels = []
-        p = 1
-        ky = list(RELEASES.keys())
-        ky.sort()
-        for b in ky:
-            rels.append(RELEASES[b]['NAME'])
-            self._root.bind('<Control-Key-{0}>'.format(p), partial(_set_templatever, RELEASES[b]['NAME']))
-            p += 1
+        rels = REGISTRY.names()
+        for p in range(len(rels)):
+            self._root.bind('<Control-Key-{0}>'.format(p + 1), partial(_set_templatever, rels[p]))
         self._release = tk.StringVar(self._root)
         self._release.set('Seleccione template')
         w = tk.OptionMenu(f1, self._release, *tuple(rels))
@@ -425,19 +437,40 @@ class CreateVersion(object):
         self._startbutton = tk.Button(f1, text='Iniciar', state='disabled', relief=tk.GROOVE, command=self._start)
         self._startbutton.pack(side=tk.LEFT, padx=3, anchor=tk.W)
 
-        # Uploads
-        if PIL_EXIST:
+        # Botón cancelar
+        self._cancelbutton = tk.Button(f1, text='Cancelar', state='disabled', relief=tk.GROOVE,
+                                       command=self._cancel)
+        self._cancelbutton.pack(side=tk.LEFT, padx=3, anchor=tk.W)
+
+        # Exportación en segundo plano, los mensajes se reciben en una cola
+        self._ctx = None
+        self._exportrel = ''
+        self._exporttime = 0
+        self._profile = profile
+        self._uploading = False
+        self._queue = queue.Queue()
+
+        # Uploads, Tk 8.6 lee png por sí mismo y PIL sólo se importa si hace falta
+        self._upload_imgs = None
+        try:
+            if tk.TkVersion >= 8.6:
+                photoimage = tk.PhotoImage
+            else:
+                # noinspection PyUnresolvedReferences
+                from PIL.ImageTk import PhotoImage as photoimage
             self._upload_imgs = [
-                ImageTk.PhotoImage(file=EXTLBX_BTN_UPLOAD),
-                ImageTk.PhotoImage(file=EXTLBX_BTN_UPLOAD_DISABLED)
+                photoimage(file=EXTLBX_BTN_UPLOAD),
+                photoimage(file=EXTLBX_BTN_UPLOAD_DISABLED)
             ]
+        except (ImportError, tk.TclError):
+            pass
+        if self._upload_imgs:
             # noinspection PyTypeChecker
             self._uploadbutton = tk.Button(f1, image=self._upload_imgs[0], relief=tk.GROOVE, height=30, width=30,
                                            command=self._upload_github, border=0)
         else:
             self._uploadbutton = tk.Button(f1, relief=tk.GROOVE, height=20, width=20,
                                            command=self._upload_github, border=0)
-            self._upload_imgs = None
         self._uploadbutton.pack(side=tk.RIGHT, padx=0, anchor=tk.E)
         self._uploadstatebtn('off')
         self._checkuploaded()
@@ -450,11 +483,14 @@ class CreateVersion(object):
                               border=2, cursor='arrow')
         self._info.pack(anchor=tk.NW, fill=tk.BOTH)
         self._info_slider.scroller.pack_forget()
-        self._console = []
+        self._console = collections.deque(maxlen=LIMIT_MESSAGES_CONSOLE)
+        self._consolerefresh = None
+        self._consolescroll = 1
         self._cnextnl = False
 
         # Eventos
         self._root.bind('<Control-q>', _kill)
+        self._root.bind('<Control-u>', self._upload_pending)
         self._root.bind('<Control-z>', _copyver)
         self._root.bind('<Down>', _create_ver_d)
         self._root.bind('<Escape>', _kill)
@@ -471,7 +507,19 @@ class CreateVersion(object):
                 HELP[self._configs[i]['KEY'].replace('<', '').replace('>', '')] = 'Activa/Desactiva {0}'.format(i)
 
         # Se agrega entrada al log
-        self._log('OPEN', text=__version__)
+        self._log('OPEN', text=__version__, startup_ms=int(1000 * (time.time() - _STARTUP_TIME)))
+
+    def _cancel(self, *args):
+        """
+        Cancela la exportación en curso.
+
+        :return: None
+        """
+        if self._ctx is None or self._ctx.cancelled():
+            return
+        self._ctx.cancel()
+        self._cancelbutton.configure(state='disabled', cursor='arrow')
+        self._print('CANCELANDO ...')
 
     def _checkuploaded(self):
         """
@@ -485,9 +533,9 @@ class CreateVersion(object):
         else:
             self._uploaded = {}
 
-        for j in RELEASES.keys():
-            if j not in self._uploaded:
-                self._uploaded[j] = '0.0.0'
+        for release in REGISTRY:
+            if release.tag not in self._uploaded:
+                self._uploaded[release.tag] = '0.0.0'
 
     def _clearconsole(self, scrolldir=1):
         """
@@ -506,10 +554,121 @@ class CreateVersion(object):
             """
             self._info_slider.canv.yview_scroll(1000 * scrolldir, 'units')
 
-        self._console = []
+        self._console.clear()
+        self._cnextnl = False
         self._info.config(text='')
         self._root.after(10, _slide)
 
+    def _end_export(self, done):
+        """
+        Restablece la interfaz al terminar la exportación.
+
+        :param done: La exportación terminó correctamente
+        :return: None
+        """
+
+        def _scroll():
+            self._info_slider.canv.yview_scroll(1000, 'units')
+
+        if done:
+            status = 'ok'
+        elif self._ctx.cancelled():
+            status = 'cancelled'
+        else:
+            status = 'error'
+        if done:
+            self._lastsav = self._getconfig('SAVE')
+            self._lascpdf = self._getconfig('COMPILE') and self._getconfig('SAVE_PDF')
+            self._print(' ')
+            if self._lastsav:
+                self._uploadstatebtn('on')
+        spans = {}
+        for name, st in self._ctx.profiler.report().items():
+            spans[name + '_ms'] = int(1000 * st['wall'])
+        self._ctx = None
+
+        self._cancelbutton.configure(state='disabled', cursor='arrow')
+        self._root.configure(cursor='arrow')
+        self._root.title(TITLE)
+        # noinspection PyDeprecation
+        self._versionstr.trace_vdelete('w', self._versiontrace)
+        self._versionstr.set('')
+        self._versiontrace = self._versionstr.trace('w', self._checkver)
+        self._root.update()
+        self._root.after(50, _scroll)
+        self._log('CREATE_V_COMPLETE', release=self._exportrel, phase='export', status=status,
+                  elapsed_ms=int(1000 * (time.time() - self._exporttime)), **spans)
+
+    def _end_upload(self, done):
+        """
+        Restablece la interfaz al terminar la publicación.
+
+        :param done: Se publicaron todos los repositorios
+        :return: None
+        """
+
+        def _scroll():
+            self._info_slider.canv.yview_scroll(1000, 'units')
+
+        self._uploading = False
+        if done:
+            self._uploadstatebtn('off')
+        else:
+            self._uploadstatebtn('on')
+        self._root.configure(cursor='arrow')
+        self._root.title(TITLE)
+        self._checkver()
+        self._root.update()
+        self._root.after(50, _scroll)
+        self._log('UPLOAD_COMPLETE', release=self._exportrel, phase='upload', status='ok' if done else 'error',
+                  elapsed_ms=int(1000 * (time.time() - self._exporttime)))
+
+    def _export(self, t, ctx):
+        """
+        Exporta el release, se ejecuta en un hilo secundario. No usa la interfaz,
+        los mensajes se envían a la cola que lee el hilo principal.
+
+        :param t: ID del release
+        :param ctx: Contexto de la exportación
+        :return: None
+        """
+        # El módulo de exportación se carga recién al exportar, no al abrir la ventana
+        from extlbx.convert import get_exporter
+
+        printfun = self._print_queue
+        done = False
+        try:
+            exporter = get_exporter(t)
+            with ctx.profiler.activate(), ctx.profiler.span('transform'):
+                exporter(ctx.version, ctx.versiondev, ctx.versionhash,
+                         printfun=printfun,
+                         doclean=True,
+                         dosave=self._getconfig('SAVE'),
+                         docompile=self._getconfig('COMPILE'),
+                         addstat=self._getconfig('SAVE_STAT'),
+                         plotstats=self._getconfig('PLOT_STAT'),
+                         savepdf=self._getconfig('SAVE_PDF'),
+                         mainroot=self._getconfig('MAIN_ROOT'),
+                         informeroot=self._getconfig('INFORME_ROOT'),
+                         statsroot=self._getconfig('STATS_ROOT'),
+                         ctx=ctx)
+            ctx.check_cancelled()
+            done = True
+
+            # Reporte de las etapas de la exportación
+            if self._profile:
+                profilefile = ctx.mainroot + PROFILE_FOLDER + '{0}-{1}.json'.format(self._exportrel, ctx.versiondev)
+                ctx.profiler.save(profilefile, release=self._exportrel, version=ctx.versiondev, date=ctx.dia)
+                printfun(ctx.profiler.table())
+                printfun('PERFIL GUARDADO EN {0}'.format(profilefile))
+        except ExportCancelled:
+            printfun('PROCESO CANCELADO')
+        except Exception as e:
+            logging.exception('Error al generar {0}'.format(self._exportrel))
+            self._log('OTHER', text=str(e), mode='ERROR', release=self._exportrel, phase='export')
+            self._queue.put(('ERROR', (str(e), traceback.format_exc())))
+        self._queue.put(('END', done))
+
     def _getconfig(self, paramname):
         """
         Obtiene el valor de la configuración.
@@ -519,6 +678,33 @@ class CreateVersion(object):
         """
         return self._configs[paramname]['VALUE']
 
+    def _poll_queue(self):
+        """
+        Lee los mensajes de la exportación en segundo plano y actualiza la interfaz.
+
+        :return: None
+        """
+        try:
+            while True:
+                kind, data = self._queue.get_nowait()
+                if kind == 'PRINT':
+                    self._print(data[0], end=data[1])
+                elif kind == 'ERROR':
+                    messagebox.showerror('Error fatal', 'Ocurrio un error inesperado al procesar la solicitud.')
+                    self._print('ERROR: EXCEPCIÓN INESPERADA')
+                    self._print(data[0])
+                    self._print(data[1])
+                    self._sounds.alert()
+                elif kind == 'END':
+                    self._end_export(data)
+                    return
+                elif kind == 'UPLOAD_END':
+                    self._end_upload(data)
+                    return
+        except queue.Empty:
+            pass
+        self._root.after(QUEUE_POLL_TIME, self._poll_queue)
+
     def _print(self, msg, hour=False, end=None, scrolldir=1):
         """
         Imprime mensaje en consola.
@@ -529,18 +715,6 @@ class CreateVersion(object):
         :return: None
         """
 
-        def _consoled(c):
-            """
-            Función que genera un string con una lista.
-
-            :param c: Lista
-            :return: Texto
-            """
-            text = ''
-            for i in c:
-                text = text + i + '\n'
-            return text
-
         def _get_hour():
             """
             Función que retorna la hora de sistema.
@@ -549,36 +723,37 @@ class CreateVersion(object):
             """
             return time.ctime(time.time())[11:20]
 
-        def _slide(*args):
-            """
-            Mueve el scroll.
-
-            :return: None
-            """
-            self._info_slider.canv.yview_scroll(2000 * scrolldir, 'units')
-
         try:
             msg = str(msg)
             if hour:
                 msg = _get_hour() + ' ' + msg
-            if len(self._console) == 0 or self._console[len(self._console) - 1] != msg:
-                if self._cnextnl:
-                    self._console[len(self._console) - 1] += msg
+            if len(self._console) == 0 or self._console[-1] != msg:
+                if self._cnextnl and len(self._console) > 0:
+                    self._console[-1] += msg
                 else:
-                    self._console.append(msg)
+                    self._console.append(msg)  # Al llegar al límite se descarta la línea más antigua
                 if end == '':
                     self._cnextnl = True
                 else:
                     self._cnextnl = False
 
-            if len(self._console) > LIMIT_MESSAGES_CONSOLE:
-                self._console.pop()
-
-            self._info.config(text=_consoled(self._console))
-            self._root.after(50, _slide)
+            # La consola se redibuja a lo más una vez cada CONSOLE_REFRESH_TIME
+            self._consolescroll = scrolldir
+            if self._consolerefresh is None:
+                self._consolerefresh = self._root.after(CONSOLE_REFRESH_TIME, self._refresh_console)
         except:
             self._clearconsole()
 
+    def _print_queue(self, msg, end=None):
+        """
+        Envía un mensaje a la consola desde la exportación en segundo plano.
+
+        :param msg: Mensaje
+        :param end: Fin de línea
+        :return: None
+        """
+        self._queue.put(('PRINT', (msg, end)))
+
     def execute(self):
         """
         Inicia la ventana.
@@ -587,24 +762,33 @@ class CreateVersion(object):
         """
         self._root.mainloop()
 
-    @staticmethod
-    def _log(msg, mode='INFO', text=''):
+    def _log(self, msg, mode='INFO', text='', **fields):
         """
-        Crea una entrada en el log.
+        Crea una entrada en el log. La escritura se hace en segundo plano.
 
+        :param fields: Campos de la entrada (release, phase, elapsed_ms)
+        :param mode: Tipo de entrada
+        :param msg: ID del mensaje
+        :param text: Argumentos del mensaje
         :type text: str, list
         :return:
         """
-        try:
-            d = time.strftime('%d/%m/%Y %H:%M:%S')
-            with open(LOG_FILE, 'a', encoding='utf8') as logfile:
-                if isinstance(text, list):
-                    logfile.write('{1} [{0}] {2}\n'.format(d, mode, LOG_MSG[msg].format(*text)))
-                else:
-                    logfile.write('{1} [{0}] {2}\n'.format(d, mode, LOG_MSG[msg].format(text)))
-        except:
-            dt = open(LOG_FILE, 'w', encoding='utf8')
-            dt.close()
+        if isinstance(text, list):
+            msg = LOG_MSG[msg].format(*text)
+        else:
+            msg = LOG_MSG[msg].format(text)
+        self._logger.log(mode, msg, **fields)
+
+    def _refresh_console(self):
+        """
+        Dibuja el contenido de la consola y mueve el scroll.
+
+        :return: None
+        """
+        self._consolerefresh = None
+        self._info.config(text='\n'.join(self._console) + '\n')
+        self._info.update_idletasks()
+        self._info_slider.canv.yview_scroll(2000 * self._consolescroll, 'units')
 
     def _saveupload(self):
         """
@@ -617,213 +801,52 @@ class CreateVersion(object):
 
     def _start(self, *args):
         """
-        Genera la versión ingresada.
+        Genera la versión ingresada. La exportación corre en segundo plano.
 
         :return:
         """
+        if not self._validversion or self._ctx is not None or self._uploading:
+            return
+        release = REGISTRY.by_name(self._release.get())
+        if release is None:
+            self._print('ERROR: TEMPLATE NO ESCOGIDO')
+            return
+        lastv = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile).split(' ')[0]
+        relnm = release.name
 
-        def _scroll():
-            self._info_slider.canv.yview_scroll(1000, 'units')
-
-        # noinspection PyDeprecation
-        def _callback():
-            t = 0
-            lastv = ''
-            msg = ''
-            relnm = ''
-            for j in RELEASES.keys():
-                if self._release.get() == RELEASES[j]['NAME']:
-                    t = RELEASES[j]['ID']
-                    lastv = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[j]['STATS']['FILE']).split(' ')[0]
-                    msg = RELEASES[j]['MESSAGE']
-                    relnm = RELEASES[j]['NAME']
-                    break
-
-            # Se crea la versión
-            ver, versiondev, versionhash = mk_version(self._versionstr.get())
-
-            # Se comprueba versiones
-            if not validate_ver(versiondev, lastv):
-                messagebox.showerror('Error', 'La versión nueva debe ser superior a la actual ({0}).'.format(lastv))
-                self._print('ERROR: VERSIÓN INCORRECTA')
-            else:
-                try:
-                    self._print(msg.format(versiondev))
-                    self._log('CREATE_V', text=[versiondev, relnm])
-                    if t == 1:
-                        try:
-                            export_informe(ver, versiondev, versionhash,
-                                           printfun=self._print,
-                                           doclean=True,
-                                           dosave=self._getconfig('SAVE'),
-                                           docompile=self._getconfig('COMPILE'),
-                                           addstat=self._getconfig('SAVE_STAT'),
-                                           backtoroot=True,
-                                           plotstats=self._getconfig('PLOT_STAT'),
-                                           mainroot=self._getconfig('MAIN_ROOT'),
-                                           informeroot=self._getconfig('INFORME_ROOT'),
-                                           statsroot=self._getconfig('STATS_ROOT'))
-                        except:
-                            logging.exception('Error al generar informe')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                    elif t == 2:
-                        try:
-                            export_auxiliares(ver, versiondev, versionhash,
-                                              printfun=self._print,
-                                              dosave=self._getconfig('SAVE'),
-                                              docompile=self._getconfig('COMPILE'),
-                                              addstat=self._getconfig('SAVE_STAT'),
-                                              plotstats=self._getconfig('PLOT_STAT'),
-                                              savepdf=self._getconfig('SAVE_PDF'),
-                                              mainroot=self._getconfig('MAIN_ROOT'),
-                                              informeroot=self._getconfig('INFORME_ROOT'),
-                                              statsroot=self._getconfig('STATS_ROOT'))
-                        except:
-                            logging.exception('Error al generar auxiliares')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_AUXILIAR], 'FILES')
-                    elif t == 3:
-                        try:
-                            export_controles(ver, versiondev, versionhash,
-                                             printfun=self._print,
-                                             dosave=self._getconfig('SAVE'),
-                                             docompile=self._getconfig('COMPILE'),
-                                             addstat=self._getconfig('SAVE_STAT'),
-                                             plotstats=self._getconfig('PLOT_STAT'),
-                                             savepdf=self._getconfig('SAVE_PDF'),
-                                             mainroot=self._getconfig('MAIN_ROOT'),
-                                             informeroot=self._getconfig('INFORME_ROOT'),
-                                             statsroot=self._getconfig('STATS_ROOT'))
-                        except:
-                            logging.exception('Error al generar controles')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_AUXILIAR], 'FILES')
-                            clear_dict(RELEASES[REL_CONTROLES], 'FILES')
-                    elif t == 4:
-                        try:
-                            export_cv(ver, versiondev, versionhash, printfun=self._print,
-                                      dosave=self._getconfig('SAVE'),
-                                      docompile=self._getconfig('COMPILE'),
-                                      addstat=self._getconfig('SAVE_STAT'),
-                                      plotstats=self._getconfig('PLOT_STAT'),
-                                      savepdf=self._getconfig('SAVE_PDF'),
-                                      mainroot=self._getconfig('MAIN_ROOT'),
-                                      statsroot=self._getconfig('STATS_ROOT'),
-                                      backtoroot=True)
-                        except:
-                            logging.exception('Error al generar cv')
-                            clear_dict(RELEASES[REL_PROFESSIONALCV], 'FILES')
-                    elif t == 5:
-                        try:
-                            export_reporte(ver, versiondev, versionhash, printfun=self._print,
-                                           dosave=self._getconfig('SAVE'),
-                                           docompile=self._getconfig('COMPILE'),
-                                           addstat=self._getconfig('SAVE_STAT'),
-                                           plotstats=self._getconfig('PLOT_STAT'),
-                                           savepdf=self._getconfig('SAVE_PDF'),
-                                           mainroot=self._getconfig('MAIN_ROOT'),
-                                           statsroot=self._getconfig('STATS_ROOT'),
-                                           informeroot=self._getconfig('INFORME_ROOT'))
-                        except:
-                            logging.exception('Error al generar reporte')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_REPORTE], 'FILES')
-                    elif t == 6:
-                        try:
-                            export_tesis(ver, versiondev, versionhash, printfun=self._print,
-                                         dosave=self._getconfig('SAVE'),
-                                         docompile=self._getconfig('COMPILE'),
-                                         addstat=self._getconfig('SAVE_STAT'),
-                                         plotstats=self._getconfig('PLOT_STAT'),
-                                         savepdf=self._getconfig('SAVE_PDF'),
-                                         mainroot=self._getconfig('MAIN_ROOT'),
-                                         statsroot=self._getconfig('STATS_ROOT'),
-                                         informeroot=self._getconfig('INFORME_ROOT'))
-                        except:
-                            logging.exception('Error al generar tesis')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_TESIS], 'FILES')
-                    elif t == 7:
-                        try:
-                            export_presentacion(ver, versiondev, versionhash, printfun=self._print,
-                                                dosave=self._getconfig('SAVE'),
-                                                docompile=self._getconfig('COMPILE'),
-                                                addstat=self._getconfig('SAVE_STAT'),
-                                                plotstats=self._getconfig('PLOT_STAT'),
-                                                savepdf=self._getconfig('SAVE_PDF'),
-                                                mainroot=self._getconfig('MAIN_ROOT'),
-                                                statsroot=self._getconfig('STATS_ROOT'),
-                                                informeroot=self._getconfig('INFORME_ROOT'))
-                        except:
-                            logging.exception('Error al generar presentacion')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_PRESENTACION], 'FILES')
-                    elif t == 8:
-                        try:
-                            export_articulo(ver, versiondev, versionhash, printfun=self._print,
-                                            dosave=self._getconfig('SAVE'),
-                                            docompile=self._getconfig('COMPILE'),
-                                            addstat=self._getconfig('SAVE_STAT'),
-                                            plotstats=self._getconfig('PLOT_STAT'),
-                                            savepdf=self._getconfig('SAVE_PDF'),
-                                            mainroot=self._getconfig('MAIN_ROOT'),
-                                            statsroot=self._getconfig('STATS_ROOT'),
-                                            informeroot=self._getconfig('INFORME_ROOT'))
-                        except:
-                            logging.exception('Error al generar articulo')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_REPORTE], 'FILES')
-                            clear_dict(RELEASES[REL_ARTICULO], 'FILES')
-                    elif t == 9:
-                        try:
-                            export_poster(ver, versiondev, versionhash, printfun=self._print,
-                                          dosave=self._getconfig('SAVE'),
-                                          docompile=self._getconfig('COMPILE'),
-                                          addstat=self._getconfig('SAVE_STAT'),
-                                          plotstats=self._getconfig('PLOT_STAT'),
-                                          savepdf=self._getconfig('SAVE_PDF'),
-                                          mainroot=self._getconfig('MAIN_ROOT'),
-                                          statsroot=self._getconfig('STATS_ROOT'),
-                                          informeroot=self._getconfig('INFORME_ROOT'))
-                        except:
-                            logging.exception('Error al generar poster')
-                            clear_dict(RELEASES[REL_INFORME], 'FILES')
-                            clear_dict(RELEASES[REL_PRESENTACION], 'FILES')
-                            clear_dict(RELEASES[REL_POSTER], 'FILES')
-                    else:
-                        raise Exception('ERROR: ID INCORRECTO')
-                    self._lastsav = self._getconfig('SAVE')
-                    self._lascpdf = self._getconfig('COMPILE') and self._getconfig('SAVE_PDF')
-                    self._print(' ')
-                    if self._lastsav:
-                        self._uploadstatebtn('on')
-                except Exception as e:
-                    messagebox.showerror('Error fatal', 'Ocurrio un error inesperado al procesar la solicitud.')
-                    self._log('OTHER', text=str(e), mode='ERROR')
-                    self._print('ERROR: EXCEPCIÓN INESPERADA')
-                    self._print(str(e))
-                    self._print(traceback.format_exc())
-                    self._sounds.alert()
+        # Se crea la versión
+        ver, versiondev, versionhash = mk_version(self._versionstr.get())
 
-            self._root.configure(cursor='arrow')
-            self._root.title(TITLE)
-            self._versionstr.trace_vdelete('w', self._versiontrace)
-            self._versionstr.set('')
-            self._versiontrace = self._versionstr.trace('w', self._checkver)
-            self._root.update()
-            self._root.after(50, _scroll)
-            self._log('CREATE_V_COMPLETE')
+        # Se comprueba versiones
+        if not validate_ver(versiondev, lastv):
+            messagebox.showerror('Error', 'La versión nueva debe ser superior a la actual ({0}).'.format(lastv))
+            self._print('ERROR: VERSIÓN INCORRECTA')
             return
 
-        if not self._validversion:
-            return
+        self._print(release.message.format(versiondev))
+        self._log('CREATE_V', text=[versiondev, relnm], release=relnm, phase='export')
+        self._exportrel = relnm
+        self._exporttime = time.time()
+        profiler = Profiler(memory=self._profile, cprofile=['transform'] if self._profile else None)
+        self._ctx = ExportContext(ver, versiondev, versionhash,
+                                  mainroot=self._getconfig('MAIN_ROOT'),
+                                  informeroot=self._getconfig('INFORME_ROOT'),
+                                  statsroot=self._getconfig('STATS_ROOT'),
+                                  profiler=profiler,
+                                  compilecache=self._getconfig('COMPILE_CACHE'),
+                                  compilefmt=self._getconfig('COMPILE_FMT'),
+                                  compilewarm=self._getconfig('COMPILE_WARM'))
+
         self._root.title(TITLE_LOADING.format(TITLE))
         self._root.configure(cursor='wait')
-        self._root.update()
-        self._root.after(500, _callback)
         self._startbutton.configure(state='disabled')
+        self._cancelbutton.configure(state='normal', cursor='hand2')
         self._uploadstatebtn('off')
-        return
+        self._root.update()
+
+        worker = threading.Thread(target=self._export, args=(release.id, self._ctx), daemon=True)
+        worker.start()
+        self._root.after(QUEUE_POLL_TIME, self._poll_queue)
 
     def _uploadstatebtn(self, state):
         """
@@ -848,103 +871,144 @@ class CreateVersion(object):
 
     def _upload_github(self, *args):
         """
-        Sube la versión a github.
+        Sube la versión del release seleccionado a github.
 
         :param args: Argumentos opcionales
         :return: None
         """
+        release = REGISTRY.by_name(self._release.get())
+        if release is not None:
+            lastv = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile).split(' ')[0]
+            self._upload_start([(release.tag, lastv)], self._lascpdf,
+                               GITHUB_PRINT_MSG.format(lastv, release.name))
 
-        def _scroll():
-            self._info_slider.canv.yview_scroll(1000, 'units')
-
-        def _callback():
-            t = 0
-            lastv = ''
-            jver = ''
-            lastvup = ''
-            for j in RELEASES.keys():
-                if self._release.get() == RELEASES[j]['NAME']:
-                    lastv = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[j]['STATS']['FILE']).split(' ')[0]
-                    lastvup = lastv.split('-')[0]
-                    jver = j
-                    self._log('UPLOAD_V', text=[lastvup, RELEASES[j]['NAME']])
-                    break
-
-            # Sube el contenido a la plataforma
-            try:
-                # Se cambia el path
-                os.chdir(self._getconfig('MAIN_ROOT'))
-                cmsg = GITHUB_REP_COMMIT.format(lastv)
-
-                # Se llama a consola para añadir carpeta a git
-                t = time.time()
-                with open(os.devnull, 'w') as FNULL:
-                    with Cd(RELEASES[jver]['GIT']):
-                        call(['git', 'add', '--all'], stdout=FNULL)
-                        call(['git', 'commit', '-m', cmsg], stdout=FNULL)
-                        call(['git', 'push'], stdout=FNULL, stderr=FNULL)
-
-                # Se sube archivo pdf
-                pdf_file = RELEASES[jver]['PDF_FOLDER'].format(lastvup)
-                cmsg = GITHUB_PDF_COMMIT.format(lastv, RELEASES[jver]['NAME'])
-                if os.path.isfile(pdf_file) and self._lascpdf:
-                    with open(os.devnull, 'w') as FNULL:
-                        with Cd(self._getconfig('PDF_ROOT')):
-                            pdf_file = pdf_file.replace(self._getconfig('PDF_ROOT'), '')
-                            call(['git', 'add', pdf_file], stdout=FNULL)
-                            call(['git', 'commit', '-m', cmsg], stdout=FNULL)
-                            call(['git', 'push'], stdout=FNULL, stderr=FNULL)
-
-                # Se sube estadísticas
-                cmsg = GITHUB_STAT_COMMIT.format(lastv, RELEASES[jver]['NAME'])
-                with open(os.devnull, 'w') as FNULL:
-                    with Cd(self._getconfig('STATS_ROOT') + 'stats/'):
-                        call(['git', 'add', RELEASES[jver]['STATS']['GIT_ADD']], stdout=FNULL)
-                        call(['git', 'commit', '-m', cmsg], stdout=FNULL)
-                        call(['git', 'push'], stdout=FNULL, stderr=FNULL)
-
-                # Se guarda la versión
-                self._uploaded[jver] = lastv
-                self._saveupload()
-
-                # Se actualiza archivo updates
-                # cmsg = GITHUB_UPDATE_COMMIT
-                # with open(os.devnull, 'w') as FNULL:
-                #     with Cd(self._getconfig('MAIN_ROOT')):
-                #         call(['git', 'add', EXTLBX_UPLOAD], stdout=FNULL)
-                #         call(['git', 'commit', '-m', cmsg], stdout=FNULL)
-                #         call(['git', 'push'], stdout=FNULL, stderr=FNULL)
-
-                # Se muestra tiempo de subida y se termina el proceso
-                self._print(MSG_FOKTIMER.format((time.time() - t)))
-                self._uploadstatebtn('off')
-            except Exception as e:
-                messagebox.showerror('Error fatal', 'Ocurrio un error inesperado al procesar la solicitud.')
-                self._log('OTHER', text=str(e), mode='ERROR')
-                self._print('ERROR: EXCEPCIÓN INESPERADA')
-                self._print(str(e))
-                self._print(traceback.format_exc())
-                self._sounds.alert()
-                self._uploadstatebtn('on')
+    def _upload_pending(self, *args):
+        """
+        Sube a github todas las versiones que no se han subido según upload.json.
+        Cada repositorio compartido recibe un único push.
 
-            self._log('UPLOAD_COMPLETE')
-            self._root.configure(cursor='arrow')
-            self._root.title(TITLE)
-            self._root.update()
-            self._root.after(50, _scroll)
+        :param args: Argumentos opcionales
+        :return: None
+        """
+        pending = []
+        for release in REGISTRY:
+            lastv = get_last_ver(self._getconfig('STATS_ROOT') + release.statfile).split(' ')[0]
+            if lastv != '0.0.0' and self._uploaded[release.tag] != lastv:
+                pending.append((release.tag, lastv))
+        if len(pending) == 0:
+            self._print('NO HAY VERSIONES PENDIENTES')
             return
+        self._upload_start(pending, True, GITHUB_BATCH_PRINT_MSG.format(len(pending)))
 
+    def _upload_start(self, pending, lascpdf, msg):
+        """
+        Inicia la publicación en segundo plano.
+
+        :param lascpdf: Sube los pdf de las versiones
+        :param msg: Mensaje en consola
+        :param pending: Lista de tuplas (tag del release, versión)
+        :return: None
+        """
+        if self._ctx is not None or self._uploading:
+            return
+        self._print(msg, end='')
+        relnm = ', '.join(REGISTRY.get(j).name for j, _ in pending)
+        for j, lastv in pending:
+            self._log('UPLOAD_V', text=[lastv.split('-')[0], REGISTRY.get(j).name],
+                      release=REGISTRY.get(j).name, phase='upload')
+
+        self._uploading = True
+        self._exportrel = relnm
+        self._exporttime = time.time()
         self._root.title(TITLE_UPLOADING.format(TITLE))
         self._root.configure(cursor='wait')
-        self._root.update()
-        for k in RELEASES.keys():
-            if self._release.get() == RELEASES[k]['NAME']:
-                v = get_last_ver(self._getconfig('STATS_ROOT') + RELEASES[k]['STATS']['FILE']).split(' ')[0]
-                self._print(GITHUB_PRINT_MSG.format(v, RELEASES[k]['NAME']), end='')
-                break
-        self._root.after(500, _callback)
+        self._startbutton.configure(state='disabled')
         self._uploadstatebtn('off')
+        self._root.update()
+
+        worker = threading.Thread(target=self._upload_publish, args=(pending, lascpdf), daemon=True)
+        worker.start()
+        self._root.after(QUEUE_POLL_TIME, self._poll_queue)
+
+    def _upload_publish(self, pending, lascpdf):
+        """
+        Publica las versiones en los repositorios de cada template, de los pdf y de
+        las estadísticas. Se ejecuta en un hilo secundario, cada repositorio hace un
+        único push y los push corren en paralelo.
+
+        :param lascpdf: Sube los pdf de las versiones, si existen
+        :param pending: Lista de tuplas (tag del release, versión)
+        :return: None
+        """
+        from extlbx.convert import MSG_FOKTIMER
+
+        printfun = self._print_queue
+        mainroot = self._getconfig('MAIN_ROOT')
+        pdfroot = self._getconfig('PDF_ROOT')
+        pdfrepo = mainroot + pdfroot
+        statsrepo = mainroot + self._getconfig('STATS_ROOT') + 'stats/'
+        single = self._getconfig('UPLOAD_SINGLE_COMMIT') and len(pending) > 1
+        names = ', '.join(REGISTRY.get(j).name for j, _ in pending)
+        done = False
+        try:
+            publisher = GitPublisher()
+            pdf_commits = []
+            stat_commits = []
+            for jver, lastv in pending:
+                release = REGISTRY.get(jver)
+
+                # Repositorio del template
+                publisher.add_commit(mainroot + release['GIT'], ['--all'], GITHUB_REP_COMMIT.format(lastv),
+                                     name=release['NAME'])
+
+                # Archivo pdf
+                pdf_file = release['PDF_FOLDER'].format(lastv.split('-')[0])
+                if os.path.isfile(mainroot + pdf_file) and lascpdf:
+                    pdf_commits.append(([pdf_file.replace(pdfroot, '')],
+                                        GITHUB_PDF_COMMIT.format(lastv, release['NAME'])))
+
+                # Estadísticas
+                stat_commits.append(([release['STATS']['GIT_ADD']],
+                                     GITHUB_STAT_COMMIT.format(lastv, release['NAME'])))
+
+            # Repositorios compartidos, un commit por template o uno solo
+            for repo, name, commits, batchmsg in ((pdfrepo, 'pdf-version', pdf_commits, GITHUB_BATCH_PDF_COMMIT),
+                                                  (statsrepo, 'stats', stat_commits, GITHUB_BATCH_STAT_COMMIT)):
+                if single and len(commits) > 0:
+                    paths = [f for c in commits for f in c[0]]
+                    publisher.add_commit(repo, paths, batchmsg.format(names), name=name)
+                else:
+                    for paths, msg in commits:
+                        publisher.add_commit(repo, paths, msg, name=name)
+
+            t = time.time()
+            results = publisher.publish()
+            printfun(MSG_FOKTIMER.format(time.time() - t))
+            status = {}
+            for r in results:
+                status[r['name']] = r['ok']
+                if r['ok']:
+                    printfun('\t{0}: {1}'.format(r['name'], MSG_FOKTIMER.format(r['time'])))
+                else:
+                    printfun('\t{0}: ERROR {1}'.format(r['name'], r['error']))
+                    self._log('OTHER', text=r['error'], mode='ERROR', release=r['name'], phase='upload')
+
+            # Se guardan las versiones cuyos repositorios se publicaron
+            done = all(status.values())
+            shared = status.get('pdf-version', True) and status.get('stats', True)
+            for jver, lastv in pending:
+                if shared and status[REGISTRY.get(jver).name]:
+                    self._uploaded[jver] = lastv
+            self._saveupload()
+        except Exception as e:
+            self._log('OTHER', text=str(e), mode='ERROR', release=names, phase='upload')
+            self._queue.put(('ERROR', (str(e), traceback.format_exc())))
+        self._queue.put(('UPLOAD_END', done))
 
 
 if __name__ == '__main__':
-    CreateVersion().execute()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--profile', action='store_true',
+                        help='Guarda un reporte por exportación con memoria y cProfile de la etapa transform')
+    args = parser.parse_args()
+    CreateVersion(profile=args.profile).execute()
@@ -0,0 +1,243 @@
+"""
+TEST COMPILER
+Tests de las cachés de compilación
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.compiler import BUILD_CACHE_SIZE, BuildCache, dist_hash, FormatCache, preamble_hash
+from extlbx.convert import _compile_pdflatex, MSG_FMT_ERROR
+from types import SimpleNamespace
+from unittest import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class CompilerTestCase(unittest.TestCase):
+    """
+    Carpeta temporal y versión fija de pdflatex, así no se ejecuta
+    pdflatex --version.
+    """
+
+    def setUp(self):
+        """
+        Crea la carpeta temporal.
+        """
+        self._tmp = tempfile.mkdtemp() + os.sep
+        patcher = mock.patch.dict('extlbx.compiler._VERSION', {'toolchain': 'pdfTeX 3.14;BibTeX 0.99'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """
+        Borra la carpeta temporal.
+        """
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _write(self, filename, data):
+        """
+        Escribe un archivo de la carpeta temporal.
+
+        :param filename: Archivo relativo a la carpeta
+        :param data: Contenido
+        :type filename: str
+        :type data: str
+        :return: None
+        """
+        os.makedirs(os.path.dirname(self._tmp + filename), exist_ok=True)
+        with open(self._tmp + filename, 'w', encoding='utf8') as f:
+            f.write(data)
+
+
+class FormatCacheTest(CompilerTestCase):
+    """
+    Formatos precompilados del preámbulo.
+    """
+
+    def setUp(self):
+        """
+        Crea un documento con un preámbulo importado.
+        """
+        super().setUp()
+        self.folder = self._tmp + 'dist/'
+        self._write('dist/main.tex', '\\documentclass{article}\n\\input{src/imports}\n'
+                                     '\\begin{document}\nHola\n\\end{document}\n')
+        self._write('dist/src/imports.tex', '\\usepackage{amsmath}\n')
+
+    def test_preamble_hash(self):
+        """
+        El hash sólo cambia con el preámbulo y los archivos que importa.
+        """
+        h = preamble_hash(self.folder, 'main.tex')
+        self._write('dist/main.tex', '\\documentclass{article}\n\\input{src/imports}\n'
+                                     '\\begin{document}\nChao\n\\end{document}\n')
+        self.assertEqual(preamble_hash(self.folder, 'main.tex'), h)
+        self._write('dist/src/imports.tex', '\\usepackage{amssymb}\n')
+        h2 = preamble_hash(self.folder, 'main.tex')
+        self.assertNotEqual(h2, h)
+        self._write('dist/main.tex', '\\documentclass{book}\n\\input{src/imports}\n'
+                                     '\\begin{document}\nChao\n\\end{document}\n')
+        self.assertNotEqual(preamble_hash(self.folder, 'main.tex'), h2)
+        with mock.patch.dict('extlbx.compiler._VERSION', {'toolchain': 'pdfTeX 3.15;BibTeX 0.99'}):
+            self.assertNotEqual(preamble_hash(self.folder, 'main.tex'), h2)
+
+    def test_get(self):
+        """
+        El formato se compila una vez y luego se copia desde la caché.
+        """
+        calls = []
+
+        def run(cmd, stdout=None, cwd=None):
+            calls.append(cmd)
+            with open(cwd + 'main-preamble.fmt', 'w') as f:
+                f.write('fmt')
+
+        cache = FormatCache(self._tmp + 'fmt/')
+        self.assertEqual(cache.get(self.folder, 'main.tex', run, None), 'main-preamble')
+        FormatCache.release(self.folder, 'main-preamble')
+        self.assertFalse(os.path.isfile(self.folder + 'main-preamble.fmt'))
+        self.assertEqual(cache.get(self.folder, 'main.tex', run, None), 'main-preamble')
+        self.assertTrue(os.path.isfile(self.folder + 'main-preamble.fmt'))
+        self.assertEqual(len(calls), 1)
+        self.assertIn('-ini', calls[0])
+
+    def test_failed_build(self):
+        """
+        Si el formato no se genera se retorna None y se compila sin -fmt.
+        """
+        calls = []
+        printed = []
+
+        def run(cmd, stdout=None, cwd=None, output=None):
+            calls.append(cmd)
+            return 1.0
+
+        cache = FormatCache(self._tmp + 'fmt/')
+        self.assertIsNone(cache.get(self.folder, 'main.tex', run, None))
+        self.assertFalse(os.path.isdir(self._tmp + 'fmt/'))
+
+        calls.clear()
+        ctx = SimpleNamespace(compilefmt=True, compilewarm=False, mainroot=self._tmp)
+        with mock.patch('extlbx.convert.time.sleep'):
+            _compile_pdflatex(self.folder, 'main.tex', printed.append, run, ctx)
+        self.assertIn(MSG_FMT_ERROR, printed)
+        self.assertIn('-ini', calls[0])
+        for cmd in calls[1:]:
+            self.assertFalse(any(k.startswith('-fmt') for k in cmd))
+        self.assertEqual(calls[1], ['pdflatex', '-interaction=nonstopmode', 'main.tex'])
+
+
+class BuildCacheTest(CompilerTestCase):
+    """
+    Compilaciones guardadas según el hash de las fuentes.
+    """
+
+    def setUp(self):
+        """
+        Crea una carpeta compilada.
+        """
+        super().setUp()
+        self.folder = self._tmp + 'dist/'
+        self.cache = BuildCache(self._tmp + 'build/')
+        self._write('dist/main.tex', 'main')
+        self._write('dist/src/cap.tex', 'cap')
+        self._write('dist/main.pdf', 'pdf')
+        self._write('dist/main.aux', 'aux')
+        self._write('dist/main.bbl', 'bbl')
+        self._write('dist/main.log', 'log')
+        self._write('dist/src/cap.aux', 'capaux')
+        self._write('dist/main-preamble.fmt', 'fmt')
+
+    def test_dist_hash(self):
+        """
+        El hash ignora los archivos generados, los ocultos y los zip.
+        """
+        h = dist_hash(self.folder, 'main.tex')
+        self._write('dist/main.pdf', 'pdf2')
+        self._write('dist/main.aux', 'aux2')
+        self._write('dist/release.zip', 'zip')
+        self._write('dist/.hidden', 'x')
+        self._write('dist/.git/HEAD', 'x')
+        self.assertEqual(dist_hash(self.folder, 'main.tex'), h)
+        self._write('dist/src/cap.tex', 'cap2')
+        self.assertNotEqual(dist_hash(self.folder, 'main.tex'), h)
+
+    def test_save_restore(self):
+        """
+        Se guardan los archivos generados y se restauran en otra carpeta.
+        """
+        self.cache.save('key', self.folder, 'main.tex', release='INFORME', tcompile=1.5)
+        self.assertIsNone(self.cache.restore('other', self._tmp + 'new/'))
+        build = self.cache.restore('key', self._tmp + 'new/')
+        self.assertEqual(build['tcompile'], 1.5)
+        self.assertEqual(sorted(build['files']), ['main.aux', 'main.bbl', 'main.log', 'main.pdf', 'src/cap.aux'])
+        for f in build['files']:
+            with open(self._tmp + 'new/' + f, encoding='utf8') as fl, open(self.folder + f, encoding='utf8') as fo:
+                self.assertEqual(fl.read(), fo.read())
+        self.assertFalse(os.path.exists(self._tmp + 'new/main.tex'))
+
+    def test_latest_seed(self):
+        """
+        La última compilación del release entrega los aux y bbl con que parte
+        la siguiente.
+        """
+        self.assertIsNone(self.cache.latest('INFORME', 'main.tex'))
+        with mock.patch('extlbx.compiler.time.time', return_value=1.0):
+            self.cache.save('old', self.folder, 'main.tex', release='INFORME')
+        self._write('dist/main.aux', 'aux2')
+        with mock.patch('extlbx.compiler.time.time', return_value=2.0):
+            self.cache.save('new', self.folder, 'main.tex', release='INFORME')
+        self._write('dist/main.aux', 'aux3')
+        with mock.patch('extlbx.compiler.time.time', return_value=3.0):
+            self.cache.save('other', self.folder, 'main.tex', release='REPORTE')
+        entry, build = self.cache.latest('INFORME', 'main.tex')
+        self.assertEqual(entry, self._tmp + 'build/new/')
+        self.assertIsNone(self.cache.latest('INFORME', 'other.tex'))
+        with mock.patch.dict('extlbx.compiler._VERSION', {'toolchain': 'pdfTeX 3.15;BibTeX 0.99'}):
+            self.assertIsNone(self.cache.latest('INFORME', 'main.tex'))
+
+        self.assertEqual(self.cache.seed('INFORME', self._tmp + 'new/', 'main.tex'), 3)
+        self.assertEqual(sorted(os.listdir(self._tmp + 'new/')), ['main.aux', 'main.bbl', 'src'])
+        with open(self._tmp + 'new/main.aux', encoding='utf8') as f:
+            self.assertEqual(f.read(), 'aux2')
+        self.assertEqual(self.cache.seed('TESIS', self._tmp + 'new/', 'main.tex'), 0)
+
+    def test_prune(self):
+        """
+        Se mantienen las BUILD_CACHE_SIZE compilaciones usadas más recientemente.
+        """
+        for k in range(BUILD_CACHE_SIZE + 2):
+            self.cache.save(f'key{k}', self.folder, 'main.tex', release='INFORME')
+            os.utime(self._tmp + f'build/key{k}', (k, k))
+        self.cache.restore('key2', self._tmp + 'new/')  # Restaurar la marca como usada
+        self.cache.save('last', self.folder, 'main.tex', release='INFORME')
+        keys = os.listdir(self._tmp + 'build/')
+        self.assertEqual(len(keys), BUILD_CACHE_SIZE)
+        for k in ('key0', 'key1', 'key3'):
+            self.assertNotIn(k, keys)
+        for k in ('key2', 'key4', 'last'):
+            self.assertIn(k, keys)
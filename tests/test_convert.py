@@ -0,0 +1,123 @@
+"""
+TEST CONVERT
+Tests de la compilación de los templates
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.compiler import COMPILE_MAX_PASSES, LOG_LINE_WIDTH
+from extlbx.convert import _compile_pdflatex
+from types import SimpleNamespace
+from unittest import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+_RERUN = 'LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.'
+
+
+class CompilePdflatexTest(unittest.TestCase):
+    """
+    Número de pasadas de pdflatex.
+    """
+
+    def setUp(self):
+        """
+        Crea la carpeta de compilación.
+        """
+        self.folder = tempfile.mkdtemp() + os.sep
+
+    def tearDown(self):
+        """
+        Elimina la carpeta de compilación.
+        """
+        shutil.rmtree(self.folder)
+
+    def _compile(self, passes, warm=False):
+        """
+        Compila con un pdflatex simulado.
+
+        :param passes: Lista de (contenido del aux, líneas del log) de cada pasada, la última se repite
+        :param warm: Partida en caliente
+        :return: Número de pasadas de pdflatex
+        :rtype: int
+        """
+        calls = []
+
+        def run(cmd, stdout=None, cwd=None, output=None):
+            if cmd[0] == 'pdflatex':
+                aux, lines = passes[min(len(calls), len(passes) - 1)]
+                calls.append(cmd)
+                with open(cwd + 'main.aux', 'w') as f:
+                    f.write(aux)
+                for line in lines:
+                    output(line)
+            return 1.0
+
+        ctx = SimpleNamespace(compilefmt=False, compilewarm=warm)
+        with mock.patch('extlbx.convert.time.sleep'):
+            _, diagnostics = _compile_pdflatex(self.folder, 'main.tex', lambda *args: None, run, ctx)
+        self.assertEqual(diagnostics['passes'], len(calls))
+        return len(calls)
+
+    def test_no_rerun(self):
+        """
+        Sin aviso de rerun se compila dos veces, también si el aux cambia.
+        """
+        self.assertEqual(self._compile([('a', []), ('b', [])]), 2)
+        self.assertEqual(self._compile([('a', []), ('b', []), ('c', [])], warm=True), 2)
+
+    def test_rerun(self):
+        """
+        El aviso de rerun de la segunda pasada pide una tercera.
+        """
+        self.assertEqual(self._compile([('a', [_RERUN]), ('a', [_RERUN]), ('a', [])]), 3)
+        self.assertEqual(self._compile([('a', [_RERUN])]), COMPILE_MAX_PASSES)
+
+    def test_warm(self):
+        """
+        En caliente basta una pasada si el aux no cambió y el log no pide otra.
+        """
+        with open(self.folder + 'main.aux', 'w') as f:
+            f.write('a')
+        self.assertEqual(self._compile([('a', [])], warm=True), 1)
+        self.assertEqual(self._compile([('a', [_RERUN]), ('a', [])], warm=True), 2)
+        self.assertEqual(self._compile([('a', [])]), 2)
+
+    def test_fatal(self):
+        """
+        Un error fatal detiene las pasadas.
+        """
+        self.assertEqual(self._compile([('a', ['! Emergency stop.'])]), 1)
+
+    def test_last_line_width(self):
+        """
+        La última línea del log con el ancho de corte de pdflatex también se
+        considera al decidir otra pasada.
+        """
+        rerun = _RERUN.ljust(LOG_LINE_WIDTH, '.')
+        self.assertEqual(self._compile([('a', [rerun]), ('a', [rerun]), ('a', [])]), 3)
+        self.assertEqual(self._compile([('a', ['! Emergency stop.'.ljust(LOG_LINE_WIDTH, '.')])]), 1)
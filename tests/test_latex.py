@@ -0,0 +1,149 @@
+"""
+TEST LATEX
+Tests de las funciones de LaTeX
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.latex import clear_token_cache, find_arguments, replace_argument, replace_arguments, tokenize, \
+    tokenize_line, TOKEN_BLANK, TOKEN_COMMAND, TOKEN_COMMENT, TOKEN_DEF, TOKEN_INPUT, TOKEN_TEXT
+from unittest import mock
+import extlbx.latex
+import unittest
+
+
+class ArgumentsTest(unittest.TestCase):
+    """
+    Búsqueda y reemplazo de argumentos entre llaves.
+    """
+
+    def test_find(self):
+        """
+        Posición del contenido de cada argumento, se puede detener antes.
+        """
+        self.assertEqual(find_arguments('\\a{x{y}z}{w}'), [(3, 8), (10, 11)])
+        self.assertEqual(find_arguments('\\a{x{y}z}{w}', 1), [(3, 8)])
+        self.assertEqual(find_arguments('\\a'), [])
+
+    def test_nested(self):
+        """
+        Las llaves anidadas quedan dentro de su argumento.
+        """
+        self.assertEqual(replace_argument('\\a{x{y}z}{w}', 1, 'N'), '\\a{N}{w}')
+        self.assertEqual(replace_argument('\\a{x{y}z}{w}', 2, 'N'), '\\a{x{y}z}{N}')
+
+    def test_escaped(self):
+        """
+        Las llaves escapadas no abren ni cierran argumentos.
+        """
+        self.assertEqual(replace_argument('\\a{x\\{y}{w}', 2, 'N'), '\\a{x\\{y}{N}')
+        self.assertEqual(replace_argument('\\a{x\\}y}{w}', 1, 'N'), '\\a{N}{w}')
+        self.assertEqual(replace_argument('} \\a{1}', 1, 'N'), '} \\a{N}')
+
+    def test_missing(self):
+        """
+        Un argumento que no existe o un número inválido lanzan una excepción.
+        """
+        with self.assertRaises(Exception):
+            replace_argument('\\a{1}', 2, 'N')
+        with self.assertRaises(Exception):
+            replace_argument('\\a{1}', 0, 'N')
+        with self.assertRaises(Exception):
+            replace_arguments('\\a{1}{2}', {1: 'a', 3: 'c'})
+
+    def test_separators(self):
+        """
+        Separadores distintos a las llaves.
+        """
+        self.assertEqual(replace_argument('\\a[x][y]{z}', 2, 'N', '[', ']'), '\\a[x][N]{z}')
+        self.assertEqual(find_arguments('\\a[x[y]]{z}', 0, '[', ']'), [(3, 7)])
+
+    def test_batch(self):
+        """
+        replace_arguments equivale a reemplazar los argumentos uno a uno.
+        """
+        line = '\\a{1}{2{x}}{3}\n'
+        self.assertEqual(replace_arguments(line, {1: 'a', 3: 'c'}), '\\a{a}{2{x}}{c}\n')
+        self.assertEqual(replace_arguments(line, {3: 'c', 2: 'b'}),
+                         replace_argument(replace_argument(line, 2, 'b'), 3, 'c'))
+        self.assertEqual(replace_arguments(line, {}), line)
+
+
+class TokenizeTest(unittest.TestCase):
+    """
+    Clasificación de las líneas y su caché.
+    """
+
+    def setUp(self):
+        """
+        Parte con la caché vacía.
+        """
+        clear_token_cache()
+        self.addCleanup(clear_token_cache)
+
+    def test_kinds(self):
+        """
+        Tipo y nombre de cada línea.
+        """
+        tok = tokenize_line('\\def\\title {Mi título} % Título\n')
+        self.assertEqual((tok.kind, tok.key, tok.comment), (TOKEN_DEF, 'title', 23))
+        tok = tokenize_line('\\input{src/cfg/page}\n')
+        self.assertEqual((tok.kind, tok.key, tok.comment), (TOKEN_INPUT, 'src/cfg/page.tex', -1))
+        tok = tokenize_line('\\newcommand{\\bar}[1]{#1}\n')
+        self.assertEqual((tok.kind, tok.key), (TOKEN_COMMAND, 'bar'))
+        tok = tokenize_line('  % comentario\n')
+        self.assertEqual((tok.kind, tok.strip, tok.comment), (TOKEN_COMMENT, '% comentario', 2))
+        self.assertEqual([k.kind for k in tokenize(['texto\n', '\n', '  \n'])], [TOKEN_TEXT, TOKEN_BLANK, TOKEN_BLANK])
+
+    def test_escaped_percent(self):
+        """
+        Un \\% no es comentario.
+        """
+        tok = tokenize_line('50\\% del total % nota\n')
+        self.assertEqual((tok.kind, tok.comment, tok.hascomment), (TOKEN_TEXT, 15, False))
+        self.assertEqual(tokenize_line('50\\% del total\n').comment, -1)
+
+    def test_directives(self):
+        """
+        Directivas presentes en la línea.
+        """
+        self.assertEqual(tokenize_line('\\usepackage{x} % !DELCOM\n').directives, (' !DELCOM',))
+        self.assertEqual(tokenize_line('\\foo{x} % !NL !STRIP\n').directives, (' !NL', ' !STRIP'))
+        self.assertEqual(tokenize_line('\\foo{x} % NL\n').directives, ())
+
+    def test_cache(self):
+        """
+        Una línea repetida retorna la misma clasificación y la caché no supera
+        su tamaño.
+        """
+        tok = tokenize_line('\\def\\a {1}\n')
+        self.assertIs(tokenize_line('\\def\\a {1}\n'), tok)
+        with mock.patch('extlbx.latex.TOKEN_CACHE_SIZE', 4):
+            for i in range(10):
+                self.assertEqual(tokenize_line(f'\\def\\k {{{i}}}\n').kind, TOKEN_DEF)
+                self.assertLessEqual(len(extlbx.latex._TOKEN_CACHE), 4)
+        tok = tokenize_line('\\def\\a {1}\n')
+        self.assertEqual((tok.kind, tok.key), (TOKEN_DEF, 'a'))
+        self.assertIs(tokenize_line('\\def\\a {1}\n'), tok)
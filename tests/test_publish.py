@@ -0,0 +1,131 @@
+"""
+TEST PUBLISH
+Tests de la publicación de los repositorios git
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.publish import git, GitPublisher
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class GitPublisherTest(unittest.TestCase):
+    """
+    Publica sobre un repositorio bare temporal.
+    """
+
+    def setUp(self):
+        """
+        Crea el repositorio bare y una copia de trabajo con un commit inicial.
+        """
+        self._tmp = tempfile.mkdtemp()
+        self.bare = os.path.join(self._tmp, 'bare.git')
+        self.repo = os.path.join(self._tmp, 'repo')
+        git(['init', '--bare', '-b', 'master', self.bare], self._tmp, 30)
+        git(['clone', self.bare, self.repo], self._tmp, 30)
+        git(['config', 'user.name', 'Test'], self.repo, 30)
+        git(['config', 'user.email', 'test@example.com'], self.repo, 30)
+        git(['checkout', '-b', 'master'], self.repo, 30)
+        self._write('a.txt', 'a')
+        git(['add', 'a.txt'], self.repo, 30)
+        git(['commit', '-m', 'Inicial'], self.repo, 30)
+        git(['push', '-u', 'origin', 'master'], self.repo, 30)
+
+    def tearDown(self):
+        """
+        Borra los repositorios.
+        """
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _write(self, name, text):
+        """
+        Escribe un archivo en la copia de trabajo.
+
+        :param name: Archivo
+        :param text: Contenido
+        """
+        with open(os.path.join(self.repo, name), 'w', encoding='utf8') as f:
+            f.write(text)
+
+    def _head(self, cwd):
+        """
+        Retorna el commit de master.
+
+        :param cwd: Repositorio
+        :return: Hash
+        :rtype: str
+        """
+        return git(['rev-parse', 'master'], cwd, 30)[2].strip()
+
+    def _publish(self, paths):
+        """
+        Publica un commit de la copia de trabajo.
+
+        :param paths: Archivos
+        :return: Resultado del repositorio
+        :rtype: dict
+        """
+        publisher = GitPublisher()
+        publisher.add_commit(self.repo, paths, 'Cambio')
+        return publisher.publish()[0]
+
+    def test_commit_push(self):
+        """
+        Un cambio se commitea y se sube.
+        """
+        self._write('a.txt', 'b')
+        r = self._publish(['a.txt'])
+        self.assertTrue(r['ok'], r['error'])
+        self.assertEqual([s['step'] for s in r['steps']], ['add', 'diff', 'commit', 'push'])
+        self.assertEqual(self._head(self.bare), self._head(self.repo))
+
+    def test_no_changes(self):
+        """
+        Sin cambios no se hace el commit y el push no falla.
+        """
+        head = self._head(self.repo)
+        r = self._publish(['a.txt'])
+        self.assertTrue(r['ok'], r['error'])
+        self.assertEqual([s['step'] for s in r['steps']], ['add', 'diff', 'push'])
+        self.assertEqual(self._head(self.repo), head)
+
+    def test_commit_error(self):
+        """
+        Un commit que falla detiene la publicación antes del push.
+        """
+        hook = os.path.join(self.repo, '.git', 'hooks', 'pre-commit')
+        with open(hook, 'w', encoding='utf8') as f:
+            f.write('#!/bin/sh\nexit 1\n')
+        os.chmod(hook, 0o755)
+        head = self._head(self.bare)
+        self._write('a.txt', 'c')
+        r = self._publish(['a.txt'])
+        self.assertFalse(r['ok'])
+        self.assertTrue(r['error'].startswith('commit'))
+        self.assertEqual([s['step'] for s in r['steps']], ['add', 'diff', 'commit'])
+        self.assertEqual(self._head(self.bare), head)
@@ -0,0 +1,183 @@
+"""
+TEST STATS
+Tests del archivo de estadísticas
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.stats import add_stat, detect_ctime_regression, generate_statline, NUMPY, REGRESSION_MIN_SAMPLES, \
+    rolling_trimmed_mean
+from unittest import mock
+import extlbx.stats
+import os
+import shutil
+import tempfile
+import unittest
+
+if NUMPY:
+    # noinspection PyUnresolvedReferences
+    import numpy as np  # type: ignore
+
+
+class ColumnarStatsTest(unittest.TestCase):
+    """
+    Archivo columnar .npy de las estadísticas.
+    """
+
+    def setUp(self):
+        """
+        Crea un archivo de estadísticas con 5 entradas.
+        """
+        self._tmp = tempfile.mkdtemp()
+        self.statfile = os.path.join(self._tmp, 'stats.txt')
+        with open(self.statfile, 'w', encoding='utf8') as f:
+            f.write(generate_statline('ID', 'VERSION', 'CTIME', 'FECHA', 'LINEAS', 'HASH\n'))
+            for k in range(5):
+                f.write(generate_statline(k + 1, f'1.0.{k}', '1.5', '01/01/2000', 100 + k, 'abcdef\n'))
+
+    def tearDown(self):
+        """
+        Borra el archivo de estadísticas.
+        """
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    @unittest.skipUnless(NUMPY, 'requiere numpy')
+    def test_append_after_build(self):
+        """
+        Las entradas se añaden al .npy regenerado sin volver a leer el texto.
+        """
+        extlbx.stats.build_columnar_stats(self.statfile)
+        npyfile = os.path.join(self._tmp, 'stats.npy')
+        with open(npyfile, 'rb') as f:
+            np.lib.format.read_magic(f)
+            self.assertFalse(np.lib.format.read_array_header_1_0(f)[1])  # fortran_order
+        with mock.patch('extlbx.stats.build_columnar_stats') as build:
+            for k in range(3):
+                add_stat(self.statfile, f'2.0.{k}', 2.5, '02/01/2000', 200 + k, 'fedcba')
+            build.assert_not_called()
+        arr = np.load(npyfile)
+        self.assertEqual(arr.shape, (8, 3))
+        self.assertEqual(list(arr[:, 0]), list(range(1, 9)))
+        self.assertEqual(list(arr[-3:, 2]), [200, 201, 202])
+
+    def test_add_stat_test(self):
+        """
+        En modo test no se escribe el archivo ni el lock.
+        """
+        with open(self.statfile, encoding='utf8') as f:
+            data = f.read()
+        with mock.patch('extlbx.stats.FileLock') as lock:
+            line = add_stat(self.statfile, '2.0.0', 2.5, '02/01/2000', 200, 'fedcba', test=True)
+            lock.assert_not_called()
+        self.assertTrue(line.startswith('6'))
+        with open(self.statfile, encoding='utf8') as f:
+            self.assertEqual(f.read(), data)
+        self.assertEqual(sorted(os.listdir(self._tmp)), ['stats.txt'])
+
+
+@unittest.skipUnless(NUMPY, 'requiere numpy')
+class RollingMeanTest(unittest.TestCase):
+    """
+    Medias móviles del gráfico de tiempo de compilación.
+    """
+
+    def test_rolling_trimmed_mean(self):
+        """
+        Cada ventana descarta sus extremos, los primeros valores son nan.
+        """
+        out = rolling_trimmed_mean([1, 2, 3, 100, 4, 5], 5, 0.2)
+        self.assertTrue(np.isnan(out[:4]).all())
+        self.assertEqual(out[4:].tolist(), [3, 4])
+        self.assertTrue(np.isnan(rolling_trimmed_mean([1, 2], 3)).all())
+
+
+class RegressionTest(unittest.TestCase):
+    """
+    Detección de compilaciones lentas respecto a las anteriores.
+    """
+
+    def setUp(self):
+        """
+        Crea la carpeta del archivo de estadísticas.
+        """
+        self._tmp = tempfile.mkdtemp()
+        self.statfile = os.path.join(self._tmp, 'stats.txt')
+
+    def tearDown(self):
+        """
+        Borra la carpeta.
+        """
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _detect(self, ctimes, **kwargs):
+        """
+        Escribe un archivo de estadísticas con los tiempos de compilación y
+        busca una regresión en la última.
+
+        :param ctimes: Tiempos de compilación
+        :param kwargs: Parámetros de detect_ctime_regression
+        :return: Resultado de detect_ctime_regression
+        """
+        with open(self.statfile, 'w', encoding='utf8') as f:
+            f.write(generate_statline('ID', 'VERSION', 'CTIME', 'FECHA', 'LINEAS', 'HASH\n'))
+            for k in range(len(ctimes)):
+                f.write(generate_statline(k + 1, f'1.0.{k}', ctimes[k], '01/01/2000', 100, 'abcdef\n'))
+        return detect_ctime_regression(self.statfile, **kwargs)
+
+    def test_min_samples(self):
+        """
+        Sin suficientes compilaciones no hay línea base.
+        """
+        self.assertIsNone(self._detect([10.0]))
+        self.assertIsNone(self._detect([1.0] * (REGRESSION_MIN_SAMPLES - 1) + [10.0]))
+        self.assertIsNotNone(self._detect([1.0] * REGRESSION_MIN_SAMPLES + [10.0]))
+
+    def test_std_floor(self):
+        """
+        Con tiempos constantes la desviación es un 5% de la línea base.
+        """
+        r = self._detect([1.0] * 10 + [1.2])
+        self.assertAlmostEqual(r['baseline'], 1.0)
+        self.assertAlmostEqual(r['zscore'], 4.0)
+        self.assertAlmostEqual(r['ratio'], 1.2)
+        self.assertIsNone(self._detect([1.0] * 10 + [1.1]))
+
+    def test_thresholds(self):
+        """
+        Se requiere superar el z-score y la razón mínima.
+        """
+        self.assertIsNone(self._detect([1.0] * 10 + [1.08], threshold=1))
+        self.assertIsNotNone(self._detect([1.0] * 10 + [1.12], threshold=1))
+        self.assertIsNone(self._detect([1.0] * 10 + [1.2], threshold=5))
+        self.assertIsNone(self._detect([1.0] * 10 + [1.2], minratio=1.5))
+
+    def test_trimmed_baseline(self):
+        """
+        Una compilación lenta aislada no contamina la línea base, y sólo se
+        usan las últimas window compilaciones.
+        """
+        r = self._detect([1.0] * 9 + [50.0] + [1.5])
+        self.assertAlmostEqual(r['baseline'], 1.0)
+        self.assertIsNotNone(self._detect([50.0] * 20 + [1.0] * 10 + [1.5], window=10))
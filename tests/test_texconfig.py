@@ -0,0 +1,78 @@
+"""
+TEST TEXCONFIG
+Tests del modelo de config.tex
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.texconfig import align_line, TexConfig
+import unittest
+
+
+class AlignLineTest(unittest.TestCase):
+    """
+    Alineación del comentario de una línea \\def.
+    """
+
+    def test_short_key(self):
+        """
+        Una variable de una letra no se confunde con el texto de \\def.
+        """
+        self.assertEqual(align_line('\\def\\d {1} % c\n', 20), '\\def\\d {1}          % c\n')
+        self.assertEqual(align_line('\\def\\e{1} % c\n', 20), '\\def\\e {1}          % c\n')
+
+    def test_value_does_not_fit(self):
+        """
+        Si el valor no cabe se quita el espacio después de la variable.
+        """
+        self.assertEqual(align_line('\t\\def\\d {123456789012345} % c\n', 20), '\t\\def\\d{123456789012345} % c\n')
+
+
+
+class TexConfigTest(unittest.TestCase):
+    """
+    Archivo de configuraciones indexado por variable.
+    """
+
+    def test_to_list_short_key(self):
+        """
+        Los valores reemplazados se alinean a la columna de su bloque, también
+        con variables de una letra.
+        """
+        cfg = TexConfig(['% Bloque\n',
+                         '\\def\\d {1}           % Uno\n',
+                         '\\def\\dd {2}          % Dos\n',
+                         '\\def\\ddd {3}         % Tres\n',
+                         '\n',
+                         '\\def\\e {4} % Cuatro\n'])
+        cfg.replace_value('d', 'nuevo')
+        cfg.replace_value('dd', 'un valor que no cabe')
+        cfg.replace_value('e', '5')
+        self.assertEqual(cfg.to_list(), ['% Bloque\n',
+                                         '\\def\\d {nuevo}       % Uno\n',
+                                         '\\def\\dd{un valor que no cabe} % Dos\n',
+                                         '\\def\\ddd {3}         % Tres\n',
+                                         '\n',
+                                         '\\def\\e {5} % Cuatro\n'])
@@ -0,0 +1,100 @@
+"""
+TEST UTILS
+Tests de las funciones utilitarias
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.utils import read_last_line, read_last_lines
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class ReadLastLinesTest(unittest.TestCase):
+    """
+    Lectura de las últimas líneas de un archivo desde el final.
+    """
+
+    def setUp(self):
+        """
+        Crea la carpeta de los archivos.
+        """
+        self._tmp = tempfile.mkdtemp()
+        self.filename = os.path.join(self._tmp, 'data.txt')
+
+    def tearDown(self):
+        """
+        Borra la carpeta.
+        """
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _write(self, data):
+        """
+        Escribe el archivo.
+
+        :param data: Contenido
+        :type data: str
+        :return: None
+        """
+        with open(self.filename, 'w', encoding='utf8', newline='') as f:
+            f.write(data)
+
+    def test_small_file(self):
+        """
+        Archivo menor a un bloque.
+        """
+        self._write('a\nb\n\nc\n')
+        self.assertEqual(read_last_lines(self.filename, 2), ['b', 'c'])
+        self.assertEqual(read_last_lines(self.filename, 10), ['a', 'b', 'c'])
+        self.assertEqual(read_last_line(self.filename), 'c')
+
+    def test_several_blocks(self):
+        """
+        Las líneas que cruzan el límite de un bloque se leen completas.
+        """
+        lines = [f'línea {k:03d}' + 'x' * (k % 7) for k in range(200)]
+        self._write('\n'.join(lines) + '\n')
+        for blocksize in (5, 16, 64, 4096):
+            self.assertEqual(read_last_lines(self.filename, 3, blocksize), lines[-3:])
+            self.assertEqual(read_last_lines(self.filename, 200, blocksize), lines)
+            self.assertEqual(read_last_line(self.filename, blocksize), lines[-1])
+
+    def test_no_trailing_newline(self):
+        """
+        La última línea sin salto de línea también se retorna.
+        """
+        self._write('a\nb\r\nc')
+        self.assertEqual(read_last_lines(self.filename, 2, 2), ['b', 'c'])
+        self.assertEqual(read_last_line(self.filename, 1), 'c')
+
+    def test_empty(self):
+        """
+        Un archivo vacío no tiene líneas.
+        """
+        self._write('\n\n')
+        self.assertEqual(read_last_lines(self.filename, 2), [])
+        self.assertIsNone(read_last_line(self.filename))
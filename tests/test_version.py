@@ -0,0 +1,77 @@
+"""
+TEST VERSION
+Tests de las versiones de cada compilación
+
+Autor: Pablo Pizarro R. @ ppizarror.com
+Licencia:
+    The MIT License (MIT)
+
+    Copyright 2017 Pablo Pizarro R.
+
+    Permission is hereby granted, free of charge, to any person obtaining a
+    copy of this software and associated documentation files (the "Software"),
+    to deal in the Software without restriction, including without limitation
+    the rights to use, copy, modify, merge, publish, distribute, sublicense,
+    and/or sell copies of the Software, and to permit persons to whom the Software
+    is furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+    WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+    CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+# Importación de librerías
+from extlbx.stats import generate_statline
+from extlbx.version import get_last_ver
+from unittest import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class LastVersionTest(unittest.TestCase):
+    """
+    Última versión compilada del archivo de estadísticas.
+    """
+
+    def setUp(self):
+        """
+        Crea un archivo de estadísticas con una entrada.
+        """
+        self._tmp = tempfile.mkdtemp()
+        self.statfile = os.path.join(self._tmp, 'stats.txt')
+        with open(self.statfile, 'w', encoding='utf8') as f:
+            f.write(generate_statline('ID', 'VERSION', 'CTIME', 'FECHA', 'LINEAS', 'HASH\n'))
+            f.write(generate_statline(1, '1.0.0.1', 1.5, '01/01/2000', 100, 'abcdef\n'))
+
+    def tearDown(self):
+        """
+        Borra la carpeta.
+        """
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_cache(self):
+        """
+        Mientras el archivo no cambie no se vuelve a leer, al añadir una
+        entrada se lee la nueva versión.
+        """
+        self.assertEqual(get_last_ver(self.statfile), '1.0.0-1 (01/01/2000)')
+        with mock.patch('extlbx.version.read_last_line') as read:
+            self.assertEqual(get_last_ver(self.statfile), '1.0.0-1 (01/01/2000)')
+            read.assert_not_called()
+        with open(self.statfile, 'a', encoding='utf8') as f:
+            f.write(generate_statline(2, '1.0.1.2', 1.5, '02/01/2000', 100, 'abcdef\n'))
+        self.assertEqual(get_last_ver(self.statfile), '1.0.1-2 (02/01/2000)')
+
+    def test_missing(self):
+        """
+        Sin archivo no hay versión.
+        """
+        self.assertEqual(get_last_ver(os.path.join(self._tmp, 'none.txt')), '0.0.0 (NO_DATE)')